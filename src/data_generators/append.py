@@ -0,0 +1,128 @@
+"""Incremental append generation for time-bounded scenarios.
+
+An appendable dataset is a directory of part files (a partitioned CSV or
+Parquet dataset) plus a ``_dataset.json`` manifest recording the scenario, the
+config it was started with and how far it extends::
+
+    data/raw/attendance/
+      _dataset.json
+      part-00000.parquet      2024-01-01 .. 2024-12-31
+      part-00001.parquet      2025-01-01 .. 2025-01-01
+
+Each append generates only the new window through the generator's
+:meth:`~data_generators.core.base_generator.BaseScenarioGenerator.window_config`,
+which keeps entity-level attributes (departments, ID sequences) consistent
+with what was already written.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import replace
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from .core.config import coerce_field, config_from_dict, config_to_dict
+from .core.io import write_columns
+from .core.utils import num_rows
+from .registry import get_scenario
+
+MANIFEST_NAME = "_dataset.json"
+
+
+def _as_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(str(value))
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+
+
+def append(
+    out_dir: str | Path,
+    scenario: str | None = None,
+    config: Any = None,
+    *,
+    until: Any = None,
+    format: str | None = None,
+) -> dict[str, Any]:
+    """Create or extend an appendable dataset in ``out_dir``.
+
+    Without a manifest, ``scenario`` and ``config`` start a new dataset
+    covering the config's window (ending at ``until`` if given). With one,
+    only ``(previous end, until]`` is generated and written as a new part.
+    Returns a summary of the part that was written.
+    """
+    out_dir = Path(out_dir)
+    manifest_path = out_dir / MANIFEST_NAME
+
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        previous = manifest["scenario"]
+        if scenario is not None and get_scenario(scenario).name != previous:
+            raise ValueError(f"{out_dir} holds {previous!r} data, not {scenario!r}")
+        if format is not None and format != manifest["format"]:
+            raise ValueError(f"{out_dir} is a {manifest['format']} dataset")
+        spec = get_scenario(manifest["scenario"])
+        start_field, end_field = _window_fields(spec)
+        if until is None:
+            raise ValueError("Appending to an existing dataset requires `until`")
+
+        base = config_from_dict(spec.config_cls, manifest["config"])
+        after = coerce_field(spec.config_cls, end_field, manifest["end"])
+        end = coerce_field(spec.config_cls, end_field, until)
+        if _as_datetime(end) <= _as_datetime(after):
+            raise ValueError(f"{out_dir} already extends to {manifest['end']}")
+
+        window = spec.generator_cls.window_config(
+            base, after, end, rows_before=manifest["rows"]
+        )
+    else:
+        if scenario is None or config is None:
+            raise ValueError(f"{out_dir} is not an appendable dataset yet")
+        spec = get_scenario(scenario)
+        start_field, end_field = _window_fields(spec)
+        if until is not None:
+            end = coerce_field(spec.config_cls, end_field, until)
+            config = replace(config, **{end_field: end})
+        manifest = {
+            "scenario": spec.name,
+            "format": format or "csv",
+            "config": config_to_dict(config),
+            "rows": 0,
+            "parts": [],
+        }
+        window = config
+
+    part = out_dir / f"part-{len(manifest['parts']):05d}.{manifest['format']}"
+    columns = spec.build_generator(window).generate_columns()
+    write_columns(columns, part, format=manifest["format"])
+
+    summary = {
+        "file": part.name,
+        "start": _isoformat(getattr(window, start_field)),
+        "end": _isoformat(getattr(window, end_field)),
+        "rows": num_rows(columns),
+    }
+    manifest["parts"].append(summary)
+    manifest["rows"] += summary["rows"]
+    manifest["end"] = summary["end"]
+
+    tmp = manifest_path.with_name(f".{MANIFEST_NAME}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, manifest_path)
+
+    return summary
+
+
+def _window_fields(spec: Any) -> tuple[str, str]:
+    fields = spec.generator_cls.WINDOW_FIELDS
+    if fields is None:
+        raise ValueError(f"Scenario {spec.name!r} is not time-bounded")
+    return fields
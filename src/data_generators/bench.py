@@ -0,0 +1,152 @@
+"""Throughput benchmarks for every registered scenario.
+
+Each case generates one scenario at one scale into one target: an output
+format (written through the same checkpointed writer as ``generate``) or an
+in-memory backend (``generate(backend=...)``). Cases run one at a time, each
+in a fresh worker process, so peak RSS is attributable to the case.
+
+Results can be saved as a baseline and later runs compared against it; a case
+regresses when its rows/s falls more than ``threshold`` below the baseline.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import platform
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+from . import __version__
+from .cache import cache_key
+from .checkpoint import write_checkpointed
+from .core.backends import _BACKEND_MODULES, BACKENDS, _import_backend, to_backend
+from .core.io import FORMATS
+from .core.utils import num_rows
+from .memory import peak_rss
+from .registry import SCENARIOS, get_scenario
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_THRESHOLD = 0.10
+
+
+def available_targets() -> list[str]:
+    """Output formats plus the backends whose library is installed."""
+    targets = [fmt for fmt in FORMATS if fmt != "parquet" or _installed("arrow")]
+    targets += [backend for backend in BACKENDS if _installed(backend)]
+    return targets
+
+
+def _installed(backend: str) -> bool:
+    return importlib.util.find_spec(_BACKEND_MODULES[backend]) is not None
+
+
+def measure(scenario: str, scale: int, target: str, work_dir: str) -> dict[str, Any]:
+    """Run one benchmark case in this process and return its measurements."""
+    spec = get_scenario(scenario)
+    config = spec.build_config(rows=scale)
+    generator = spec.build_generator(config)
+    # keep library import time out of the measurement
+    if target != "csv":
+        _import_backend("arrow" if target == "parquet" else target)
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    if target in FORMATS:
+        out = Path(work_dir) / f"{scenario}-{scale}.{target}"
+        rows = write_checkpointed(
+            generator, out, key=cache_key(spec.name, config, target), format=target
+        )
+        size: int | None = out.stat().st_size
+        out.unlink()
+    else:
+        columns = generator.generate_columns()
+        to_backend(columns, target)
+        rows = num_rows(columns)
+        size = None
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    return {
+        "scenario": scenario,
+        "scale": scale,
+        "target": target,
+        "rows": rows,
+        "bytes": size,
+        "wall_seconds": round(wall, 4),
+        "cpu_seconds": round(cpu, 4),
+        "rows_per_second": round(rows / wall, 1) if wall else None,
+        "mb_per_second": round(size / 1e6 / wall, 3) if size and wall else None,
+        "peak_rss": peak_rss() or None,  # None if unknown
+    }
+
+
+def _case_id(result: Mapping[str, Any]) -> str:
+    return f"{result['scenario']}/{result['scale']}/{result['target']}"
+
+
+def run_bench(
+    scenarios: Iterable[str] | None = None,
+    scales: Iterable[int] = DEFAULT_SCALES,
+    targets: Iterable[str] | None = None,
+    *,
+    on_case_done: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Benchmark every combination of scenario, scale and target."""
+    names = [get_scenario(name).name for name in (scenarios or SCENARIOS)]
+    targets = list(targets or available_targets())
+    started_at = datetime.now(timezone.utc)
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="data_generators_bench_") as work_dir:
+        for name in names:
+            for scale in scales:
+                for target in targets:
+                    with ProcessPoolExecutor(max_workers=1) as pool:
+                        result = pool.submit(
+                            measure, name, scale, target, work_dir
+                        ).result()
+                    results.append(result)
+                    if on_case_done is not None:
+                        on_case_done(result)
+
+    return {
+        "started_at": started_at.isoformat(),
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(
+    report: Mapping[str, Any],
+    baseline: Mapping[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """Cases whose rows/s dropped more than ``threshold`` below the baseline."""
+    previous = {_case_id(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get(_case_id(result))
+        if not before or not before.get("rows_per_second"):
+            continue
+        ratio = (result["rows_per_second"] or 0) / before["rows_per_second"]
+        if ratio < 1 - threshold:
+            regressions.append(
+                {
+                    "case": _case_id(result),
+                    "baseline_rows_per_second": before["rows_per_second"],
+                    "rows_per_second": result["rows_per_second"],
+                    "change": round(ratio - 1, 4),
+                }
+            )
+    return regressions
+
+
+def load_report(path: str | Path) -> dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
@@ -0,0 +1,167 @@
+"""Content-addressed cache of generated outputs.
+
+Outputs are keyed by a hash of (scenario, fully resolved config, package
+version, output format). A hit hardlinks (or copies, across filesystems) the
+cached artifact to the requested path instead of regenerating it. Entries are
+evicted least-recently-used first once the cache grows past ``max_size``.
+
+Layout::
+
+    <root>/objects/<key[:2]>/<key>.<format>   cached artifact
+    <root>/objects/<key[:2]>/<key>.json       metadata (scenario, config, rows)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+from . import __version__
+from .core.config import config_to_dict
+from .core.utils import parse_size
+from .dsl import is_scenario_file, scenario_digest
+from .keys import read_key_index_digest
+
+DEFAULT_MAX_SIZE = "20GB"
+
+
+def default_cache_dir() -> Path:
+    env = os.environ.get("DATA_GENERATORS_CACHE_DIR")
+    if env:
+        return Path(env)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "data_generators"
+
+
+def cache_key(
+    scenario: str,
+    config: Any,
+    fmt: str,
+    columns: Sequence[str] | None = None,
+    where: str | None = None,
+    corrupt: Any = None,
+) -> str:
+    """Hash of everything that determines a generated output's bytes."""
+    fields = {
+        "scenario": scenario,
+        "config": config_to_dict(config),
+        "version": __version__,
+        "format": fmt,
+    }
+    if columns is not None:
+        fields["columns"] = list(columns)
+    if where is not None:
+        fields["where"] = where
+    if corrupt is not None:
+        fields["corrupt"] = config_to_dict(corrupt)
+    if is_scenario_file(scenario):
+        # Neither does the path of a scenario file pin down its fields
+        fields["scenario_digest"] = scenario_digest(scenario)
+    customer_keys = getattr(config, "customer_keys", None)
+    if customer_keys is not None:
+        # The path alone does not pin down the customers behind it
+        fields["customer_keys"] = read_key_index_digest(customer_keys)
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def link_or_copy(src: Path, dest: Path) -> None:
+    """Hardlink ``src`` to ``dest`` (replacing it), copying if linking fails."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists() and os.path.samefile(src, dest):
+        return
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dest)
+
+
+@dataclass
+class OutputCache:
+    root: Path = field(default_factory=default_cache_dir)
+    max_size: int = field(
+        default_factory=lambda: parse_size(
+            os.environ.get("DATA_GENERATORS_CACHE_MAX_SIZE", DEFAULT_MAX_SIZE)
+        )
+    )
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+
+    def _artifact(self, key: str, fmt: str) -> Path:
+        return self.root / "objects" / key[:2] / f"{key}.{fmt}"
+
+    def _metadata(self, key: str) -> Path:
+        return self.root / "objects" / key[:2] / f"{key}.json"
+
+    def fetch(self, key: str, fmt: str, dest: Path) -> dict[str, Any] | None:
+        """Materialize a cached output at ``dest``; returns its metadata on a hit."""
+        artifact = self._artifact(key, fmt)
+        meta_path = self._metadata(key)
+        if not artifact.exists() or not meta_path.exists():
+            return None
+
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        # bump recency for LRU eviction
+        now = time.time()
+        os.utime(artifact, (now, now))
+        link_or_copy(artifact, dest)
+        return meta
+
+    def store(self, key: str, fmt: str, src: Path, **meta: Any) -> Path:
+        """Add a freshly generated output to the cache."""
+        artifact = self._artifact(key, fmt)
+        link_or_copy(src, artifact)
+        meta_path = self._metadata(key)
+        tmp = meta_path.with_name(f".{meta_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"key": key, "format": fmt, **meta}, default=str),
+            encoding="utf-8",
+        )
+        os.replace(tmp, meta_path)
+        return artifact
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        objects = self.root / "objects"
+        if not objects.exists():
+            return entries
+        for artifact in objects.glob("*/*"):
+            if artifact.suffix == ".json" or artifact.name.startswith("."):
+                continue
+            stat = artifact.stat()
+            entries.append((stat.st_mtime, stat.st_size, artifact))
+        return entries
+
+    def stats(self) -> dict[str, Any]:
+        entries = self._entries()
+        return {
+            "root": str(self.root),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_size": self.max_size,
+        }
+
+    def prune(self, max_size: int | None = None) -> list[Path]:
+        """Evict least-recently-used entries until the cache fits ``max_size``."""
+        limit = self.max_size if max_size is None else max_size
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = []
+        for _, size, artifact in entries:
+            if total <= limit:
+                break
+            artifact.unlink(missing_ok=True)
+            artifact.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
+            evicted.append(artifact)
+        return evicted
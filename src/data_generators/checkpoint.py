@@ -0,0 +1,286 @@
+"""Checkpointed, resumable writing of generated outputs.
+
+Generators produce entities in independently seeded blocks (see
+:class:`~data_generators.core.base_generator.BaseScenarioGenerator`). Blocks
+are grouped into chunks of at least ``chunk_rows`` rows; each chunk is made
+durable before it is recorded in a checkpoint next to the output::
+
+    data/raw/attendance.csv.ckpt.json   fingerprint + completed chunks
+    data/raw/attendance.csv.partial     CSV written so far
+    data/raw/attendance.parquet.parts/  one Parquet file per chunk
+
+A resumed run skips the recorded chunks and continues from the next block
+with that block's own seed, so the finished file is byte-identical to one
+written without interruption. The output only appears at its final path once
+every chunk is written; the checkpoint is removed then.
+
+With a :class:`~data_generators.memory.MemoryBudget` chunk sizes follow the
+budget instead of ``chunk_rows``; the recorded chunk boundaries still make
+resuming exact, though Parquet row groups may be split differently.
+
+With :class:`~data_generators.stats.OutputStats` every chunk is folded into
+the stats as it is written; their sketches are saved with each chunk, so a
+resumed run's ``<out>.stats.json`` matches an uninterrupted one.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .core.base_generator import BaseScenarioGenerator
+from .core.backends import _import_backend
+from .core.io import infer_format, write_columns
+from .core.utils import new_columns, num_rows
+from .memory import MemoryBudget
+from .stats import OutputStats, stats_path
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def checkpoint_path(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.name}.ckpt.json")
+
+
+def write_checkpointed(
+    generator: BaseScenarioGenerator,
+    path: str | Path,
+    *,
+    key: str,
+    format: str | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    resume: bool = False,
+    budget: MemoryBudget | None = None,
+    stats: OutputStats | None = None,
+) -> int:
+    """Generate ``generator``'s output into ``path`` chunk by chunk.
+
+    ``key`` identifies the scenario and config (see
+    :func:`~data_generators.cache.cache_key`); a checkpoint written for a
+    different key, block size or chunk size is never resumed. Without
+    ``resume`` any existing checkpoint is discarded. ``budget`` sizes chunks
+    to a memory limit instead of ``chunk_rows``. ``stats`` collects column
+    statistics, written to :func:`~data_generators.stats.stats_path` at the
+    end. Returns the row count.
+    """
+    path = Path(path)
+    fmt = infer_format(path, format)
+    ckpt = checkpoint_path(path)
+    fingerprint = {
+        "key": key,
+        "seed": generator.seed,
+        "block_size": generator.BLOCK_SIZE,
+        "chunk_rows": (
+            chunk_rows if budget is None else {"max_memory": budget.limit}
+        ),
+        "stats": stats is not None,
+    }
+
+    state = _load_state(ckpt, fingerprint, fmt, generator) if resume else None
+    if state is None:
+        _discard(path)
+        state = {"fingerprint": fingerprint, "format": fmt, "chunks": []}
+
+    chunks: list[dict[str, Any]] = state["chunks"]
+    if stats is not None and state.get("stats"):
+        stats.merge(OutputStats.from_dict(state["stats"]))
+    sink: _CsvChunks | _ParquetChunks
+    if fmt == "csv":
+        sink = _CsvChunks(path, chunks)
+    else:
+        sink = _ParquetChunks(path, chunks)
+
+    start_block = chunks[-1]["blocks"][1] if chunks else 0
+    rows = sum(chunk["rows"] for chunk in chunks)
+    blocks = generator.iter_blocks(start_block, rows)
+    if budget is not None:
+        blocks = budget.plan(blocks, fmt)
+
+    def next_chunk_rows() -> int:
+        return budget.chunk_rows if budget is not None else chunk_rows
+
+    for first, stop, columns in _iter_chunks(
+        generator, blocks, start_block, next_chunk_rows
+    ):
+        with generator.stage("write"):
+            offset = sink.write(columns)
+        if budget is not None:
+            budget.observe()
+        if stats is not None:
+            with generator.stage("stats"):
+                stats.update(columns)
+            state["stats"] = stats.to_dict()
+        chunks.append(
+            {
+                "blocks": [first, stop],
+                "seeds": [generator.block_seed(b) for b in range(first, stop)],
+                "rows": num_rows(columns),
+                "offset": offset,
+            }
+        )
+        rows += num_rows(columns)
+        _save_state(ckpt, state)
+
+    with generator.stage("finish"):
+        sink.finish(generator)
+    if stats is not None:
+        stats.write(stats_path(path))
+    ckpt.unlink(missing_ok=True)
+    return rows
+
+
+def _iter_chunks(
+    generator: BaseScenarioGenerator,
+    blocks: Iterator[tuple[int, dict[str, list]]],
+    start_block: int,
+    chunk_rows: Callable[[], int],
+) -> Iterator[tuple[int, int, dict[str, list]]]:
+    """Group ``blocks`` into ``(first_block, stop_block, columns)`` chunks.
+
+    Chunks have at least ``chunk_rows()`` rows; it is asked again for every
+    chunk, so it can adapt.
+    """
+    columns = new_columns(generator.output_columns)
+    first = stop = start_block
+    for block, block_columns in blocks:
+        for name, values in block_columns.items():
+            columns[name].extend(values)
+        stop = block + 1
+        if num_rows(columns) >= chunk_rows():
+            yield first, stop, columns
+            columns = new_columns(generator.output_columns)
+            first = stop
+    if stop > first:
+        yield first, stop, columns
+
+
+def _load_state(
+    ckpt: Path,
+    fingerprint: dict[str, Any],
+    fmt: str,
+    generator: BaseScenarioGenerator,
+) -> dict[str, Any] | None:
+    """The checkpoint at ``ckpt`` if it can be resumed, else ``None``."""
+    if not ckpt.exists():
+        return None
+    state = json.loads(ckpt.read_text(encoding="utf-8"))
+    if state.get("fingerprint") != fingerprint or state.get("format") != fmt:
+        return None
+    for chunk in state["chunks"]:
+        first, stop = chunk["blocks"]
+        if chunk["seeds"] != [generator.block_seed(b) for b in range(first, stop)]:
+            return None
+    return state
+
+
+def _save_state(ckpt: Path, state: dict[str, Any]) -> None:
+    tmp = ckpt.with_name(f".{ckpt.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(tmp, ckpt)
+
+
+def _discard(path: Path) -> None:
+    checkpoint_path(path).unlink(missing_ok=True)
+    stats_path(path).unlink(missing_ok=True)
+    _CsvChunks.partial_path(path).unlink(missing_ok=True)
+    shutil.rmtree(_ParquetChunks.parts_dir(path), ignore_errors=True)
+
+
+class _CsvChunks:
+    """Appends chunks to ``<out>.partial``; offsets are byte positions."""
+
+    def __init__(self, path: Path, chunks: list[dict[str, Any]]) -> None:
+        self.path = path
+        self.partial = self.partial_path(path)
+        self.partial.parent.mkdir(parents=True, exist_ok=True)
+        offset = chunks[-1]["offset"] if chunks else 0
+        size = self.partial.stat().st_size if self.partial.exists() else 0
+        if offset and size >= offset:
+            self.fh = self.partial.open("r+b")
+            # drop anything written after the last recorded chunk
+            self.fh.truncate(offset)
+            self.fh.seek(offset)
+        else:
+            del chunks[:]
+            self.fh = self.partial.open("wb")
+        self.header_written = bool(chunks)
+
+    @staticmethod
+    def partial_path(path: Path) -> Path:
+        return path.with_name(f"{path.name}.partial")
+
+    def _write_rows(self, rows: Any) -> int:
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(rows)
+        self.fh.write(buf.getvalue().encode("utf-8"))
+        self.fh.flush()
+        os.fsync(self.fh.fileno())
+        return self.fh.tell()
+
+    def write(self, columns: dict[str, list]) -> int:
+        if not self.header_written:
+            self._write_rows([list(columns)])
+            self.header_written = True
+        return self._write_rows(zip(*columns.values()))
+
+    def finish(self, generator: BaseScenarioGenerator) -> None:
+        if not self.header_written:
+            self._write_rows([list(generator.output_columns)])
+        self.fh.close()
+        os.replace(self.partial, self.path)
+
+
+class _ParquetChunks:
+    """Writes each chunk as a part file, merged into one file at the end."""
+
+    def __init__(self, path: Path, chunks: list[dict[str, Any]]) -> None:
+        self.path = path
+        self.parts = self.parts_dir(path)
+        self.count = len(chunks)
+        if any(not self._part(i).exists() for i in range(self.count)):
+            del chunks[:]
+            self.count = 0
+
+    @staticmethod
+    def parts_dir(path: Path) -> Path:
+        return path.with_name(f"{path.name}.parts")
+
+    def _part(self, index: int) -> Path:
+        return self.parts / f"part-{index:05d}.parquet"
+
+    def write(self, columns: dict[str, list]) -> None:
+        write_columns(columns, self._part(self.count), format="parquet")
+        self.count += 1
+
+    def finish(self, generator: BaseScenarioGenerator) -> None:
+        pa = _import_backend("arrow")
+        import pyarrow.parquet as pq
+
+        parts = [self._part(i) for i in range(self.count)]
+        if not parts:
+            write_columns(
+                new_columns(generator.output_columns), self.path, format="parquet"
+            )
+            shutil.rmtree(self.parts, ignore_errors=True)
+            return
+
+        # a chunk where a column is all-null infers a null type; widen to the
+        # type seen in other chunks
+        schema = pa.unify_schemas(
+            [pq.read_schema(part) for part in parts], promote_options="permissive"
+        )
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with pq.ParquetWriter(tmp, schema) as writer:
+                for part in parts:
+                    writer.write_table(pq.read_table(part).cast(schema))
+            os.replace(tmp, self.path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        shutil.rmtree(self.parts, ignore_errors=True)
@@ -1,30 +1,114 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import sys
+from dataclasses import fields
 from pathlib import Path
+from typing import Any
 
-from .scenarios.attendance.generator import AttendanceGenerator, AttendanceConfig
-from .scenarios.spark_logs.generator import SparkLogsGenerator, SparkLogsConfig
-from .scenarios.loan_applications.generator import (
-    LoanApplicationsGenerator,
-    LoanApplicationsConfig,
-)
-from .scenarios.bank_transactions.generator import (
-    BankTransactionsGenerator,
-    BankTransactionsConfig,
-)
-from .scenarios.credit_card_spend.generator import (
-    CreditCardSpendGenerator,
-    CreditCardSpendConfig,
-)
-from .scenarios.loan_repayments.generator import (
-    LoanRepaymentsGenerator,
-    LoanRepaymentsConfig,
-)
-from .scenarios.customer_360.generator import (
-    Customer360Generator,
-    Customer360Config,
+from .append import append
+from .bench import (
+    DEFAULT_SCALES,
+    DEFAULT_THRESHOLD,
+    available_targets,
+    compare,
+    load_report,
+    run_bench,
 )
+from .cache import OutputCache
+from .checkpoint import DEFAULT_CHUNK_ROWS
+from .emit import EMIT_FORMATS, RateProfile, emit
+from .explain import explain, load_calibration, record_calibration
+from .keys import build_key_index, read_key_index_digest
+from .core.backends import BACKENDS
+from .core.corruption import CorruptionConfig
+from .core.distributions import key_sampler
+from .core.instrumentation import Metrics, profiling
+from .core.io import FORMATS, infer_format
+from .core.utils import format_size, parse_size
+from .dsl import is_scenario_file
+from .registry import SCENARIOS, ScenarioSpec, get_scenario
+from .runner import Job, load_corruption, load_manifest, run_job, run_manifest
+from .serve import DEFAULT_HOST, DEFAULT_PORT, GenerationServer
+from .stats import merge_stats
+
+
+def _add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always regenerate; do not read or populate the output cache.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Output cache directory (default: $DATA_GENERATORS_CACHE_DIR "
+        "or ~/.cache/data_generators).",
+    )
+
+
+def _add_checkpoint_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint instead of "
+        "starting over.",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="Rows per checkpointed chunk (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=str,
+        default=None,
+        help="Memory budget, e.g. 2GB: chunk sizes are measured and adapted to "
+        "stay within it (overrides --chunk-rows).",
+    )
+
+
+def _add_corrupt_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--corrupt",
+        type=str,
+        default=None,
+        help="YAML file of data-quality issues to inject (null rates, "
+        "duplicates, late events, malformed values, outliers, type drift).",
+    )
+
+
+def _add_explain_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Print expected rows, bytes and seconds as JSON without generating.",
+    )
+    _add_calibration_argument(parser)
+
+
+def _add_calibration_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--calibration",
+        type=str,
+        default=None,
+        help="Calibration file recorded by bench (default: "
+        "$DATA_GENERATORS_CALIBRATION or <cache dir>/calibration.json).",
+    )
+
+
+def _add_stats_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Also write column statistics (counts, null rates, frequencies, "
+        "quantiles, distinct counts) to <out>.stats.json while generating.",
+    )
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -37,105 +121,766 @@ def build_parser() -> argparse.ArgumentParser:
     gen = subparsers.add_parser("generate", help="Generate data for a scenario.")
     gen.add_argument(
         "scenario",
-        choices=[
-            "attendance",
-            "spark_logs",
-            "loans",
-            "bank_transactions",
-            "credit_card_spend",
-            "loan_repayments",
-            "customer_360",
-        ],
-        help="Scenario name.",
+        type=_scenario,
+        help=f"Scenario name ({', '.join(SCENARIOS)}) or scenario YAML file.",
     )
     gen.add_argument(
         "--rows",
         type=int,
         default=None,
-        help="Approximate number of rows to generate (if supported).",
+        help="Number of rows to generate.",
     )
     gen.add_argument(
         "--out",
         type=str,
         required=True,
-        help="Output file path (CSV or Parquet based on extension).",
+        help="Output file path (CSV or Parquet based on extension); "
+        "a dataset directory with --append.",
+    )
+    gen.add_argument(
+        "--columns",
+        type=_parse_columns,
+        default=None,
+        help="Comma-separated columns to generate, e.g. amount,timestamp,is_fraud "
+        "(only these and the columns they depend on are computed).",
+    )
+    gen.add_argument(
+        "--where",
+        type=str,
+        default=None,
+        help="Only generate rows matching a predicate, e.g. \"is_fraud == 1\" or "
+        "\"channel in ('ECOM', 'UPI')\".",
+    )
+    _add_corrupt_argument(gen)
+    gen.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Emit rows sorted by the scenario's event time (bank_transactions, "
+        "credit_card_spend, loans).",
+    )
+    gen.add_argument(
+        "--ledger",
+        action="store_true",
+        help="Account ledger: time-ordered bank_transactions with opening / "
+        "closing balances, running totals and overdraft flags.",
+    )
+    gen.add_argument(
+        "--skew",
+        action="append",
+        default=[],
+        metavar="KEY=SPEC",
+        help="Skewed key distribution, e.g. customer=zipf:1.1 or "
+        "merchant=hot:0.01:0.8 (bank_transactions, credit_card_spend) and "
+        "app=zipf:1.2 (spark_logs). Repeatable.",
+    )
+    gen.add_argument(
+        "--customer-keys",
+        type=str,
+        default=None,
+        help="Shared customer key index directory: customer_360 writes it, "
+        "bank_transactions, credit_card_spend, loans and loan_repayments draw "
+        "their customers from it.",
+    )
+    gen.add_argument(
+        "--append",
+        action="store_true",
+        help="Treat --out as an appendable dataset directory and generate only "
+        "the window after its current end (time-bounded scenarios).",
+    )
+    gen.add_argument(
+        "--until",
+        type=str,
+        default=None,
+        help="New end of the dataset's time window when appending.",
+    )
+    gen.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=None,
+        help="Part file format for a new --append dataset (default: csv).",
+    )
+    _add_cache_arguments(gen)
+    _add_checkpoint_arguments(gen)
+    _add_explain_arguments(gen)
+    _add_stats_argument(gen)
+    gen.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing breakdown (generate, faker, write, ...).",
+    )
+    gen.add_argument(
+        "--cprofile",
+        type=str,
+        default=None,
+        help="Also dump cProfile stats to this file (view with python -m pstats).",
+    )
+    gen.add_argument(
+        "--tracemalloc",
+        type=str,
+        default=None,
+        help="Also dump a tracemalloc snapshot to this file.",
+    )
+
+    run = subparsers.add_parser(
+        "run", help="Run every job in a YAML manifest concurrently."
+    )
+    run.add_argument("manifest", type=str, help="Path to the manifest YAML file.")
+    run.add_argument(
+        "--cpus",
+        type=int,
+        default=None,
+        help="Maximum concurrent jobs (overrides budget.cpus).",
+    )
+    run.add_argument(
+        "--memory",
+        type=str,
+        default=None,
+        help="Total memory admitted at once, e.g. 8GB (overrides budget.memory).",
+    )
+    run.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="Where to write the JSON run report (overrides manifest report).",
+    )
+    _add_cache_arguments(run)
+    _add_checkpoint_arguments(run)
+    _add_explain_arguments(run)
+    _add_stats_argument(run)
+
+    bench = subparsers.add_parser(
+        "bench", help="Measure generator throughput and check for regressions."
+    )
+    bench.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=list(SCENARIOS),
+        default=None,
+        help="Scenarios to benchmark (default: all registered).",
+    )
+    bench.add_argument(
+        "--scales",
+        type=_parse_scales,
+        default=DEFAULT_SCALES,
+        help="Comma-separated row counts, e.g. 1e3,1e5 (default: 1e3 to 1e7).",
+    )
+    bench.add_argument(
+        "--targets",
+        nargs="+",
+        choices=list(FORMATS + BACKENDS),
+        default=None,
+        help="Output formats / backends to measure (default: all installed).",
+    )
+    bench.add_argument(
+        "--report",
+        type=str,
+        default="bench_report.json",
+        help="Where to write the JSON results (default: %(default)s).",
+    )
+    bench.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="Earlier report to compare rows/s against.",
+    )
+    bench.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed rows/s drop vs the baseline, as a fraction "
+        "(default: %(default)s).",
+    )
+    bench.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write the results to --baseline instead of comparing.",
+    )
+    _add_calibration_argument(bench)
+
+    emit = subparsers.add_parser(
+        "emit", help="Stream a scenario's rows to a live sink at a target rate."
+    )
+    emit.add_argument(
+        "scenario", type=_scenario, help="Scenario name or scenario YAML file."
+    )
+    emit.add_argument("--rows", type=int, default=None, help="Number of rows to emit.")
+    _add_corrupt_argument(emit)
+    emit.add_argument(
+        "--to",
+        type=str,
+        default="-",
+        help="Sink: - (stdout, default), tcp://host:port, unix:///path, "
+        "pipe:///path (named pipe) or http://host:port/path (NDJSON POSTs).",
+    )
+    emit.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Target events per second (default: as fast as the sink accepts).",
+    )
+    emit.add_argument(
+        "--ramp",
+        type=float,
+        default=0.0,
+        help="Seconds to ramp up linearly from zero to --rate.",
+    )
+    emit.add_argument(
+        "--burst",
+        type=float,
+        default=1.0,
+        help="Multiply the rate by this factor during periodic bursts.",
+    )
+    emit.add_argument(
+        "--burst-seconds",
+        type=float,
+        default=1.0,
+        help="Length of each burst (default: %(default)s).",
+    )
+    emit.add_argument(
+        "--burst-every",
+        type=float,
+        default=10.0,
+        help="Seconds from one burst start to the next (default: %(default)s).",
+    )
+    emit.add_argument(
+        "--format",
+        choices=EMIT_FORMATS,
+        default="json",
+        help="Event encoding: JSON lines or CSV lines after a header "
+        "(default: %(default)s).",
+    )
+    emit.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Replace each event's time column with the UTC time it is sent.",
+    )
+    emit.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Stop after this many seconds.",
+    )
+    emit.add_argument(
+        "--stats-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between live counters on stderr; 0 disables them "
+        "(default: %(default)s).",
+    )
+
+    serve = subparsers.add_parser(
+        "serve",
+        help="Answer generation requests from warm worker processes (HTTP).",
+    )
+    serve.add_argument(
+        "--host",
+        type=str,
+        default=DEFAULT_HOST,
+        help="Interface to listen on (default: %(default)s).",
+    )
+    serve.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help="TCP port to listen on (default: %(default)s).",
+    )
+    serve.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Listen on this Unix socket path instead of a TCP port.",
+    )
+    serve.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes, i.e. concurrent requests (default: all CPUs).",
+    )
+    serve.add_argument(
+        "--preload",
+        type=_parse_columns,
+        default=None,
+        help="Comma-separated scenarios to warm up in each worker "
+        "(default: all registered scenarios).",
+    )
+    _add_cache_arguments(serve)
+
+    cache = subparsers.add_parser("cache", help="Inspect or prune the output cache.")
+    cache_commands = cache.add_subparsers(dest="cache_command", required=True)
+    stats = cache_commands.add_parser("stats", help="Show cache size and entries.")
+    stats.add_argument("--cache-dir", type=str, default=None)
+    prune = cache_commands.add_parser(
+        "prune", help="Evict least-recently-used entries."
+    )
+    prune.add_argument("--cache-dir", type=str, default=None)
+    prune.add_argument(
+        "--max-size",
+        type=str,
+        default=None,
+        help="Target cache size, e.g. 5GB (default: the configured maximum).",
+    )
+    prune.add_argument("--all", action="store_true", help="Empty the cache.")
+
+    profile = subparsers.add_parser(
+        "stats", help="Work with output statistics written by --stats."
+    )
+    profile_commands = profile.add_subparsers(dest="stats_command", required=True)
+    merge = profile_commands.add_parser(
+        "merge", help="Merge the statistics of several outputs (shards)."
+    )
+    merge.add_argument("files", nargs="+", help="Statistics files to merge.")
+    merge.add_argument(
+        "--out",
+        type=str,
+        default=None,
+        help="Where to write the merged statistics (default: stdout).",
     )
 
     return parser
 
 
-def main(argv: list[str] | None = None) -> None:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+def _parse_columns(value: str) -> tuple[str, ...]:
+    return tuple(part.strip() for part in value.split(",") if part.strip())
+
+
+def _scenario(value: str) -> str:
+    if value in SCENARIOS:
+        return value
+    if not is_scenario_file(value):
+        raise argparse.ArgumentTypeError(
+            f"invalid scenario: {value!r} (choose from {', '.join(SCENARIOS)} "
+            "or a .yml scenario file)"
+        )
+    try:
+        get_scenario(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+    return value
+
+
+def _parse_scales(value: str) -> tuple[int, ...]:
+    try:
+        return tuple(int(float(part)) for part in value.split(",") if part)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid scales: {value!r}") from None
+
+
+def _cache_from_args(args: argparse.Namespace) -> OutputCache | None:
+    if getattr(args, "no_cache", False):
+        return None
+    return OutputCache(args.cache_dir) if args.cache_dir else OutputCache()
+
+
+def _generate(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.append:
+        _append(parser, args)
+        return
 
     out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    if args.scenario == "attendance":
-        config = AttendanceConfig()
-        if args.rows is not None:
-            config.num_employees = max(1, args.rows // 200)
-        gen = AttendanceGenerator(config)
-        df = gen.generate()
-
-    elif args.scenario == "spark_logs":
-        config = SparkLogsConfig()
-        if args.rows is not None:
-            config.num_rows = args.rows
-        gen = SparkLogsGenerator(config)
-        df = gen.generate()
-
-    elif args.scenario == "loans":
-        config = LoanApplicationsConfig()
-        if args.rows is not None:
-            config.num_rows = args.rows
-        gen = LoanApplicationsGenerator(config)
-        df = gen.generate()
-
-    elif args.scenario == "bank_transactions":
-        config = BankTransactionsConfig()
-        if args.rows is not None:
-            config.num_rows = args.rows
-        gen = BankTransactionsGenerator(config)
-        df = gen.generate()
-
-    elif args.scenario == "credit_card_spend":
-        config = CreditCardSpendConfig()
-        if args.rows is not None:
-            config.num_rows = args.rows
-        gen = CreditCardSpendGenerator(config)
-        df = gen.generate()
-    
-    elif args.scenario == "loan_repayments":
-        config = LoanRepaymentsConfig()
-        if args.rows is not None:
-            # rows is approximate; scale number of loans
-            # Example: assume ~24 rows per loan on average
-            approx_loans = max(1, args.rows // 24)
-            config.num_loans = approx_loans
-        gen = LoanRepaymentsGenerator(config)
-        df = gen.generate()
-        
-    elif args.scenario == "customer_360":
-        config = Customer360Config()
-        if args.rows is not None:
-            config.num_customers = args.rows
-        gen = Customer360Generator(config)
-        df = gen.generate()
+    try:
+        fmt = infer_format(out_path)
+    except ValueError:
+        parser.error("Output file must end with .csv or .parquet")
+
+    spec = get_scenario(args.scenario)
+    job = Job(
+        name=spec.name,
+        scenario=spec.name,
+        config=_build_config(parser, spec, args),
+        out=out_path,
+        format=fmt,
+        columns=args.columns,
+        where=args.where,
+        corrupt=_corruption(parser, args.corrupt),
+        max_memory=_max_memory(parser, args),
+        stats=args.stats,
+    )
+    try:
+        generator = spec.build_generator(job.config)
+        generator.project(args.columns).where(args.where).corrupt(job.corrupt)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.ordered and generator.condition is not None:
+        if generator.ORDERED_BY in generator.condition.columns:
+            parser.error(
+                f"--where on {generator.ORDERED_BY} cannot be combined with --ordered"
+            )
+    if args.ledger and args.where:
+        parser.error("--where cannot be combined with --ledger")
+    if args.explain:
+        print(json.dumps(_estimates([job], args.calibration)[0], indent=2))
+        return
+    if args.customer_keys is not None and spec.name == "customer_360":
+        build_key_index(job.config, args.customer_keys)
 
+    cache = _cache_from_args(args)
+    metrics = Metrics() if args.profile else None
+    with profiling(args.cprofile, args.tracemalloc):
+        try:
+            result = run_job(
+                job,
+                cache,
+                resume=args.resume,
+                chunk_rows=args.chunk_rows,
+                metrics=metrics,
+            )
+        except ValueError as exc:
+            # e.g. a --where literal of the wrong type for its column
+            parser.error(str(exc))
+    if cache is not None:
+        cache.prune()
 
+    source = " (from cache)" if result["cached"] else ""
+    print(f"Generated {result['rows']} rows{source} -> {out_path}")
+    if "memory" in result:
+        memory = result["memory"]
+        print(
+            f"Peak memory {format_size(memory['peak_rss'])} of "
+            f"{format_size(memory['max_memory'])} "
+            f"({memory['bytes_per_row']:.0f} B/row, "
+            f"chunks of {memory['chunk_rows']} rows)"
+        )
+    if "stats" in result:
+        print(f"Statistics -> {result['stats']}")
+    if metrics is not None:
+        print(metrics.format())
 
-    else:
-        parser.error(f"Unknown scenario: {args.scenario}")
 
-    if out_path.suffix.lower() == ".csv":
-        df.to_csv(out_path, index=False)
-    elif out_path.suffix.lower() in {".parquet", ".pq"}:
-        df.to_parquet(out_path, index=False)
+def _build_config(
+    parser: argparse.ArgumentParser, spec: ScenarioSpec, args: argparse.Namespace
+) -> Any:
+    overrides: dict[str, Any] = {}
+    if args.ordered:
+        if spec.generator_cls.ORDERED_BY is None:
+            parser.error(f"Scenario {spec.name!r} does not support --ordered")
+        overrides["ordered"] = True
+    if args.ledger:
+        if "ledger" not in {f.name for f in fields(spec.config_cls)}:
+            parser.error(f"Scenario {spec.name!r} does not support --ledger")
+        overrides["ledger"] = True
+    for skew in args.skew:
+        key, _, distribution = skew.partition("=")
+        if f"{key}_skew" not in {f.name for f in fields(spec.config_cls)}:
+            parser.error(f"Scenario {spec.name!r} has no skewable key {key!r}")
+        try:
+            key_sampler(distribution, 1)
+        except ValueError as exc:
+            parser.error(str(exc))
+        overrides[f"{key}_skew"] = distribution
+    keys = args.customer_keys
+    if keys is not None and spec.name != "customer_360":
+        if "customer_keys" not in {f.name for f in fields(spec.config_cls)}:
+            parser.error(f"Scenario {spec.name!r} does not take --customer-keys")
+        if read_key_index_digest(keys) is None:
+            parser.error(
+                f"No key index at {keys}; generate customer_360 with "
+                f"--customer-keys {keys} first"
+            )
+        overrides["customer_keys"] = keys
+    return spec.build_config(rows=args.rows, **overrides)
+
+
+def _corruption(
+    parser: argparse.ArgumentParser, path: str | None
+) -> CorruptionConfig | None:
+    if path is None:
+        return None
+    try:
+        return load_corruption(path)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+
+def _max_memory(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> int | None:
+    if args.max_memory is None:
+        return None
+    try:
+        return parse_size(args.max_memory)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+def _estimates(jobs: list[Job], calibration_path: str | None) -> list[dict]:
+    calibration = load_calibration(calibration_path)
+    return [
+        {"name": job.name, **explain(job.scenario, job.config, job.format, calibration)}
+        for job in jobs
+    ]
+
+
+def _append(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.columns or args.where or args.corrupt or args.stats:
+        parser.error(
+            "--columns, --where, --corrupt and --stats cannot be combined "
+            "with --append"
+        )
+    spec = get_scenario(args.scenario)
+    try:
+        part = append(
+            args.out,
+            spec.name,
+            _build_config(parser, spec, args),
+            until=args.until,
+            format=args.format,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    print(
+        f"Appended {part['rows']} rows ({part['start']} .. {part['end']}) "
+        f"-> {Path(args.out) / part['file']}"
+    )
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+    if args.cpus is not None:
+        manifest.budget.cpus = args.cpus
+    if args.memory is not None:
+        try:
+            manifest.budget.memory = parse_size(args.memory)
+        except ValueError as exc:
+            parser.error(str(exc))
+    if args.report is not None:
+        manifest.report = Path(args.report)
+    max_memory = _max_memory(parser, args)
+    if max_memory is not None:
+        for job in manifest.jobs:
+            if job.max_memory is None:
+                job.max_memory = max_memory
+    if args.stats:
+        for job in manifest.jobs:
+            job.stats = True
+    if args.explain:
+        print(json.dumps(_estimates(manifest.jobs, args.calibration), indent=2))
+        return
+
+    def report_job(result: dict) -> None:
+        if result["status"] == "ok":
+            source = " (cached)" if result["cached"] else ""
+            print(
+                f"[ok] {result['name']}: {result['rows']} rows{source} "
+                f"in {result['wall_seconds']:.2f}s -> {result['out']}"
+            )
+        else:
+            print(f"[failed] {result['name']}: {result['error']}")
+
+    report = run_manifest(
+        manifest,
+        cache=_cache_from_args(args),
+        on_job_done=report_job,
+        resume=args.resume,
+        chunk_rows=args.chunk_rows,
+    )
+
+    print(
+        f"Ran {len(manifest.jobs)} jobs ({report['jobs_failed']} failed) "
+        f"in {report['wall_seconds']:.2f}s; report -> {manifest.report}"
+    )
+    if report["jobs_failed"]:
+        raise SystemExit(1)
+
+
+def _bench(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline requires --baseline")
+    targets = args.targets or available_targets()
+
+    def report_case(result: dict) -> None:
+        throughput = f"{result['rows_per_second']:,.0f} rows/s"
+        if result["mb_per_second"] is not None:
+            throughput += f", {result['mb_per_second']:.1f} MB/s"
+        rss = result["peak_rss"]
+        peak = f", peak RSS {format_size(rss)}" if rss is not None else ""
+        print(
+            f"{result['scenario']} x{result['scale']} -> {result['target']}: "
+            f"{result['rows']} rows in {result['wall_seconds']:.2f}s "
+            f"({throughput}{peak})"
+        )
+
+    report = run_bench(args.scenarios, args.scales, targets, on_case_done=report_case)
+
+    if args.baseline and not args.save_baseline:
+        report["baseline"] = args.baseline
+        report["threshold"] = args.threshold
+        report["regressions"] = compare(
+            report, load_report(args.baseline), args.threshold
+        )
+
+    out = Path(args.baseline if args.save_baseline else args.report)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    calibration = record_calibration(report, args.calibration)
+    print(
+        f"Benchmarked {len(report['results'])} cases; report -> {out}; "
+        f"calibration -> {calibration}"
+    )
+
+    for regression in report.get("regressions", []):
+        print(
+            f"[regression] {regression['case']}: "
+            f"{regression['rows_per_second']:,.0f} rows/s vs "
+            f"{regression['baseline_rows_per_second']:,.0f} "
+            f"({regression['change']:+.1%})"
+        )
+    if report.get("regressions"):
+        raise SystemExit(1)
+
+
+def _emit(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    spec = get_scenario(args.scenario)
+    generator = spec.build_generator(spec.build_config(rows=args.rows))
+    try:
+        generator.corrupt(_corruption(parser, args.corrupt))
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.realtime and generator.EVENT_TIME is None:
+        parser.error(f"Scenario {spec.name!r} has no event time for --realtime")
+    profile = None
+    if args.rate is not None:
+        try:
+            profile = RateProfile(
+                args.rate,
+                ramp_seconds=args.ramp,
+                burst_factor=args.burst,
+                burst_seconds=args.burst_seconds,
+                burst_every=args.burst_every if args.burst != 1.0 else 0.0,
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+    elif args.ramp or args.burst != 1.0:
+        parser.error("--ramp and --burst require --rate")
+
+    def report(stats: dict) -> None:
+        target = stats["target_per_second"]
+        target = f" (target {target:,.0f}/s)" if target is not None else ""
+        latency = ""
+        if stats["send_ms_p50"] is not None:
+            latency = (
+                f", send p50 {stats['send_ms_p50']:.2f}ms "
+                f"p99 {stats['send_ms_p99']:.2f}ms"
+            )
+        print(
+            f"{stats['events']:,} events, {stats['events_per_second']:,.0f}/s"
+            f"{target}, lag {stats['lag_seconds']:.3f}s{latency}",
+            file=sys.stderr,
+        )
+
+    try:
+        result = emit(
+            generator,
+            args.to,
+            profile,
+            format=args.format,
+            realtime=args.realtime,
+            duration=args.duration,
+            stats_interval=args.stats_interval,
+            on_stats=report,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    except OSError as exc:
+        raise SystemExit(f"Cannot emit to {args.to}: {exc}") from None
+
+    if result["disconnected"] and args.to in ("-", "stdout"):
+        # Python flushes stdout at exit; point it somewhere that still exists
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    ended = " (consumer disconnected)" if result["disconnected"] else ""
+    print(
+        f"Emitted {result['events']:,} events in {result['seconds']:.2f}s "
+        f"({result['events_per_second']:,.0f}/s, "
+        f"max lag {result['max_lag_seconds']:.3f}s){ended}",
+        file=sys.stderr,
+    )
+
+
+def _serve(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    for name in args.preload or ():
+        if name not in SCENARIOS:
+            parser.error(f"Unknown scenario to preload: {name}")
+    address = args.socket or f"{args.host}:{args.port}"
+    try:
+        server = GenerationServer(
+            address,
+            workers=args.workers,
+            cache=_cache_from_args(args),
+            preload=args.preload,
+        )
+    except OSError as exc:
+        raise SystemExit(f"Cannot listen on {address}: {exc}") from None
+    with server:
+        server.warm()
+        scheme = "unix" if args.socket else "http"
+        print(
+            f"Serving {server.workers} warm workers on {scheme}://{server.address} "
+            "(POST /generate, GET /health); Ctrl-C stops",
+            flush=True,
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    print(f"Served {server.requests} requests")
+
+
+def _cache(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    cache = _cache_from_args(args)
+
+    if args.cache_command == "stats":
+        stats = cache.stats()
+        print(f"Cache directory: {stats['root']}")
+        print(f"Entries:         {stats['entries']}")
+        print(
+            f"Size:            {format_size(stats['bytes'])} "
+            f"(max {format_size(stats['max_size'])})"
+        )
+    elif args.cache_command == "prune":
+        if args.all:
+            max_size = 0
+        elif args.max_size is not None:
+            max_size = parse_size(args.max_size)
+        else:
+            max_size = None
+        evicted = cache.prune(max_size)
+        print(f"Evicted {len(evicted)} entries from {cache.root}")
+
+
+def _stats(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    try:
+        merged = merge_stats(args.files)
+    except (OSError, ValueError, KeyError) as exc:
+        parser.error(f"Cannot merge statistics: {exc}")
+    if args.out is None:
+        print(json.dumps(merged.to_dict(), indent=1))
     else:
-        parser.error("Output file must end with .csv or .parquet")
+        merged.write(args.out)
+        print(f"Merged {len(args.files)} files ({merged.rows} rows) -> {args.out}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
 
-    print(f"Generated {len(df)} rows -> {out_path}")
+    if args.command == "generate":
+        _generate(parser, args)
+    elif args.command == "run":
+        _run(parser, args)
+    elif args.command == "bench":
+        _bench(parser, args)
+    elif args.command == "emit":
+        _emit(parser, args)
+    elif args.command == "serve":
+        _serve(parser, args)
+    elif args.command == "cache":
+        _cache(parser, args)
+    elif args.command == "stats":
+        _stats(parser, args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import importlib
+from datetime import date, datetime
+from types import ModuleType
+from typing import Any, Mapping, Sequence
+
+BACKENDS = ("pandas", "arrow", "polars", "numpy")
+
+# backend name -> module providing the container
+_BACKEND_MODULES = {
+    "pandas": "pandas",
+    "arrow": "pyarrow",
+    "polars": "polars",
+    "numpy": "numpy",
+}
+
+
+def _import_backend(backend: str) -> ModuleType:
+    module_name = _BACKEND_MODULES[backend]
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as exc:
+        requirement = "numpy" if backend == "numpy" else f"data-generators-lab[{backend}]"
+        raise ImportError(
+            f"The {backend!r} backend requires {module_name}. "
+            f"Install it with: pip install {requirement}"
+        ) from exc
+
+
+def to_backend(columns: Mapping[str, Sequence[Any]], backend: str = "pandas") -> Any:
+    """Hand generated columns to the requested container.
+
+    ``columns`` maps column name -> values. Supported backends:
+
+    - ``pandas``: ``pandas.DataFrame``
+    - ``arrow``: ``pyarrow.Table``
+    - ``polars``: ``polars.DataFrame``
+    - ``numpy``: ``dict`` of column name -> ``numpy.ndarray``
+    """
+    if backend not in _BACKEND_MODULES:
+        raise ValueError(
+            f"Unsupported backend: {backend} (expected one of {', '.join(BACKENDS)})"
+        )
+    module = _import_backend(backend)
+
+    if backend == "pandas":
+        return module.DataFrame(dict(columns))
+    if backend == "arrow":
+        return module.table(dict(columns))
+    if backend == "polars":
+        return module.DataFrame(dict(columns))
+    return {name: _to_numpy_array(module, values) for name, values in columns.items()}
+
+
+def _to_numpy_array(np: ModuleType, values: Sequence[Any]) -> Any:
+    """Convert one column, keeping dates and timestamps as datetime64."""
+    sample = next((v for v in values if v is not None), None)
+    if isinstance(sample, datetime):
+        return np.array(values, dtype="datetime64[us]")
+    if isinstance(sample, date):
+        return np.array(values, dtype="datetime64[D]")
+    if sample is not None and any(v is None for v in values):
+        return np.array(values, dtype=object)
+    return np.asarray(values)
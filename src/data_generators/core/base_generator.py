@@ -1,23 +1,464 @@
 from __future__ import annotations
 
+import contextlib
+import math
+import random
+from itertools import compress
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar, ContextManager, Iterable, Iterator, Mapping
 
-import pandas as pd
+from .backends import to_backend
+from .corruption import CorruptionConfig, Corruptor
+from .instrumentation import Metrics
+from .io import write_columns
+from .predicates import Predicate
+from .utils import derive_seed, new_columns, num_rows
+
+_NO_STAGE = contextlib.nullcontext()
+
+#: Candidate rows drawn per rejection batch at most.
+MAX_CANDIDATE_BATCH = 1 << 20
+#: Give up on a predicate after this many candidates without a match.
+MAX_REJECTED_ROWS = 10_000_000
+#: Give up planning rows after this many consecutive blocks without any.
+MAX_EMPTY_BLOCKS = 100
 
 
 class BaseScenarioGenerator(ABC):
     """Base class for all scenario generators.
 
-    Subclasses must implement :meth:`generate` and return a pandas DataFrame.
+    A scenario is a sequence of independent entities (rows, employees, jobs,
+    loans, ...). Subclasses implement :meth:`num_entities` and
+    :meth:`_generate_entities`, which returns a mapping of column name -> list
+    of values for a range of entities, drawing randomness from ``self.rng``.
+
+    Entities are generated in blocks of :attr:`BLOCK_SIZE`; each block gets
+    its own seed derived from ``self.seed``, so any block can be produced on
+    its own (chunked writing, resuming, parallel shards) and the output does
+    not depend on how blocks are grouped. :meth:`generate` hands the columns
+    to the requested backend without building an intermediate DataFrame.
+
+    Time-bounded scenarios set :attr:`WINDOW_FIELDS` and implement
+    :meth:`window_config` so existing outputs can be extended incrementally
+    (see :mod:`data_generators.append`).
+
+    Generators that declare :attr:`COLUMN_DEPENDENCIES` draw each column from
+    its own :meth:`stream` and only compute columns for which :meth:`needs`
+    is true, so a projection (:meth:`project`) skips unneeded work while the
+    remaining values stay identical to a full run. Other generators compute
+    everything and the projection is applied afterwards.
+
+    A ``where`` predicate (:meth:`where`) is sampled conditionally by
+    generators with :attr:`CONDITIONAL_SAMPLING`: candidate rows of only the
+    predicate's columns (and their dependencies) are drawn and rejected in
+    adaptively sized batches, then the remaining columns are generated for the
+    accepted rows, which the generator reads from :meth:`fixed_columns`.
+    ``num_entities`` then counts matching rows. Other generators filter their
+    rows after generation.
+
+    :meth:`corrupt` injects data-quality issues (nulls, duplicates, late
+    events, malformed values, ...) into every block after projection.
+
+    Scenarios with :attr:`ORDERED_BY` can emit rows sorted by that time
+    column: :meth:`order_statistics` gives each block its slice of the sorted
+    sample without a global sort.
+
+    :meth:`instrument` attaches a :class:`~.instrumentation.Metrics` collector;
+    blocks are timed as the ``generate`` stage and generators may time
+    sub-stages (e.g. ``faker``) with ``with self.stage(name):``.
     """
 
+    #: Column names, in output order.
+    COLUMNS: ClassVar[tuple[str, ...]] = ()
+
+    #: Column -> output columns its values are computed from; ``None`` if the
+    #: generator does not support projection pushdown.
+    COLUMN_DEPENDENCIES: ClassVar[Mapping[str, tuple[str, ...]] | None] = None
+
+    #: Whether ``where`` predicates are sampled conditionally (one row per
+    #: entity, every column computed from its stream and declared
+    #: dependencies, fixed columns honoured); otherwise rows are filtered.
+    CONDITIONAL_SAMPLING: ClassVar[bool] = False
+
+    #: Time column that ``ordered`` configs sort the output by; ``None`` if
+    #: the scenario has no time-ordered mode. Values fixed by conditional
+    #: sampling keep the order they were accepted in.
+    ORDERED_BY: ClassVar[str | None] = None
+
+    #: Column holding each row's event time, which ``emit --realtime``
+    #: replaces with the wall-clock send time; ``None`` if there is none.
+    EVENT_TIME: ClassVar[str | None] = None
+
+    #: Entities per RNG block.
+    BLOCK_SIZE: ClassVar[int] = 4096
+
+    #: Config fields bounding the generated time window, e.g.
+    #: ``("start_date", "end_date")``; ``None`` if appends are unsupported.
+    WINDOW_FIELDS: ClassVar[tuple[str, str] | None] = None
+
+    #: Seed of the scenario config; subclasses set it in ``__init__``.
+    seed: int
+
+    #: Random source of the block being generated.
+    rng: random.Random
+
+    #: Stage timings / counters, when instrumented.
+    metrics: Metrics | None = None
+
+    #: Requested output columns (``None``: all of :attr:`COLUMNS`).
+    projection: tuple[str, ...] | None = None
+    #: Row filter (``None``: all rows).
+    condition: Predicate | None = None
+    #: Data-quality issues injected into each block (``None``: clean rows).
+    corruptor: Corruptor | None = None
+    _needed: frozenset[str] | None = None
+    _fixed: Mapping[str, list] = {}
+    _streams: dict[str, random.Random]
+    _block_seed: int
+
     @abstractmethod
-    def generate(self) -> pd.DataFrame:
-        """Generate a pandas DataFrame for this scenario."""
+    def num_entities(self) -> int:
+        """Number of entities the config describes."""
         raise NotImplementedError
 
+    @abstractmethod
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        """Generate entities ``[start, stop)`` (0-based) using ``self.rng``."""
+        raise NotImplementedError
+
+    def instrument(self, metrics: Metrics | None = None) -> Metrics:
+        """Collect stage timings and counters into ``metrics`` (or a new one)."""
+        self.metrics = metrics if metrics is not None else Metrics()
+        return self.metrics
+
+    def stage(self, name: str) -> ContextManager[Any]:
+        """Time ``name`` when instrumented; a shared no-op context otherwise."""
+        if self.metrics is None:
+            return _NO_STAGE
+        return self.metrics.stage(name)
+
+    def project(self, columns: Iterable[str] | None) -> BaseScenarioGenerator:
+        """Restrict the output to ``columns``, in that order (``None``: all)."""
+        if columns is not None:
+            columns = tuple(columns)
+            self._check_columns(columns)
+        self.projection = columns
+        self._resolve_needed()
+        return self
+
+    def where(self, predicate: str | Predicate | None) -> BaseScenarioGenerator:
+        """Only generate rows satisfying ``predicate`` (``None``: all rows)."""
+        if isinstance(predicate, str):
+            predicate = Predicate(predicate)
+        if predicate is not None:
+            self._check_columns(tuple(predicate.columns))
+        self.condition = predicate
+        self._resolve_needed()
+        return self
+
+    def corrupt(self, config: CorruptionConfig | None) -> BaseScenarioGenerator:
+        """Inject the issues of ``config`` into every block (``None``: none)."""
+        self.corruptor = Corruptor(config, self) if config is not None else None
+        return self
+
+    def _check_columns(self, columns: tuple[str, ...]) -> None:
+        unknown = [name for name in columns if name not in self.COLUMNS]
+        if unknown or not columns:
+            raise ValueError(
+                f"Unknown column(s) for {type(self).__name__}: "
+                f"{', '.join(unknown) or '<none>'} "
+                f"(expected some of {', '.join(self.COLUMNS)})"
+            )
+
+    def _closure(self, columns: Iterable[str]) -> frozenset[str]:
+        """``columns`` plus everything they are (transitively) computed from."""
+        dependencies = self.COLUMN_DEPENDENCIES or {}
+        needed: set[str] = set()
+        pending = list(columns)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(dependencies.get(name, ()))
+        return frozenset(needed)
+
+    def _resolve_needed(self) -> None:
+        if self.projection is None:
+            self._needed = None
+            return
+        wanted = set(self.projection)
+        if self.condition is not None:
+            wanted |= self.condition.columns
+        self._needed = self._closure(wanted)
+
+    @property
+    def output_columns(self) -> tuple[str, ...]:
+        return self.projection if self.projection is not None else self.COLUMNS
+
+    def needs(self, column: str) -> bool:
+        """Whether ``column`` is requested or another requested column uses it.
+
+        Columns already fixed by conditional sampling are not needed.
+        """
+        if column in self._fixed:
+            return False
+        return self._needed is None or column in self._needed
+
+    def fixed_columns(self) -> dict[str, list]:
+        """Columns already sampled for this block by a ``where`` predicate.
+
+        Conditional generators start their column mapping from this.
+        """
+        return dict(self._fixed)
+
+    def stream(self, name: str) -> random.Random:
+        """Random source dedicated to ``name`` (usually a column) in this block."""
+        rng = self._streams.get(name)
+        if rng is None:
+            rng = random.Random(derive_seed(self._block_seed, name))
+            self._streams[name] = rng
+        return rng
+
+    def expected_rows(self) -> float:
+        """Expected number of output rows, computed from the config alone.
+
+        The default assumes one row per entity; scenarios with a variable
+        number of rows per entity override it.
+        """
+        return float(self.num_entities())
+
+    def row_limit(self) -> int | None:
+        """Cap on total output rows, if the config sets one."""
+        return None
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        """Rows of each entity in ``[start, stop)`` of the current block.
+
+        Must make the same ``self.rng`` draws that shape those entities in
+        :meth:`_generate_entities`, and nothing more expensive. The default
+        is one row per entity.
+        """
+        return [1] * (stop - start)
+
+    def entities_for_rows(self, rows: int) -> int:
+        """Fewest entities whose rows add up to at least ``rows``.
+
+        Only the draws that shape entities are made, block by block. With
+        this many entities and :meth:`row_limit` set to ``rows`` the output
+        has exactly ``rows`` rows; only the last entity can be cut short.
+        """
+        total = empty_blocks = 0
+        block = 0
+        while total < rows:
+            start = block * self.BLOCK_SIZE
+            self._start_block(self.block_seed(block))
+            counts = self._entity_rows(start, start + self.BLOCK_SIZE)
+            for offset, count in enumerate(counts):
+                total += count
+                if total >= rows:
+                    return start + offset + 1
+            empty_blocks = 0 if any(counts) else empty_blocks + 1
+            if empty_blocks >= MAX_EMPTY_BLOCKS:
+                raise ValueError(
+                    f"{type(self).__name__} generates no rows for this config"
+                )
+            block += 1
+        return 0
+
+    def num_blocks(self) -> int:
+        return -(-self.num_entities() // self.BLOCK_SIZE)
+
+    def block_seed(self, block: int) -> int:
+        """Seed for ``block``; block 0 uses the config seed itself."""
+        return self.seed if block == 0 else derive_seed(self.seed, "block", block)
+
+    def generate_block(self, block: int) -> dict[str, list]:
+        """Generate one block of entities, independently of all other blocks."""
+        start = block * self.BLOCK_SIZE
+        stop = min(start + self.BLOCK_SIZE, self.num_entities())
+        with self.stage("generate"):
+            if self.condition is None:
+                self._start_block(self.block_seed(block))
+                generated = self._generate_entities(start, stop)
+            elif self.CONDITIONAL_SAMPLING:
+                generated = self._generate_conditioned(block, start, stop)
+            else:
+                self._start_block(self.block_seed(block))
+                generated = self.condition.filter(
+                    self._generate_entities(start, stop)
+                )
+        columns = {name: generated[name] for name in self.output_columns}
+        if self.corruptor is not None:
+            with self.stage("corrupt"):
+                columns = self.corruptor.apply(columns, block)
+        if self.metrics is None:
+            return columns
+
+        rows = num_rows(columns)
+        self.metrics.count("blocks")
+        self.metrics.count("rows", rows)
+        self.metrics.emit({"event": "block", "block": block, "rows": rows})
+        return columns
+
+    def _start_block(self, seed: int) -> None:
+        self._block_seed = seed
+        self._streams = {}
+        self.rng = random.Random(seed)
+
+    def _generate_conditioned(self, block: int, start: int, stop: int) -> dict:
+        """Entities ``[start, stop)`` conditioned on :attr:`condition`.
+
+        Candidates are rejected on the predicate's columns only; each batch
+        is sized from the acceptance rate seen so far in the block.
+        """
+        assert self.condition is not None
+        n = stop - start
+        seed = self.block_seed(block)
+        closure = self._closure(self.condition.columns)
+        needed, self._needed = self._needed, closure
+        accepted: dict[str, list] = {name: [] for name in closure}
+        hits = drawn = attempt = 0
+        batch = n
+        try:
+            while hits < n:
+                self._start_block(derive_seed(seed, "where", attempt))
+                candidates = self._generate_entities(0, batch)
+                mask = self.condition.mask(candidates)
+                for name in closure:
+                    accepted[name].extend(compress(candidates[name], mask))
+                hits += sum(mask)
+                drawn += batch
+                attempt += 1
+                if not hits and drawn >= MAX_REJECTED_ROWS:
+                    raise ValueError(
+                        f"No rows satisfy {self.condition.text!r} "
+                        f"({drawn} candidates rejected)"
+                    )
+                # Size the next batch from the acceptance rate seen so far
+                rate = max(hits, 1) / drawn
+                batch = min(
+                    MAX_CANDIDATE_BATCH, max(n, math.ceil((n - hits) / rate * 1.1))
+                )
+        finally:
+            self._needed = needed
+
+        self._fixed = {name: values[:n] for name, values in accepted.items()}
+        self._start_block(seed)
+        try:
+            return self._generate_entities(start, stop)
+        finally:
+            self._fixed = {}
+
+    def order_statistics(self, start: int, stop: int) -> list[float]:
+        """Sorted uniform ``[0, 1]`` values for the block of ``[start, stop)``.
+
+        Across blocks these are the order statistics of ``num_entities()``
+        uniforms. The value closing each block comes from a bisection tree of
+        beta draws seeded per node (``O(log blocks)`` per block) and the
+        values inside from normalised exponential spacings, so every block is
+        still generated on its own in ``O(rows)``.
+        """
+        block = start // self.BLOCK_SIZE
+        last = block + 1 >= self.num_blocks()
+        low = self._block_boundary(block) if block else 0.0
+        high = 1.0 if last else self._block_boundary(block + 1)
+        inside = stop - start if last else stop - start - 1
+
+        rng = self.stream("order")
+        gaps = [rng.expovariate(1.0) for _ in range(inside + 1)]
+        scale = (high - low) / sum(gaps)
+        values = []
+        position = low
+        for gap in gaps[:-1]:
+            position += gap * scale
+            values.append(min(position, high))
+        if not last:
+            values.append(high)
+        return values
+
+    def _block_boundary(self, block: int) -> float:
+        """Value of the last entity before ``block`` in sorted order."""
+        n = self.num_entities()
+        low_block, low_rank, low = 0, 0, 0.0
+        high_block, high_rank, high = self.num_blocks(), n + 1, 1.0
+        while True:
+            mid = (low_block + high_block) // 2
+            rank = mid * self.BLOCK_SIZE
+            # the rank-th of n sorted uniforms, given its neighbours in the tree
+            rng = random.Random(derive_seed(self.seed, "order", mid))
+            value = low + (high - low) * rng.betavariate(
+                rank - low_rank, high_rank - rank
+            )
+            if mid == block:
+                return value
+            if block < mid:
+                high_block, high_rank, high = mid, rank, value
+            else:
+                low_block, low_rank, low = mid, rank, value
+
+    def iter_blocks(
+        self, start_block: int = 0, rows_before: int = 0
+    ) -> Iterator[tuple[int, dict[str, list]]]:
+        """Yield ``(block, columns)`` from ``start_block`` on.
+
+        ``rows_before`` is the number of rows produced by earlier blocks, so
+        :meth:`row_limit` is honoured when resuming mid-way.
+        """
+        limit = self.row_limit()
+        rows = rows_before
+        for block in range(start_block, self.num_blocks()):
+            if limit is not None and rows >= limit:
+                return
+            columns = self.generate_block(block)
+            n = num_rows(columns)
+            if limit is not None and rows + n > limit:
+                keep = limit - rows
+                columns = {name: values[:keep] for name, values in columns.items()}
+                n = keep
+            rows += n
+            yield block, columns
+
+    def generate_columns(self) -> dict[str, list]:
+        """Generate the scenario as a mapping of column name -> values."""
+        columns = new_columns(self.output_columns)
+        for _, block_columns in self.iter_blocks():
+            for name, values in block_columns.items():
+                columns[name].extend(values)
+        return columns
+
+    def generate(
+        self,
+        backend: str = "pandas",
+        columns: Iterable[str] | None = None,
+        where: str | Predicate | None = None,
+    ) -> Any:
+        """Generate data for this scenario in the requested container.
+
+        ``backend`` is one of ``"pandas"`` (default), ``"arrow"``,
+        ``"polars"`` or ``"numpy"``. ``columns`` restricts the output (see
+        :meth:`project`) and ``where`` the rows (see :meth:`where`).
+        """
+        if columns is not None:
+            self.project(columns)
+        if where is not None:
+            self.where(where)
+        columns = self.generate_columns()
+        with self.stage("convert"):
+            return to_backend(columns, backend)
+
+    @classmethod
+    def window_config(
+        cls, config: Any, after: Any, end: Any, *, rows_before: int
+    ) -> Any:
+        """Config that generates only events after ``after`` up to ``end``.
+
+        ``config`` is the config the dataset was first generated with and
+        ``rows_before`` the number of rows already written. Entity-level
+        attributes (departments, ID sequences) must stay consistent with it.
+        """
+        raise NotImplementedError(f"{cls.__name__} does not support appends")
+
     def save(
         self,
         path: str | Path,
@@ -30,17 +471,6 @@ class BaseScenarioGenerator(ABC):
         Format can be inferred from the extension (.csv / .parquet)
         or provided explicitly.
         """
-        path = Path(path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        df = self.generate()
-
-        fmt = format or path.suffix.lower().lstrip(".")
-        if fmt == "csv":
-            df.to_csv(path, index=False, **kwargs)
-        elif fmt in {"parquet", "pq"}:
-            df.to_parquet(path, index=False, **kwargs)
-        else:
-            raise ValueError(f"Unsupported format: {fmt}")
-
-        return path
+        columns = self.generate_columns()
+        with self.stage("write"):
+            return write_columns(columns, path, format=format, **kwargs)
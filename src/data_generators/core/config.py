@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import dataclasses
+import types
+import typing
+from datetime import date, datetime
+from typing import Any, Mapping
+
+
+def config_from_dict(config_cls: type, data: Mapping[str, Any] | None = None) -> Any:
+    """Build a config dataclass from plain (YAML-loaded) values.
+
+    Unknown keys raise ``ValueError``. Values are coerced to the field's
+    annotated type where YAML can't express it directly: ISO strings become
+    ``date`` / ``datetime`` and lists become tuples.
+    """
+    data = dict(data or {})
+    hints = typing.get_type_hints(config_cls)
+    fields = {f.name for f in dataclasses.fields(config_cls)}
+
+    unknown = sorted(set(data) - fields)
+    if unknown:
+        raise ValueError(
+            f"Unknown {config_cls.__name__} field(s): {', '.join(unknown)}"
+        )
+
+    kwargs = {name: _coerce(value, hints[name], name) for name, value in data.items()}
+    return config_cls(**kwargs)
+
+
+def coerce_field(config_cls: type, name: str, value: Any) -> Any:
+    """Coerce a single YAML / CLI value to the type of ``config_cls.name``."""
+    return _coerce(value, typing.get_type_hints(config_cls)[name], name)
+
+
+def config_to_dict(config: Any) -> dict[str, Any]:
+    """Inverse of :func:`config_from_dict` (dates rendered as ISO strings)."""
+    out: dict[str, Any] = {}
+    for name, value in dataclasses.asdict(config).items():
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        elif isinstance(value, tuple):
+            value = list(value)
+        out[name] = value
+    return out
+
+
+def _coerce(value: Any, hint: Any, name: str) -> Any:
+    if value is None:
+        return None
+
+    origin = typing.get_origin(hint)
+    if origin in (typing.Union, types.UnionType):
+        options = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        if len(options) == 1:
+            return _coerce(value, options[0], name)
+        return value
+
+    if origin is tuple:
+        args = typing.get_args(hint)
+        item_hint = args[0] if args else Any
+        return tuple(_coerce(item, item_hint, name) for item in value)
+
+    try:
+        if hint is datetime:
+            if isinstance(value, datetime):
+                return value
+            if isinstance(value, date):
+                return datetime.combine(value, datetime.min.time())
+            return datetime.fromisoformat(str(value))
+        if hint is date:
+            if isinstance(value, datetime):
+                return value.date()
+            if isinstance(value, date):
+                return value
+            return date.fromisoformat(str(value))
+        if hint is str and isinstance(value, (date, datetime)):
+            # YAML turns unquoted 2023-01-01 into a date; string fields keep ISO text
+            return value.isoformat()
+        if hint is float and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+        if hint is int and isinstance(value, str):
+            return int(value)
+    except ValueError as exc:
+        raise ValueError(f"Invalid value for {name}: {value!r} ({exc})") from None
+
+    return value
@@ -0,0 +1,216 @@
+"""Data-quality corruption of generated blocks.
+
+A :class:`CorruptionConfig` lists issues to inject into a scenario's rows,
+e.g. from YAML::
+
+    nulls: {amount: 0.02, merchant: 0.05}   # column -> share set to null
+    duplicates: 0.01                        # share of rows repeated
+    late: 0.03                              # share of rows arriving late
+    max_delay: 172800                       # seconds a late event is older
+    malformed: {merchant: 0.01}             # string column -> share mangled
+    outliers: {amount: 0.001}               # numeric column -> share scaled
+    type_drift: {amount: 0.001}             # column -> share of another type
+    seed: 7
+
+Each issue picks its rows as a precomputed mask of positions per block,
+drawn with geometric skips, so it costs time per corrupted value rather than
+per row. Duplicated rows are appended to their block, so they arrive after
+the original, and late rows keep their position but get an older event
+time, so the output is no longer in time order. Type drift turns its column
+into text, which is the one issue that touches every row of a column.
+Masks are seeded per block, so corrupted outputs stay reproducible and
+resumable.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from .utils import derive_seed, num_rows
+
+
+@dataclass
+class CorruptionConfig:
+    """Rates of data-quality issues injected into generated rows."""
+
+    nulls: dict[str, float] = field(default_factory=dict)
+    duplicates: float = 0.0
+    late: float = 0.0
+    # Time column of late rows (default: the scenario's event time)
+    late_column: str | None = None
+    max_delay: int = 86400
+    malformed: dict[str, float] = field(default_factory=dict)
+    outliers: dict[str, float] = field(default_factory=dict)
+    # Outliers are 1-10x this factor off (a fifth of them negative)
+    outlier_factor: float = 100.0
+    type_drift: dict[str, float] = field(default_factory=dict)
+    seed: int = 0
+
+
+def positions(rng: random.Random, n: int, rate: float) -> list[int]:
+    """Sorted positions in ``range(n)``, each included with probability ``rate``.
+
+    Gaps between hits are geometric, so this costs ``O(hits)``.
+    """
+    if rate <= 0 or n <= 0:
+        return []
+    if rate >= 1:
+        return list(range(n))
+    log_miss = math.log1p(-rate)
+    hits = []
+    position = -1
+    while True:
+        position += 1 + int(math.log(1.0 - rng.random()) / log_miss)
+        if position >= n:
+            return hits
+        hits.append(position)
+
+
+class Corruptor:
+    """Applies a :class:`CorruptionConfig` to the blocks of one generator."""
+
+    def __init__(self, config: CorruptionConfig, generator: Any) -> None:
+        self.cfg = config
+        self.seed = derive_seed(generator.seed, "corrupt", config.seed)
+        self.late_column = (
+            config.late_column or generator.EVENT_TIME or generator.ORDERED_BY
+        )
+        if config.late and self.late_column is None:
+            raise ValueError(
+                f"{type(generator).__name__} has no event time; set late_column"
+            )
+
+        rates = {"duplicates": config.duplicates, "late": config.late}
+        columns = {self.late_column} if config.late else set()
+        for issue in ("nulls", "malformed", "outliers", "type_drift"):
+            for name, rate in getattr(config, issue).items():
+                rates[f"{issue}.{name}"] = rate
+                columns.add(name)
+        invalid = [name for name, rate in rates.items() if not 0 <= rate <= 1]
+        if invalid:
+            raise ValueError(
+                f"Corruption rates must be in [0, 1]: {', '.join(invalid)}"
+            )
+        unknown = sorted(columns - set(generator.COLUMNS))
+        if unknown:
+            raise ValueError(
+                f"Unknown column(s) to corrupt for {type(generator).__name__}: "
+                f"{', '.join(unknown)}"
+            )
+
+    def apply(self, columns: dict[str, list], block: int) -> dict[str, list]:
+        """Corrupt one block's ``columns`` in place (missing columns are skipped)."""
+        cfg = self.cfg
+        n = num_rows(columns)
+
+        def hits(issue: str, name: str, rate: float) -> list[int]:
+            rng = random.Random(derive_seed(self.seed, block, issue, name))
+            return positions(rng, n, rate)
+
+        def rng(issue: str, name: str) -> random.Random:
+            return random.Random(derive_seed(self.seed, block, issue, name, "value"))
+
+        if cfg.late and self.late_column in columns:
+            values = columns[self.late_column]
+            delays = rng("late", self.late_column)
+            for i in hits("late", self.late_column, cfg.late):
+                value = values[i]
+                if value is None:
+                    continue
+                if not isinstance(value, (date, datetime)):
+                    raise ValueError(
+                        f"late needs a date or datetime column; "
+                        f"{self.late_column} holds {type(value).__name__}"
+                    )
+                values[i] = value - timedelta(seconds=delays.randint(1, cfg.max_delay))
+
+        for name, rate in cfg.outliers.items():
+            if name in columns:
+                values = columns[name]
+                factors = rng("outliers", name)
+                for i in hits("outliers", name, rate):
+                    values[i] = _outlier(factors, values[i], cfg.outlier_factor, name)
+
+        for name, rate in cfg.malformed.items():
+            if name in columns:
+                values = columns[name]
+                mangle = rng("malformed", name)
+                for i in hits("malformed", name, rate):
+                    values[i] = _malform(mangle, values[i], name)
+
+        for name, rate in cfg.type_drift.items():
+            if name in columns:
+                values = columns[name]
+                text = [None if value is None else str(value) for value in values]
+                drift = rng("type_drift", name)
+                for i in hits("type_drift", name, rate):
+                    text[i] = _drift(drift, values[i])
+                columns[name] = text
+
+        for name, rate in cfg.nulls.items():
+            if name in columns:
+                values = columns[name]
+                for i in hits("nulls", name, rate):
+                    values[i] = None
+
+        if cfg.duplicates:
+            repeated = hits("duplicates", "", cfg.duplicates)
+            for values in columns.values():
+                values.extend([values[i] for i in repeated])
+        return columns
+
+
+def _outlier(rng: random.Random, value: Any, factor: float, name: str) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(
+            f"outliers need a numeric column; {name} holds {type(value).__name__}"
+        )
+    scale = factor * rng.uniform(1.0, 10.0)
+    if rng.random() < 0.2:
+        scale = -scale
+    outlier = (value or 1) * scale
+    return round(outlier) if isinstance(value, int) else round(outlier, 2)
+
+
+def _malform(rng: random.Random, value: Any, name: str) -> Any:
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(
+            f"malformed needs a string column ({name} holds "
+            f"{type(value).__name__}); use type_drift instead"
+        )
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f"  {value} "
+    if kind == 1:
+        return value.upper() if value != value.upper() else value.lower()
+    if kind == 2:
+        return value[: max(1, len(value) // 2)]
+    if kind == 3:
+        at = rng.randint(0, len(value))
+        return value[:at] + rng.choice(("�", "#", ";", '"', "\\N")) + value[at:]
+    return value.replace(" ", "") if " " in value else value + value[-1:]
+
+
+def _drift(rng: random.Random, value: Any) -> str | None:
+    """``value`` as text of another type, as a loosely typed source writes it."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return rng.choice(
+            (value.strftime("%d/%m/%Y %H:%M"), str(int(value.timestamp())))
+        )
+    if isinstance(value, date):
+        return rng.choice((value.strftime("%d/%m/%Y"), value.strftime("%Y%m%d")))
+    if isinstance(value, int):
+        return rng.choice((f"{value}.0", "true" if value else "false", f"'{value}'"))
+    if isinstance(value, float):
+        return rng.choice((f"{value:,.2f}", f"{value:.3e}", f"{value} USD", "NaN"))
+    return rng.choice(("0", "N/A", "null", "-1"))
@@ -0,0 +1,176 @@
+"""Skewed key distributions for reproducing data skew.
+
+Key columns draw ranks in ``[1, n]`` (rank 1 is the hottest key) from a
+sampler described by a short spec string:
+
+* ``"uniform"``: every key equally likely.
+* ``"zipf:<s>"``: Zipf / power law, ``P(k) ~ 1 / k**s``.
+* ``"hot:<key share>:<row share>"``: ``row share`` of the draws fall on the
+  hottest ``key share`` of the keys, the rest uniformly on the others, e.g.
+  ``"hot:0.001:0.8"``.
+
+Every sampler is ``O(1)`` per draw and keeps no tables, so key spaces of
+``1e8`` and more cost nothing to set up. Zipf uses rejection-inversion
+(Hörmann & Derflinger, 1996), which accepts almost every candidate.
+:meth:`KeySampler.draws` makes the same kind of draws for a whole array
+with numpy.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+
+import numpy as np
+
+
+class KeySampler:
+    """Draws key ranks in ``[1, n]``."""
+
+    n: int
+
+    def sample(self, rng: random.Random) -> int:
+        raise NotImplementedError
+
+    def samples(self, rng: random.Random, k: int) -> list[int]:
+        sample = self.sample
+        return [sample(rng) for _ in range(k)]
+
+    def draws(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        """``k`` ranks drawn with numpy."""
+        raise NotImplementedError
+
+
+class UniformSampler(KeySampler):
+    def __init__(self, n: int) -> None:
+        self.n = n
+
+    def sample(self, rng: random.Random) -> int:
+        return rng.randint(1, self.n)
+
+    def draws(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        return rng.integers(1, self.n, k, endpoint=True)
+
+
+class HotKeySampler(KeySampler):
+    """``row_share`` of draws on the ``key_share`` hottest keys."""
+
+    def __init__(self, n: int, key_share: float, row_share: float) -> None:
+        if not 0 < key_share <= 1 or not 0 <= row_share <= 1:
+            raise ValueError("hot key and row shares must be in (0, 1] and [0, 1]")
+        self.n = n
+        self.hot = min(n, max(1, round(n * key_share)))
+        self.row_share = row_share if self.hot < n else 1.0
+
+    def sample(self, rng: random.Random) -> int:
+        if rng.random() < self.row_share:
+            return rng.randint(1, self.hot)
+        return rng.randint(self.hot + 1, self.n)
+
+    def draws(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        hot = rng.random(k) < self.row_share
+        cold = rng.integers(self.hot + 1, max(self.n, self.hot + 1), k, endpoint=True)
+        return np.where(hot, rng.integers(1, self.hot, k, endpoint=True), cold)
+
+
+class ZipfSampler(KeySampler):
+    """Zipf ranks by rejection-inversion; exponent ``s`` > 0."""
+
+    def __init__(self, n: int, s: float) -> None:
+        if s <= 0:
+            raise ValueError(f"Zipf exponent must be positive, got {s}")
+        self.n = n
+        self.s = s
+        self._h_x1 = self._h_integral(1.5) - 1.0
+        self._h_n = self._h_integral(n + 0.5)
+        self._threshold = 2.0 - self._h_integral_inverse(
+            self._h_integral(2.5) - self._h(2.0)
+        )
+
+    def sample(self, rng: random.Random) -> int:
+        while True:
+            u = self._h_n + rng.random() * (self._h_x1 - self._h_n)
+            x = self._h_integral_inverse(u)
+            k = min(max(int(x + 0.5), 1), self.n)
+            # Nearly always accepted by the first test
+            if k - x <= self._threshold:
+                return k
+            if u >= self._h_integral(k + 0.5) - self._h(k):
+                return k
+
+    def draws(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        ranks = np.empty(k, np.int64)
+        pending = np.arange(k)
+        while len(pending):
+            u = self._h_n + rng.random(len(pending)) * (self._h_x1 - self._h_n)
+            x = self._h_integral_inverse_array(u)
+            candidates = np.clip(np.rint(x), 1, self.n)
+            accept = candidates - x <= self._threshold
+            rest = ~accept
+            accept[rest] = u[rest] >= (
+                self._h_integral_array(candidates[rest] + 0.5)
+                - np.exp(-self.s * np.log(candidates[rest]))
+            )
+            ranks[pending[accept]] = candidates[accept]
+            pending = pending[~accept]
+        return ranks
+
+    def _h(self, x: float) -> float:
+        return math.exp(-self.s * math.log(x))
+
+    def _h_integral(self, x: float) -> float:
+        log_x = math.log(x)
+        return _expm1_ratio((1.0 - self.s) * log_x) * log_x
+
+    def _h_integral_inverse(self, x: float) -> float:
+        t = max(x * (1.0 - self.s), -1.0)
+        return math.exp(_log1p_ratio(t) * x)
+
+    def _h_integral_array(self, x: np.ndarray) -> np.ndarray:
+        log_x = np.log(x)
+        if abs(1.0 - self.s) < 1e-8:
+            return log_x
+        return np.expm1((1.0 - self.s) * log_x) / (1.0 - self.s)
+
+    def _h_integral_inverse_array(self, x: np.ndarray) -> np.ndarray:
+        if abs(1.0 - self.s) < 1e-8:
+            return np.exp(x)
+        t = np.maximum(x * (1.0 - self.s), -1.0)
+        return np.exp(np.log1p(t) / (1.0 - self.s))
+
+
+def _expm1_ratio(x: float) -> float:
+    """``expm1(x) / x``, accurate near 0."""
+    if abs(x) > 1e-8:
+        return math.expm1(x) / x
+    return 1.0 + x * 0.5 * (1.0 + x / 3.0 * (1.0 + 0.25 * x))
+
+
+def _log1p_ratio(x: float) -> float:
+    """``log1p(x) / x``, accurate near 0."""
+    if abs(x) > 1e-8:
+        return math.log1p(x) / x
+    return 1.0 - x * (0.5 - x * (1.0 / 3.0 - 0.25 * x))
+
+
+def key_sampler(spec: str | None, n: int) -> KeySampler | None:
+    """Sampler over ``n`` keys for ``spec`` (``None``: no skew configured)."""
+    if spec is None:
+        return None
+    if n < 1:
+        raise ValueError(f"Key space must hold at least one key, got {n}")
+    kind, _, args = spec.partition(":")
+    try:
+        params = [float(part) for part in args.split(":")] if args else []
+        if kind == "uniform" and not params:
+            return UniformSampler(n)
+        if kind == "zipf" and len(params) == 1:
+            return ZipfSampler(n, params[0])
+        if kind == "hot" and len(params) == 2:
+            return HotKeySampler(n, *params)
+    except ValueError as exc:
+        raise ValueError(f"Invalid key distribution {spec!r}: {exc}") from None
+    raise ValueError(
+        f"Invalid key distribution {spec!r} (expected uniform, zipf:<s> or "
+        "hot:<key share>:<row share>)"
+    )
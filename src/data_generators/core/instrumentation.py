@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import contextlib
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+#: Receives one event dict per finished stage / block, e.g.
+#: ``{"event": "stage", "name": "write", "seconds": 0.12}``.
+Observer = Callable[[dict[str, Any]], None]
+
+
+class Metrics:
+    """Named stage timers and counters collected while a generator runs.
+
+    Attach with :meth:`BaseScenarioGenerator.instrument`; generators that are
+    not instrumented skip all bookkeeping. Stages may nest (``faker`` runs
+    inside ``generate``), so shares of the total can add up to more than 100%.
+    """
+
+    def __init__(self, observers: list[Observer] | None = None) -> None:
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, int] = defaultdict(int)
+        self.counters: dict[str, int] = defaultdict(int)
+        self.observers = list(observers or [])
+        self.started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.seconds[name] += elapsed
+            self.calls[name] += 1
+            self.emit({"event": "stage", "name": name, "seconds": elapsed})
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def emit(self, event: dict[str, Any]) -> None:
+        for observer in self.observers:
+            observer(event)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "wall_seconds": round(time.perf_counter() - self.started, 4),
+            "stages": {
+                name: {"seconds": round(seconds, 4), "calls": self.calls[name]}
+                for name, seconds in self.seconds.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def format(self) -> str:
+        """Per-stage breakdown as a small text table."""
+        total = time.perf_counter() - self.started
+        lines = [f"{'stage':<12} {'seconds':>9} {'calls':>7} {'share':>7}"]
+        for name, seconds in sorted(self.seconds.items(), key=lambda kv: -kv[1]):
+            share = seconds / total if total else 0.0
+            lines.append(
+                f"{name:<12} {seconds:>9.3f} {self.calls[name]:>7} {share:>7.1%}"
+            )
+        lines.append(f"{'total':<12} {total:>9.3f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name}: {value:,}")
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profiling(
+    cprofile: str | Path | None = None, tracemalloc: str | Path | None = None
+) -> Iterator[None]:
+    """Optionally run the body under cProfile and/or tracemalloc.
+
+    ``cprofile`` receives a ``pstats`` dump (``python -m pstats <file>``) and
+    ``tracemalloc`` a snapshot loadable with ``tracemalloc.Snapshot.load``.
+    """
+    profiler = None
+    if cprofile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    if tracemalloc is not None:
+        import tracemalloc as tm
+
+        tm.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(str(cprofile))
+        if tracemalloc is not None:
+            tm.take_snapshot().dump(str(tracemalloc))
+            tm.stop()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import csv
+import os
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from .backends import _import_backend
+
+FORMATS = ("csv", "parquet")
+
+
+def infer_format(path: str | Path, format: str | None = None) -> str:
+    """Resolve the output format from an explicit value or the file extension."""
+    fmt = (format or Path(path).suffix.lstrip(".")).lower()
+    if fmt == "pq":
+        fmt = "parquet"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt or '<none>'}")
+    return fmt
+
+
+def write_columns(
+    columns: Mapping[str, Sequence[Any]],
+    path: str | Path,
+    *,
+    format: str | None = None,
+    **kwargs: Any,
+) -> Path:
+    """Write generated columns straight to CSV or Parquet (no DataFrame).
+
+    The file is written next to ``path`` and renamed into place, so an
+    existing file (possibly a hardlink into the output cache) is replaced
+    rather than overwritten in place.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+    fmt = infer_format(path, format)
+    try:
+        if fmt == "csv":
+            with tmp.open("w", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh, lineterminator="\n", **kwargs)
+                writer.writerow(list(columns))
+                writer.writerows(zip(*columns.values()))
+        else:
+            pa = _import_backend("arrow")
+            import pyarrow.parquet as pq
+
+            pq.write_table(pa.table(dict(columns)), tmp, **kwargs)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    return path
@@ -0,0 +1,123 @@
+"""Row predicates for ``where`` filters.
+
+A predicate is a Python-like boolean expression over column names and
+literals, e.g. ``is_fraud == 1``, ``channel in ('ECOM', 'UPI')`` or
+``risk_segment == 'HIGH' and not has_loan``. Supported are ``and``, ``or``,
+``not``, one comparison per operand (``==``, ``!=``, ``<``, ``<=``, ``>``,
+``>=``, ``in``, ``not in``) and bare column names (truthiness). Predicates
+are evaluated column-at-a-time into a boolean mask.
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+from itertools import compress
+from typing import Any, Callable, Mapping
+
+Mask = list[bool]
+
+_OPERATORS: dict[type, Callable[[Any, Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+class Predicate:
+    """A parsed ``where`` expression."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text.strip()
+        try:
+            tree = ast.parse(self.text, mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"Invalid predicate {text!r}: {exc.msg}") from None
+        columns: set[str] = set()
+        self._evaluate = self._compile(tree.body, columns)
+        #: Columns the predicate reads.
+        self.columns = frozenset(columns)
+
+    def __repr__(self) -> str:
+        return f"Predicate({self.text!r})"
+
+    def mask(self, columns: Mapping[str, list]) -> Mask:
+        """Whether each row of ``columns`` satisfies the predicate."""
+        return self._evaluate(columns)
+
+    def filter(self, columns: Mapping[str, list]) -> dict[str, list]:
+        """The rows of ``columns`` that satisfy the predicate."""
+        mask = self.mask(columns)
+        return {name: list(compress(values, mask)) for name, values in columns.items()}
+
+    def _compile(
+        self, node: ast.AST, columns: set[str]
+    ) -> Callable[[Mapping[str, list]], Mask]:
+        if isinstance(node, ast.BoolOp):
+            operands = [self._compile(value, columns) for value in node.values]
+            combine = all if isinstance(node.op, ast.And) else any
+            return lambda data: [
+                combine(row) for row in zip(*(operand(data) for operand in operands))
+            ]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = self._compile(node.operand, columns)
+            return lambda data: [not value for value in operand(data)]
+        if isinstance(node, ast.Name):
+            name = node.id
+            columns.add(name)
+            return lambda data: [bool(value) for value in data[name]]
+        if (
+            isinstance(node, ast.Compare)
+            and len(node.ops) == 1
+            and isinstance(node.left, ast.Name)
+        ):
+            name = node.left.id
+            columns.add(name)
+            literal = self._literal(node.comparators[0])
+            op = type(node.ops[0])
+            if op in (ast.In, ast.NotIn):
+                try:
+                    choices = frozenset(literal)
+                except TypeError:
+                    raise ValueError(
+                        f"Invalid predicate {self.text!r}: "
+                        f"'in' needs a tuple or list of values"
+                    ) from None
+                negate = op is ast.NotIn
+                return lambda data: [
+                    (value in choices) != negate for value in data[name]
+                ]
+            compare = _OPERATORS[op]
+            if op in (ast.Eq, ast.NotEq):
+                return lambda data: [compare(value, literal) for value in data[name]]
+
+            def ordered(data: Mapping[str, list]) -> Mask:
+                try:
+                    # Missing values never satisfy an ordering comparison
+                    return [
+                        value is not None and compare(value, literal)
+                        for value in data[name]
+                    ]
+                except TypeError:
+                    raise ValueError(
+                        f"Invalid predicate {self.text!r}: "
+                        f"cannot compare {name} with {literal!r}"
+                    ) from None
+
+            return ordered
+        raise ValueError(
+            f"Invalid predicate {self.text!r}: unsupported expression "
+            f"{ast.unparse(node)!r}"
+        )
+
+    def _literal(self, node: ast.AST) -> Any:
+        try:
+            return ast.literal_eval(node)
+        except ValueError:
+            raise ValueError(
+                f"Invalid predicate {self.text!r}: "
+                f"{ast.unparse(node)!r} is not a literal"
+            ) from None
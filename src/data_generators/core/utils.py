@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import math
+import random
+import uuid
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def ensure_dir(path: str | Path) -> Path:
@@ -13,4 +19,125 @@ def ensure_dir(path: str | Path) -> Path:
 
 
 def concat_dataframes(dfs: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    import pandas as pd
+
     return pd.concat(list(dfs), ignore_index=True)
+
+
+def derive_seed(seed: int, *parts: object) -> int:
+    """Derive an independent, reproducible seed from ``seed`` and ``parts``."""
+    digest = hashlib.blake2b(repr((seed, *parts)).encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "big") >> 1
+
+
+def random_uuid(rng: random.Random) -> str:
+    """UUID4 string drawn from ``rng`` (reproducible, unlike :func:`uuid.uuid4`)."""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def poisson(rng: random.Random, lam: float) -> int:
+    """Poisson draw with mean ``lam`` (normal approximation above 30)."""
+    if lam <= 0:
+        return 0
+    if lam > 30:
+        return max(0, round(rng.gauss(lam, math.sqrt(lam))))
+    # Knuth: count uniforms until their product drops below exp(-lam)
+    limit = math.exp(-lam)
+    count = 0
+    product = rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def new_columns(names: Iterable[str]) -> dict[str, list]:
+    """Return an empty column mapping with one list per column name."""
+    return {name: [] for name in names}
+
+
+def append_row(columns: dict[str, list], row: Mapping[str, Any]) -> None:
+    """Append a single record to a column mapping built by :func:`new_columns`."""
+    for name, value in row.items():
+        columns[name].append(value)
+
+
+def num_rows(columns: Mapping[str, Any]) -> int:
+    """Number of rows in a column mapping."""
+    for values in columns.values():
+        return len(values)
+    return 0
+
+
+_SIZE_UNITS = {
+    "": 1,
+    "B": 1,
+    "K": 1024,
+    "KB": 1024,
+    "M": 1024**2,
+    "MB": 1024**2,
+    "G": 1024**3,
+    "GB": 1024**3,
+    "T": 1024**4,
+    "TB": 1024**4,
+}
+
+
+def parse_size(value: str | int | float) -> int:
+    """Parse a human byte size such as ``512MB`` or ``2GB`` (binary units)."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = value.strip().upper().replace(" ", "").removesuffix("IB")
+    number = text.rstrip("KMGTB")
+    unit = text[len(number):]
+    try:
+        if unit not in _SIZE_UNITS:
+            raise ValueError
+        return int(float(number) * _SIZE_UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Invalid size: {value!r}") from None
+
+
+def format_size(num_bytes: float) -> str:
+    """Render a byte count with a binary unit, e.g. ``1.5 GB``."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{int(num_bytes)} B"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TB"
+
+
+def datetimes_at(
+    fractions: Iterable[float], start: datetime, end: datetime
+) -> list[datetime]:
+    """Whole seconds of ``[start, end]`` at ``fractions`` (in ``[0, 1]``) of it.
+
+    Order is preserved, so sorted fractions give sorted timestamps.
+    """
+    seconds = int((end - start).total_seconds())
+    return [
+        start + timedelta(seconds=min(int(f * (seconds + 1)), seconds))
+        for f in fractions
+    ]
+
+
+def rows_in_window(
+    num_rows: int,
+    start: datetime,
+    end: datetime,
+    after: datetime,
+    new_end: datetime,
+) -> int:
+    """Rows to generate for ``(after, new_end]`` at the rate of ``num_rows`` over
+    ``[start, end]``.
+
+    Counts telescope, so a dataset extended window by window ends up with the
+    same total as generating the whole span at that rate.
+    """
+    span = (end - start).total_seconds()
+    if span <= 0:
+        return num_rows
+    rate = num_rows / span
+    return round(rate * (new_end - start).total_seconds()) - round(
+        rate * (after - start).total_seconds()
+    )
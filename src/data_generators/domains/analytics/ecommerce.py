@@ -1,13 +1,11 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-import random
-from typing import List
-
-import pandas as pd
 
 from ...core.base_generator import BaseScenarioGenerator
+from ...core.utils import new_columns
 
 
 @dataclass
@@ -21,28 +19,39 @@ class EcommerceConfig:
 class EcommerceEventsGenerator(BaseScenarioGenerator):
     """Simple ecommerce event stream generator (view, add_to_cart, purchase)."""
 
+    COLUMNS = ("user_id", "event_time", "event_type")
+    EVENT_TIME = "event_time"
+    BLOCK_SIZE = 128  # users
+
     def __init__(self, config: EcommerceConfig | None = None) -> None:
         self.config = config or EcommerceConfig()
-        random.seed(self.config.seed)
+        self.seed = self.config.seed
+
+    def num_entities(self) -> int:
+        return self.config.num_users
 
-    def generate(self) -> pd.DataFrame:
-        records: List[dict] = []
+    def expected_rows(self) -> float:
+        return self.config.num_users * (5 + self.config.max_events_per_user) / 2
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        # Event counts are drawn between event values: count a generated block
+        events = Counter(self._generate_entities(start, stop)["user_id"])
+        return [events[user_id] for user_id in range(start + 1, stop + 1)]
+
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        columns = new_columns(self.COLUMNS)
 
         event_types = ["view", "add_to_cart", "purchase"]
-        for user_id in range(1, self.config.num_users + 1):
+        for user_id in range(start + 1, stop + 1):
             t = self.config.start_time
-            num_events = random.randint(5, self.config.max_events_per_user)
+            num_events = self.rng.randint(5, self.config.max_events_per_user)
             for _ in range(num_events):
-                t += timedelta(minutes=random.randint(1, 120))
-                event = random.choices(
+                t += timedelta(minutes=self.rng.randint(1, 120))
+                event = self.rng.choices(
                     event_types, weights=[0.7, 0.2, 0.1], k=1
                 )[0]
-                records.append(
-                    {
-                        "user_id": user_id,
-                        "event_time": t,
-                        "event_type": event,
-                    }
-                )
-
-        return pd.DataFrame(records)
+                columns["user_id"].append(user_id)
+                columns["event_time"].append(t)
+                columns["event_type"].append(event)
+
+        return columns
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from datetime import date, timedelta
-import random
-from typing import List
-
-import pandas as pd
 
 from ...core.base_generator import BaseScenarioGenerator
+from ...core.utils import new_columns
 
 
 @dataclass
@@ -21,25 +19,39 @@ class SalesConfig:
 class SalesGenerator(BaseScenarioGenerator):
     """Simple daily sales orders generator."""
 
+    COLUMNS = ("order_id", "order_date", "amount")
+    BLOCK_SIZE = 128  # days
+
     def __init__(self, config: SalesConfig | None = None) -> None:
         self.config = config or SalesConfig()
-        random.seed(self.config.seed)
+        self.seed = self.config.seed
+
+    def num_entities(self) -> int:
+        return max(0, (self.config.end_date - self.config.start_date).days + 1)
+
+    def expected_rows(self) -> float:
+        return self.num_entities() * self.config.max_orders_per_day / 2
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        # Order counts are drawn between order values: count a generated block
+        orders = Counter(self._generate_entities(start, stop)["order_date"])
+        return [
+            orders[self.config.start_date + timedelta(days=day)]
+            for day in range(start, stop)
+        ]
 
-    def generate(self) -> pd.DataFrame:
-        records: List[dict] = []
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        columns = new_columns(self.COLUMNS)
 
-        d = self.config.start_date
-        while d <= self.config.end_date:
-            num_orders = random.randint(0, self.config.max_orders_per_day)
+        for day in range(start, stop):
+            d = self.config.start_date + timedelta(days=day)
+            num_orders = self.rng.randint(0, self.config.max_orders_per_day)
             for _ in range(num_orders):
-                amount = round(random.uniform(10, 500), 2)
-                records.append(
-                    {
-                        "order_id": f"O{d:%Y%m%d}{random.randint(1000, 9999)}",
-                        "order_date": d,
-                        "amount": amount,
-                    }
+                amount = round(self.rng.uniform(10, 500), 2)
+                columns["order_id"].append(
+                    f"O{d:%Y%m%d}{self.rng.randint(1000, 9999)}"
                 )
-            d += timedelta(days=1)
+                columns["order_date"].append(d)
+                columns["amount"].append(amount)
 
-        return pd.DataFrame(records)
+        return columns
@@ -2,12 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-import random
-from typing import List
-
-import pandas as pd
 
 from ...core.base_generator import BaseScenarioGenerator
+from ...core.utils import new_columns
 
 
 @dataclass
@@ -22,24 +19,33 @@ class IoTSensorsConfig:
 class IoTSensorsGenerator(BaseScenarioGenerator):
     """Generic IoT sensor time-series data generator."""
 
+    COLUMNS = ("device_id", "timestamp", "value")
+    EVENT_TIME = "timestamp"
+    BLOCK_SIZE = 4  # devices
+
     def __init__(self, config: IoTSensorsConfig | None = None) -> None:
         self.config = config or IoTSensorsConfig()
-        random.seed(self.config.seed)
+        self.seed = self.config.seed
+
+    def num_entities(self) -> int:
+        return self.config.num_devices
+
+    def expected_rows(self) -> float:
+        return float(self.config.num_devices * self.config.num_points)
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        return [self.config.num_points] * (stop - start)
 
-    def generate(self) -> pd.DataFrame:
-        records: List[dict] = []
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        columns = new_columns(self.COLUMNS)
 
-        for device_id in range(1, self.config.num_devices + 1):
+        for device_id in range(start + 1, stop + 1):
             t = self.config.start_time
             for _ in range(self.config.num_points):
-                value = 20 + random.random() * 5  # simple temp-like value
-                records.append(
-                    {
-                        "device_id": device_id,
-                        "timestamp": t,
-                        "value": round(value, 3),
-                    }
-                )
+                value = 20 + self.rng.random() * 5  # simple temp-like value
+                columns["device_id"].append(device_id)
+                columns["timestamp"].append(t)
+                columns["value"].append(round(value, 3))
                 t += timedelta(seconds=self.config.freq_seconds)
 
-        return pd.DataFrame(records)
+        return columns
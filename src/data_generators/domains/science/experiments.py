@@ -1,12 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import random
-from typing import List
-
-import pandas as pd
 
 from ...core.base_generator import BaseScenarioGenerator
+from ...core.utils import new_columns
 
 
 @dataclass
@@ -19,21 +16,31 @@ class ExperimentsConfig:
 class ExperimentsGenerator(BaseScenarioGenerator):
     """Simple lab experiment measurement generator."""
 
+    COLUMNS = ("experiment_id", "step", "value")
+    BLOCK_SIZE = 256  # experiments
+
     def __init__(self, config: ExperimentsConfig | None = None) -> None:
         self.config = config or ExperimentsConfig()
-        random.seed(self.config.seed)
+        self.seed = self.config.seed
+
+    def num_entities(self) -> int:
+        return self.config.num_experiments
+
+    def expected_rows(self) -> float:
+        return float(
+            self.config.num_experiments * self.config.measurements_per_experiment
+        )
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        return [self.config.measurements_per_experiment] * (stop - start)
 
-    def generate(self) -> pd.DataFrame:
-        records: List[dict] = []
-        for exp_id in range(1, self.config.num_experiments + 1):
-            baseline = random.uniform(0.5, 1.5)
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        columns = new_columns(self.COLUMNS)
+        for exp_id in range(start + 1, stop + 1):
+            baseline = self.rng.uniform(0.5, 1.5)
             for step in range(self.config.measurements_per_experiment):
-                value = baseline + random.gauss(0, 0.05)
-                records.append(
-                    {
-                        "experiment_id": exp_id,
-                        "step": step,
-                        "value": value,
-                    }
-                )
-        return pd.DataFrame(records)
+                value = baseline + self.rng.gauss(0, 0.05)
+                columns["experiment_id"].append(exp_id)
+                columns["step"].append(step)
+                columns["value"].append(value)
+        return columns
@@ -0,0 +1,493 @@
+"""Rate-controlled live event streams for ``emit``.
+
+Rows of a scenario are encoded as JSON lines (or CSV lines) and written to a
+sink at a target rate: stdout, a TCP or Unix socket, a named pipe or an HTTP
+endpoint (each batch POSTed as NDJSON). Sends are paced by a
+:class:`RateProfile`, which may ramp up and burst periodically.
+
+Blocks are generated in a worker thread into a small queue. When the consumer
+lags, a send only returns once the sink has taken the data (socket buffers
+drained, HTTP response received), the queue fills and generation pauses, so
+memory stays bounded and the schedule slips instead of buffering.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import csv
+import io
+import json
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Iterable
+from urllib.parse import SplitResult, urlsplit
+
+from .core.base_generator import BaseScenarioGenerator
+
+EMIT_FORMATS = ("json", "csv")
+
+#: Pacing granularity: sends are batched to about this many seconds of events.
+TICK_SECONDS = 0.005
+#: Most events sent in one batch.
+MAX_BATCH = 4096
+#: Seconds of events that may be sent in catch-up after the consumer stalls;
+#: longer stalls slip the schedule rather than flood the consumer afterwards.
+MAX_LAG_SECONDS = 1.0
+#: Generated blocks buffered ahead of the sender.
+QUEUE_BLOCKS = 2
+
+Stats = Callable[[dict[str, Any]], None]
+
+
+@dataclass
+class RateProfile:
+    """Target events per second over time.
+
+    ``rate`` rises linearly from zero over the first ``ramp_seconds`` and is
+    multiplied by ``burst_factor`` for the first ``burst_seconds`` of every
+    ``burst_every`` seconds.
+    """
+
+    rate: float
+    ramp_seconds: float = 0.0
+    burst_factor: float = 1.0
+    burst_seconds: float = 1.0
+    burst_every: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            raise ValueError(f"Rate must be positive, got {self.rate}")
+        if self.burst_every and not 0 < self.burst_seconds <= self.burst_every:
+            raise ValueError("Bursts must be shorter than the burst period")
+
+    def rate_at(self, seconds: float) -> float:
+        """Target rate ``seconds`` after the stream started."""
+        rate = self.rate
+        if seconds < self.ramp_seconds:
+            rate *= seconds / self.ramp_seconds
+        if self.burst_every and seconds % self.burst_every < self.burst_seconds:
+            rate *= self.burst_factor
+        return rate
+
+
+class Sink:
+    """Byte stream the events are written to."""
+
+    url = "-"
+
+    async def send(self, data: bytes) -> None:
+        """Write ``data``, returning once the consumer has room for more."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class _FileSink(Sink):
+    """stdout or a named pipe; blocking writes run in a worker thread."""
+
+    def __init__(self, fh: Any, url: str, owned: bool = True) -> None:
+        self.fh = fh
+        self.url = url
+        self.owned = owned
+
+    async def send(self, data: bytes) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self._write, data)
+
+    def _write(self, data: bytes) -> None:
+        self.fh.write(data)
+        self.fh.flush()
+
+    async def close(self) -> None:
+        if self.owned:
+            self.fh.close()
+
+
+class _StreamSink(Sink):
+    """TCP or Unix socket; waits for the transport buffer to drain."""
+
+    def __init__(self, writer: asyncio.StreamWriter, url: str) -> None:
+        self.writer = writer
+        self.url = url
+
+    async def send(self, data: bytes) -> None:
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        self.writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self.writer.wait_closed()
+
+
+class _HttpSink(Sink):
+    """POSTs each batch as NDJSON over a keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, url: SplitResult) -> None:
+        self.url = url.geturl()
+        self.host = url.hostname or "localhost"
+        self.port = url.port or 80
+        self.path = url.path or "/"
+        if url.query:
+            self.path += f"?{url.query}"
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def send(self, data: bytes) -> None:
+        if self.writer is None:
+            await self.connect()
+        assert self.reader is not None and self.writer is not None
+        head = (
+            f"POST {self.path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/x-ndjson\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n"
+        )
+        self.writer.write(head.encode("ascii") + data)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError(f"{self.url} closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        await self._skip_body(headers)
+        if headers.get("connection") == "close":
+            await self.close()
+        if not 200 <= status < 300:
+            raise ConnectionError(f"{self.url} answered HTTP {status}")
+
+    async def _skip_body(self, headers: dict[str, str]) -> None:
+        assert self.reader is not None
+        if headers.get("transfer-encoding") == "chunked":
+            while size := int((await self.reader.readline()).split(b";")[0], 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        else:
+            await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            with contextlib.suppress(ConnectionError):
+                await self.writer.wait_closed()
+        self.reader = self.writer = None
+
+
+async def open_sink(target: str) -> Sink:
+    """Open ``target``: ``-`` (stdout), ``tcp://host:port``, ``unix:///path``,
+    ``pipe:///path`` (an existing named pipe) or ``http://host:port/path``."""
+    if target in ("-", "stdout"):
+        return _FileSink(sys.stdout.buffer, "-", owned=False)
+    url = urlsplit(target)
+    if url.scheme == "tcp" and url.hostname and url.port:
+        _, writer = await asyncio.open_connection(url.hostname, url.port)
+        return _StreamSink(writer, target)
+    if url.scheme == "unix" and url.path:
+        _, writer = await asyncio.open_unix_connection(url.path)
+        return _StreamSink(writer, target)
+    if url.scheme == "pipe" and url.path:
+        # Opening a named pipe for writing blocks until a reader opens it
+        loop = asyncio.get_running_loop()
+        fh = await loop.run_in_executor(None, open, url.path, "wb")
+        return _FileSink(fh, target)
+    if url.scheme == "http":
+        sink = _HttpSink(url)
+        await sink.connect()
+        return sink
+    raise ValueError(
+        f"Unsupported sink {target!r} (expected -, tcp://host:port, "
+        f"unix:///path, pipe:///path or http://host:port/path)"
+    )
+
+
+class _Pacer:
+    """Hands out send credit following a :class:`RateProfile`."""
+
+    def __init__(self, profile: RateProfile | None) -> None:
+        self.profile = profile
+        self.started = self.last = time.perf_counter()
+        self.credit = 0.0
+        #: Events due so far by the schedule, and events handed out.
+        self.scheduled = 0.0
+        self.sent = 0
+        #: Seconds the stream is behind schedule.
+        self.lag = 0.0
+
+    def target(self) -> float | None:
+        if self.profile is None:
+            return None
+        return self.profile.rate_at(time.perf_counter() - self.started)
+
+    def update(self) -> float:
+        """Catch up with the schedule to now; returns the current rate."""
+        if self.profile is None:
+            return 0.0
+        now = time.perf_counter()
+        rate = self.profile.rate_at((self.last + now) / 2 - self.started)
+        self.credit += rate * (now - self.last)
+        self.scheduled += rate * (now - self.last)
+        self.last = now
+        # Unlike credit, the schedule is not capped: a sink that blocks
+        # sends shows up here even while no credit can be spent
+        self.lag = max(0.0, self.scheduled - self.sent) / rate if rate else 0.0
+        return rate
+
+    async def take(self, limit: int) -> int:
+        """Wait until events are due; returns how many (at most ``limit``)."""
+        if self.profile is None:
+            return limit
+        while True:
+            rate = self.update()
+            self.credit = min(self.credit, max(rate * MAX_LAG_SECONDS, 1.0))
+            due = min(limit, max(1, int(rate * TICK_SECONDS)))
+            if self.credit >= due:
+                taken = min(limit, int(self.credit))
+                self.credit -= taken
+                self.sent += taken
+                return taken
+            wait = (due - self.credit) / rate if rate else TICK_SECONDS
+            await asyncio.sleep(min(wait, TICK_SECONDS))
+
+
+class _Counters:
+    """Live throughput and send latency, per reporting interval and overall."""
+
+    def __init__(self, pacer: _Pacer) -> None:
+        self.pacer = pacer
+        self.started = self.interval_started = time.perf_counter()
+        self.events = self.bytes = self.interval_events = 0
+        self.latencies: list[float] = []
+        self.interval_latencies: list[float] = []
+        self.max_lag = 0.0
+
+    def record(self, events: int, size: int, seconds: float) -> None:
+        self.events += events
+        self.interval_events += events
+        self.bytes += size
+        self.latencies.append(seconds)
+        self.interval_latencies.append(seconds)
+        self.lag()
+
+    def lag(self) -> float:
+        """Seconds behind schedule now (tracked for ``max_lag_seconds``)."""
+        self.pacer.update()
+        self.max_lag = max(self.max_lag, self.pacer.lag)
+        return self.pacer.lag
+
+    def interval(self) -> dict[str, Any]:
+        """Counters since the previous call."""
+        now = time.perf_counter()
+        elapsed = now - self.interval_started
+        report = {
+            "events": self.events,
+            "events_per_second": round(self.interval_events / elapsed, 1),
+            "target_per_second": self.pacer.target(),
+            "lag_seconds": round(self.lag(), 3),
+            **_latency(self.interval_latencies),
+        }
+        self.interval_started = now
+        self.interval_events = 0
+        self.interval_latencies = []
+        return report
+
+    def summary(self) -> dict[str, Any]:
+        # Counts a send still blocked when the stream stopped
+        self.lag()
+        seconds = time.perf_counter() - self.started
+        return {
+            "events": self.events,
+            "bytes": self.bytes,
+            "seconds": round(seconds, 3),
+            "events_per_second": round(self.events / seconds, 1) if seconds else 0.0,
+            "max_lag_seconds": round(self.max_lag, 3),
+            **_latency(self.latencies),
+        }
+
+
+def _latency(seconds: list[float]) -> dict[str, float | None]:
+    """Median, 99th percentile and maximum send latency in milliseconds."""
+    if not seconds:
+        return {"send_ms_p50": None, "send_ms_p99": None, "send_ms_max": None}
+    ordered = sorted(seconds)
+    p50, p99, top = (
+        round(ordered[int(q * (len(ordered) - 1))] * 1000, 3) for q in (0.5, 0.99, 1)
+    )
+    return {"send_ms_p50": p50, "send_ms_p99": p99, "send_ms_max": top}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encoder(fmt: str) -> Callable[[Iterable[tuple], tuple[str, ...]], bytes]:
+    if fmt == "json":
+        encode = json.JSONEncoder(default=_json_default, separators=(",", ":")).encode
+
+        def to_json(rows: Iterable[tuple], names: tuple[str, ...]) -> bytes:
+            lines = [encode(dict(zip(names, row))) for row in rows]
+            return ("\n".join(lines) + "\n").encode("utf-8")
+
+        return to_json
+    if fmt == "csv":
+
+        def to_csv(rows: Iterable[tuple], names: tuple[str, ...]) -> bytes:
+            buf = io.StringIO()
+            csv.writer(buf, lineterminator="\n").writerows(rows)
+            return buf.getvalue().encode("utf-8")
+
+        return to_csv
+    raise ValueError(f"Unknown emit format {fmt!r} (expected json or csv)")
+
+
+class _Clock:
+    """Wall-clock stamps spread evenly over the time since the last batch."""
+
+    def __init__(self) -> None:
+        self.last = datetime.now(timezone.utc)
+
+    def stamps(self, count: int) -> list[datetime]:
+        now = datetime.now(timezone.utc)
+        step = (now - self.last) / count
+        stamps = [self.last + step * (i + 1) for i in range(count)]
+        self.last = now
+        return stamps
+
+
+async def stream_events(
+    generator: BaseScenarioGenerator,
+    sink: Sink,
+    profile: RateProfile | None = None,
+    *,
+    format: str = "json",
+    realtime: bool = False,
+    duration: float | None = None,
+    stats_interval: float | None = None,
+    on_stats: Stats | None = None,
+) -> dict[str, Any]:
+    """Send the rows of ``generator`` to ``sink`` paced by ``profile``.
+
+    ``profile=None`` sends as fast as the sink accepts. ``realtime`` replaces
+    the generator's :attr:`~BaseScenarioGenerator.EVENT_TIME` column with the
+    UTC time each row is sent. Stops after ``duration`` seconds if given;
+    ``on_stats`` receives live counters every ``stats_interval`` seconds.
+    Returns overall counters; ``disconnected`` is set if the consumer went
+    away before the end.
+    """
+    encode = _encoder(format)
+    names = generator.output_columns
+    time_index = None
+    if realtime:
+        if generator.EVENT_TIME not in names:
+            raise ValueError(f"{type(generator).__name__} has no event time column")
+        time_index = names.index(generator.EVENT_TIME)
+    clock = _Clock()
+
+    queue: asyncio.Queue[list[tuple] | None] = asyncio.Queue(QUEUE_BLOCKS)
+    producer = asyncio.create_task(_produce(generator, names, queue))
+    pacer = _Pacer(profile)
+    counters = _Counters(pacer)
+    reporter = None
+    if on_stats is not None and stats_interval:
+        reporter = asyncio.create_task(_report(counters, stats_interval, on_stats))
+
+    disconnected = False
+    try:
+        if format == "csv":
+            await sink.send(",".join(names).encode("utf-8") + b"\n")
+        deadline = None if duration is None else pacer.started + duration
+        while (rows := await queue.get()) is not None:
+            sent = 0
+            while sent < len(rows):
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return _finish(counters, disconnected)
+                count = await pacer.take(min(MAX_BATCH, len(rows) - sent))
+                batch = rows[sent : sent + count]
+                if time_index is not None:
+                    batch = [
+                        row[:time_index] + (stamp,) + row[time_index + 1 :]
+                        for row, stamp in zip(batch, clock.stamps(count))
+                    ]
+                data = encode(batch, names)
+                started = time.perf_counter()
+                if deadline is None:
+                    await sink.send(data)
+                else:
+                    # A blocked sink must not hold the stream past duration
+                    try:
+                        await asyncio.wait_for(sink.send(data), deadline - started)
+                    except asyncio.TimeoutError:
+                        return _finish(counters, disconnected)
+                counters.record(count, len(data), time.perf_counter() - started)
+                sent += count
+        await producer
+    except (BrokenPipeError, ConnectionResetError):
+        disconnected = True
+    finally:
+        for task in (producer, reporter):
+            if task is not None and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+    return _finish(counters, disconnected)
+
+
+def _finish(counters: _Counters, disconnected: bool) -> dict[str, Any]:
+    return {**counters.summary(), "disconnected": disconnected}
+
+
+async def _produce(
+    generator: BaseScenarioGenerator,
+    names: tuple[str, ...],
+    queue: asyncio.Queue[list[tuple] | None],
+) -> None:
+    loop = asyncio.get_running_loop()
+    blocks = generator.iter_blocks()
+    try:
+        while item := await loop.run_in_executor(None, next, blocks, None):
+            columns = item[1]
+            await queue.put(list(zip(*(columns[name] for name in names))))
+    except Exception:
+        # Wake the sender; awaiting this task re-raises the error
+        await queue.put(None)
+        raise
+    await queue.put(None)
+
+
+async def _report(counters: _Counters, interval: float, on_stats: Stats) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        on_stats(counters.interval())
+
+
+def emit(
+    generator: BaseScenarioGenerator,
+    target: str = "-",
+    profile: RateProfile | None = None,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Open ``target`` (see :func:`open_sink`) and stream ``generator`` to it.
+
+    Keyword arguments are passed on to :func:`stream_events`.
+    """
+
+    async def run() -> dict[str, Any]:
+        sink = await open_sink(target)
+        try:
+            return await stream_events(generator, sink, profile, **kwargs)
+        finally:
+            with contextlib.suppress(BrokenPipeError, ConnectionError):
+                await sink.close()
+
+    return asyncio.run(run())
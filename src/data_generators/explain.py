@@ -0,0 +1,101 @@
+"""Pre-run cost estimates: rows, bytes and seconds without generating.
+
+Expected rows come from each generator's analytic
+:meth:`~data_generators.core.base_generator.BaseScenarioGenerator.expected_rows`.
+Bytes and seconds are extrapolated from calibration data that ``bench`` runs
+record per scenario and target (bytes per row, rows per second)::
+
+    {"attendance": {"csv": {"rows": 100000, "bytes_per_row": 52.1,
+                            "rows_per_second": 81234.5}, ...}, ...}
+
+The calibration file defaults to ``calibration.json`` in the cache directory
+(``$DATA_GENERATORS_CALIBRATION`` overrides it).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Mapping
+
+from .cache import default_cache_dir
+from .registry import get_scenario
+
+
+def default_calibration_path() -> Path:
+    env = os.environ.get("DATA_GENERATORS_CALIBRATION")
+    if env:
+        return Path(env)
+    return default_cache_dir() / "calibration.json"
+
+
+def load_calibration(path: str | Path | None = None) -> dict[str, Any]:
+    path = Path(path) if path is not None else default_calibration_path()
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def record_calibration(
+    report: Mapping[str, Any], path: str | Path | None = None
+) -> Path:
+    """Merge a ``bench`` report into the calibration file.
+
+    Per scenario and target the measurement with the most rows is kept, since
+    small runs overstate fixed costs.
+    """
+    path = Path(path) if path is not None else default_calibration_path()
+    calibration = load_calibration(path)
+    for result in report["results"]:
+        rows = result["rows"]
+        if not rows or not result["rows_per_second"]:
+            continue
+        targets = calibration.setdefault(result["scenario"], {})
+        previous = targets.get(result["target"])
+        if previous is not None and previous["rows"] > rows:
+            continue
+        targets[result["target"]] = {
+            "rows": rows,
+            "bytes_per_row": (
+                round(result["bytes"] / rows, 2) if result["bytes"] else None
+            ),
+            "rows_per_second": result["rows_per_second"],
+        }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(calibration, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def explain(
+    scenario: str,
+    config: Any,
+    target: str,
+    calibration: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Estimate the cost of generating ``scenario`` with ``config``.
+
+    ``target`` is an output format or backend name. ``bytes`` and
+    ``seconds`` are ``None`` when there is no calibration for the pair.
+    """
+    spec = get_scenario(scenario)
+    generator = spec.build_generator(config)
+    rows = generator.expected_rows()
+
+    measured = (calibration or {}).get(spec.name, {}).get(target)
+    bytes_per_row = measured.get("bytes_per_row") if measured else None
+    rate = measured.get("rows_per_second") if measured else None
+
+    return {
+        "scenario": spec.name,
+        "target": target,
+        "entities": generator.num_entities(),
+        "blocks": generator.num_blocks(),
+        "rows": round(rows),
+        "bytes": round(rows * bytes_per_row) if bytes_per_row else None,
+        "seconds": round(rows / rate, 2) if rate else None,
+        "calibrated": measured is not None,
+    }
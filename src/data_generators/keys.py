@@ -0,0 +1,219 @@
+"""Shared customer key space for relational (multi-table) generation.
+
+A key index is a directory of flat binary arrays describing the customers of
+a customer_360 config, one entry per customer number (``CUST-000001`` is
+number 1)::
+
+    <dir>/index.json     customer count, loan ID width, source config, digest
+    <dir>/segment.u1     risk segment code per customer (uint8)
+    <dir>/customers.f8   running sum of activity weights (float64)
+    <dir>/cards.f8       the same, over credit card holders only
+
+Fact scenarios whose config sets ``customer_keys`` sample foreign keys from
+it, weighted by activity, and let the customer's risk segment drive their
+behaviour. The arrays are memory-mapped read-only, so every worker process of
+a run shares one copy through the page cache instead of loading the
+dimension, and a lookup costs a binary search over the running sums.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import hashlib
+import json
+import mmap
+import os
+import random
+import shutil
+from array import array
+from pathlib import Path
+from typing import Any
+
+from .core.config import config_from_dict, config_to_dict
+from .core.ids import id_width
+from .core.utils import derive_seed
+from .scenarios.customer_360.generator import (
+    Customer360Config,
+    Customer360Generator,
+    customer_key,
+)
+
+KEY_INDEX_VERSION = 2
+
+SEGMENTS = ("LOW", "MEDIUM", "HIGH")
+#: Relative fraud / default propensity of each risk segment.
+SEGMENT_RISK = {"LOW": 0.5, "MEDIUM": 1.0, "HIGH": 2.5}
+#: Populations foreign keys are drawn from, each a file of running weights.
+POPULATIONS = ("customers", "cards")
+#: Loans per customer that linked loan tables have room for. Their loan IDs
+#: are padded to fit that many, whatever each table's own row count, so loans
+#: and loan_repayments spell loan N the same way (``LN00001``).
+LOANS_PER_CUSTOMER = 10
+
+#: customer_360 columns the index is computed from.
+_SOURCE_COLUMNS = (
+    "risk_segment",
+    "engagement_score",
+    "num_products",
+    "has_credit_card",
+)
+
+
+def key_index_digest(config: Customer360Config) -> str:
+    """Short content hash of the key index built from ``config``."""
+    payload = json.dumps(
+        [KEY_INDEX_VERSION, config_to_dict(config)], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def read_key_index_digest(path: str | Path) -> str | None:
+    """Digest of the key index at ``path`` (``None`` if there is none)."""
+    return _read_meta(Path(path)).get("digest")
+
+
+def build_key_index(config: Customer360Config, path: str | Path) -> KeyIndex:
+    """Write the key index of ``config``'s customers to ``path`` and open it.
+
+    An index of the same customers already at ``path`` is reused.
+    """
+    path = Path(path)
+    digest = key_index_digest(config)
+    if _read_meta(path).get("digest") == digest:
+        return _open_key_index(str(path.resolve()))
+    if config.num_customers < 1:
+        raise ValueError("A key index needs at least one customer")
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    generator = Customer360Generator(config).project(_SOURCE_COLUMNS)
+    totals = dict.fromkeys(POPULATIONS, 0.0)
+    files = {name: (tmp / f"{name}.f8").open("wb") for name in POPULATIONS}
+    with (tmp / "segment.u1").open("wb") as segments:
+        for _, columns in generator.iter_blocks():
+            array(
+                "B", [SEGMENTS.index(segment) for segment in columns["risk_segment"]]
+            ).tofile(segments)
+            sums = {name: array("d") for name in POPULATIONS}
+            for score, products, card in zip(
+                columns["engagement_score"],
+                columns["num_products"],
+                columns["has_credit_card"],
+            ):
+                # Engaged customers with more products transact more
+                activity = (0.2 + score) * (1 + products)
+                totals["customers"] += activity
+                totals["cards"] += activity * card
+                sums["customers"].append(totals["customers"])
+                sums["cards"].append(totals["cards"])
+            for name in POPULATIONS:
+                sums[name].tofile(files[name])
+    for fh in files.values():
+        fh.close()
+
+    meta = {
+        "version": KEY_INDEX_VERSION,
+        "digest": digest,
+        "num_customers": config.num_customers,
+        "loan_id_width": id_width(LOANS_PER_CUSTOMER * config.num_customers, 4),
+        "config": config_to_dict(config),
+    }
+    (tmp / "index.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    _open_key_index.cache_clear()
+    return _open_key_index(str(path.resolve()))
+
+
+def _read_meta(path: Path) -> dict[str, Any]:
+    try:
+        return json.loads((path / "index.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def open_key_index(path: str | Path | None) -> KeyIndex | None:
+    """Open the key index at ``path`` (one mapping per process and path).
+
+    ``None``, a config without ``customer_keys``, gives ``None``.
+    """
+    if path is None:
+        return None
+    return _open_key_index(str(Path(path).resolve()))
+
+
+@functools.lru_cache(maxsize=None)
+def _open_key_index(path: str) -> KeyIndex:
+    return KeyIndex(path)
+
+
+class KeyIndex:
+    """Read-only, memory-mapped view of a key index directory."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        meta = _read_meta(self.path)
+        if meta.get("version") != KEY_INDEX_VERSION:
+            raise FileNotFoundError(f"No key index at {self.path}")
+        self.digest: str = meta["digest"]
+        self.seed = int(self.digest, 16)
+        self.num_customers: int = meta["num_customers"]
+        #: Digits of loan numbers in linked loan tables.
+        self.loan_id_width: int = meta["loan_id_width"]
+        self.config = config_from_dict(Customer360Config, meta["config"])
+
+        self._maps = []
+        self._segments = self._map("segment.u1", "B")
+        self._weights = {name: self._map(f"{name}.f8", "d") for name in POPULATIONS}
+
+    def _map(self, name: str, typecode: str) -> memoryview:
+        with (self.path / name).open("rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped).cast(typecode)
+
+    def _number(self, population: str, u: float) -> int:
+        """Customer number at quantile ``u`` of ``population``'s weights."""
+        weights = self._weights[population]
+        total = weights[-1]
+        if total <= 0:
+            raise ValueError(f"Key index {self.path} has no {population}")
+        return min(bisect.bisect_right(weights, u * total), len(weights) - 1) + 1
+
+    def sample(
+        self, rng: random.Random, n: int, population: str = "customers"
+    ) -> list[int]:
+        """``n`` customer numbers drawn from ``population`` by activity."""
+        return [self._number(population, rng.random()) for _ in range(n)]
+
+    def pick(self, salt: object, number: int, population: str = "customers") -> int:
+        """Customer number for item ``number`` of a table, e.g. a loan.
+
+        A pure function of ``(salt, number)``, so tables referring to the same
+        item (applications and repayments of loan 7) agree on its customer.
+        """
+        u = derive_seed(self.seed, salt, number) / 2**63
+        return self._number(population, u)
+
+    def loan_width(self, loans: int) -> int:
+        """:attr:`loan_id_width`, checked to fit loan numbers up to ``loans``."""
+        if loans >= 10**self.loan_id_width:
+            raise ValueError(
+                f"Loan {loans} does not fit the {self.loan_id_width}-digit loan "
+                f"IDs of key index {self.path} ({LOANS_PER_CUSTOMER} per "
+                f"customer); set the same id_width on both loan tables"
+            )
+        return self.loan_id_width
+
+    def customer_id(self, number: int) -> str:
+        return customer_key(number)
+
+    def segment(self, number: int) -> str:
+        """Risk segment of customer ``number``."""
+        return SEGMENTS[self._segments[number - 1]]
+
+    def segment_of(self, customer_id: str) -> str:
+        """Risk segment of a customer ID produced by this index."""
+        return self.segment(int(customer_id.rpartition("-")[2]))
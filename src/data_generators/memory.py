@@ -0,0 +1,160 @@
+"""Memory-budgeted chunk sizing for ``--max-memory``.
+
+Writing holds one chunk of generated columns plus its serialization buffers
+(CSV text, Arrow tables) at a time, so peak memory is roughly the process
+baseline plus ``chunk_rows`` times the per-row footprint. A
+:class:`MemoryBudget` measures that footprint on the first generated block
+(which is then written as usual), sizes chunks to fit the budget and resizes
+them to the headroom left whenever the resident set size measured after a
+chunk drifts.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Iterator
+
+from .core.backends import _import_backend, to_backend
+from .core.utils import format_size, num_rows
+
+Blocks = Iterator[tuple[int, dict[str, list]]]
+
+#: Rows of the first block measured for the per-row footprint.
+PILOT_ROWS = 5_000
+#: Share of the budget left above current RSS that one chunk may use; the
+#: rest is headroom for allocator slack and the writer.
+CHUNK_SHARE = 0.5
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes (peak RSS if unknown)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return peak_rss()
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes (0 if unknown)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class MemoryBudget:
+    """Chunk sizing that keeps a write within ``limit`` bytes of RSS."""
+
+    limit: int
+    #: Rows per chunk; set by :meth:`plan`, adapted by :meth:`observe`.
+    chunk_rows: int = 0
+    #: Measured footprint of one row in memory and in write buffers.
+    bytes_per_row: float = 0.0
+    #: Highest RSS sampled after a chunk.
+    peak: int = 0
+    _planned_rows: int = 0
+
+    def plan(self, blocks: Blocks, fmt: str) -> Blocks:
+        """Size chunks for ``fmt`` from the first of ``blocks``.
+
+        Returns ``blocks`` unchanged, the measured block included.
+        """
+        first = next(blocks, None)
+        if first is None:
+            self.bytes_per_row = 1.0
+        else:
+            self.bytes_per_row = _bytes_per_row(first[1], fmt)
+            blocks = itertools.chain([first], blocks)
+        # Measured once generator and writer state (Faker providers, pyarrow)
+        # is loaded; this still includes the first block, which errs low.
+        baseline = current_rss()
+        if baseline >= self.limit:
+            raise ValueError(
+                f"Memory budget {format_size(self.limit)} is below the "
+                f"{format_size(baseline)} already in use"
+            )
+        self.chunk_rows = self._fit(baseline)
+        self._planned_rows = self.chunk_rows
+        self.peak = max(baseline, current_rss())
+        return blocks
+
+    def observe(self) -> int:
+        """Record the RSS after a chunk and resize chunks to the headroom left.
+
+        Memory the allocator keeps after a chunk shows up as RSS, so chunks
+        shrink until usage settles below the limit.
+        """
+        rss = current_rss()
+        self.peak = max(self.peak, rss)
+        self.chunk_rows = self._fit(rss)
+        return self.chunk_rows
+
+    def _fit(self, rss: int) -> int:
+        return max(1, int((self.limit - rss) * CHUNK_SHARE / self.bytes_per_row))
+
+    def report(self) -> dict[str, int | float]:
+        return {
+            "max_memory": self.limit,
+            "peak_rss": max(self.peak, peak_rss()),
+            "bytes_per_row": round(self.bytes_per_row, 1),
+            "chunk_rows": self._planned_rows,
+        }
+
+
+def _bytes_per_row(columns: dict[str, list], fmt: str) -> float:
+    """Bytes per row of ``columns`` in memory plus their serialization peak."""
+    rows = num_rows(columns)
+    if not rows:
+        return 1.0
+    sample = {name: values[:PILOT_ROWS] for name, values in columns.items()}
+    sampled = min(rows, PILOT_ROWS)
+    # list slots plus the value objects (shared ones are counted every time)
+    held = sum(
+        8 * len(values) + sum(map(sys.getsizeof, values)) for values in sample.values()
+    )
+
+    # Serialize one row first so lazy imports do not count as buffers
+    _serialize({name: values[:1] for name, values in sample.items()}, fmt)
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        native = _serialize(sample, fmt)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return max(1.0, (held + peak - baseline + native) / sampled)
+
+
+def _serialize(columns: dict[str, list], fmt: str) -> int:
+    """Serialize ``columns`` like the writer does; returns Arrow-allocated bytes."""
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(zip(*columns.values()))
+        buf.getvalue().encode("utf-8")
+        return 0
+    pa = _import_backend("arrow")
+    import pyarrow.parquet as pq
+
+    allocated = pa.total_allocated_bytes()
+    table = to_backend(columns, "arrow")
+    native = pa.total_allocated_bytes() - allocated
+    buf = io.BytesIO()
+    pq.write_table(table, buf)
+    # read back too: merging Parquet parts at the end reads every chunk
+    pq.read_table(io.BytesIO(buf.getvalue()))
+    return native
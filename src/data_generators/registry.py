@@ -0,0 +1,197 @@
+"""Registry of CLI-addressable scenarios.
+
+Maps each scenario name to its generator class, config dataclass and the
+rule used to turn a ``--rows`` hint into config fields.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .core.base_generator import BaseScenarioGenerator
+from .core.config import config_from_dict
+from .scenarios.attendance.generator import AttendanceGenerator, AttendanceConfig
+from .scenarios.spark_logs.generator import SparkLogsGenerator, SparkLogsConfig
+from .scenarios.loan_applications.generator import (
+    LoanApplicationsGenerator,
+    LoanApplicationsConfig,
+)
+from .scenarios.bank_transactions.generator import (
+    BankTransactionsGenerator,
+    BankTransactionsConfig,
+)
+from .scenarios.credit_card_spend.generator import (
+    CreditCardSpendGenerator,
+    CreditCardSpendConfig,
+)
+from .scenarios.loan_repayments.generator import (
+    LoanRepaymentsGenerator,
+    LoanRepaymentsConfig,
+)
+from .scenarios.customer_360.generator import (
+    Customer360Generator,
+    Customer360Config,
+)
+from .scenarios.etl_billing.generator import (
+    BillingConfig,
+    BillingGenerator,
+    BillingInvoicesGenerator,
+)
+from .scenarios.customer_360.cdc import (
+    Customer360CDCConfig,
+    Customer360CDCGenerator,
+    Customer360SCD2Generator,
+)
+
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    name: str
+    generator_cls: type[BaseScenarioGenerator]
+    config_cls: type
+    apply_rows: Callable[[Any, int], None]
+
+    def build_config(self, rows: int | None = None, **overrides: Any) -> Any:
+        """Build the config dataclass from YAML-style values plus a rows hint."""
+        config = config_from_dict(self.config_cls, overrides)
+        if rows is not None:
+            self.apply_rows(config, rows)
+        return config
+
+    def build_generator(self, config: Any) -> BaseScenarioGenerator:
+        return self.generator_cls(config)
+
+
+def _set_num_rows(config: Any, rows: int) -> None:
+    config.num_rows = rows
+
+
+# Scenarios with several rows per entity plan the fewest entities covering
+# ``rows`` and cap the output at exactly ``rows`` (cutting the last one short).
+
+
+def _set_attendance_rows(config: AttendanceConfig, rows: int) -> None:
+    config.num_employees = AttendanceGenerator(config).entities_for_rows(rows)
+    config.num_rows = rows
+
+
+def _set_spark_rows(config: SparkLogsConfig, rows: int) -> None:
+    config.num_jobs = SparkLogsGenerator(config).entities_for_rows(rows)
+    config.num_rows = rows
+
+
+def _set_repayment_rows(config: LoanRepaymentsConfig, rows: int) -> None:
+    config.num_loans = LoanRepaymentsGenerator(config).entities_for_rows(rows)
+    config.num_rows = rows
+
+
+def _set_customer_rows(config: Customer360Config, rows: int) -> None:
+    config.num_customers = rows
+
+
+def _set_billing_rows(config: BillingConfig, rows: int) -> None:
+    config.num_customers = BillingGenerator(config).entities_for_rows(rows)
+    config.num_rows = rows
+
+
+def _set_invoice_rows(config: BillingConfig, rows: int) -> None:
+    config.num_customers = BillingInvoicesGenerator(config).entities_for_rows(rows)
+    config.num_rows = rows
+
+
+def _set_cdc_rows(config: Customer360CDCConfig, rows: int) -> None:
+    config.num_periods = Customer360CDCGenerator(config).entities_for_rows(rows)
+    config.num_rows = rows
+
+
+def _set_scd2_rows(config: Customer360CDCConfig, rows: int) -> None:
+    config.num_periods = Customer360SCD2Generator(config).entities_for_rows(rows)
+    config.num_rows = rows
+
+
+SCENARIOS: dict[str, ScenarioSpec] = {
+    spec.name: spec
+    for spec in (
+        ScenarioSpec(
+            "attendance",
+            AttendanceGenerator,
+            AttendanceConfig,
+            _set_attendance_rows,
+        ),
+        ScenarioSpec(
+            "spark_logs",
+            SparkLogsGenerator,
+            SparkLogsConfig,
+            _set_spark_rows,
+        ),
+        ScenarioSpec(
+            "loans",
+            LoanApplicationsGenerator,
+            LoanApplicationsConfig,
+            _set_num_rows,
+        ),
+        ScenarioSpec(
+            "bank_transactions",
+            BankTransactionsGenerator,
+            BankTransactionsConfig,
+            _set_num_rows,
+        ),
+        ScenarioSpec(
+            "credit_card_spend",
+            CreditCardSpendGenerator,
+            CreditCardSpendConfig,
+            _set_num_rows,
+        ),
+        ScenarioSpec(
+            "loan_repayments",
+            LoanRepaymentsGenerator,
+            LoanRepaymentsConfig,
+            _set_repayment_rows,
+        ),
+        ScenarioSpec(
+            "customer_360",
+            Customer360Generator,
+            Customer360Config,
+            _set_customer_rows,
+        ),
+        ScenarioSpec(
+            "customer_360_cdc",
+            Customer360CDCGenerator,
+            Customer360CDCConfig,
+            _set_cdc_rows,
+        ),
+        ScenarioSpec(
+            "customer_360_scd2",
+            Customer360SCD2Generator,
+            Customer360CDCConfig,
+            _set_scd2_rows,
+        ),
+        ScenarioSpec(
+            "billing_usage",
+            BillingGenerator,
+            BillingConfig,
+            _set_billing_rows,
+        ),
+        ScenarioSpec(
+            "billing_invoices",
+            BillingInvoicesGenerator,
+            BillingConfig,
+            _set_invoice_rows,
+        ),
+    )
+}
+
+
+def get_scenario(name: str) -> ScenarioSpec:
+    """Registered scenario ``name``, or the scenario file at that path."""
+    if name.endswith((".yml", ".yaml")):
+        from .dsl import load_scenario  # imports this module
+
+        return load_scenario(name)
+    try:
+        return SCENARIOS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown scenario: {name} (expected one of {', '.join(SCENARIOS)})"
+        ) from None
@@ -0,0 +1,407 @@
+"""Manifest runner: execute many scenario jobs concurrently.
+
+A manifest is a YAML file listing independent generation jobs::
+
+    settings: global_settings.yml     # optional, relative to the manifest
+    random_seed: 42                   # optional, same keys as global_settings.yml
+    default_output_dir: data/raw
+    budget:
+      cpus: 4                         # worker processes (default: all CPUs)
+      memory: 8GB                     # total memory admitted at once
+    report: data/raw/run_report.json
+    customers: customers              # optional, see below
+    jobs:
+      - name: attendance_2024
+        scenario: attendance
+        rows: 50000                   # optional, same as --rows
+        columns: [employee_id, date, status]  # optional, same as --columns
+        where: "status == 'ABSENT'"   # optional, same as --where
+        corrupt: {nulls: {status: 0.01}, duplicates: 0.001}  # optional, --corrupt
+        memory: 1GB                   # optional per-job reservation
+        max_memory: 1GB               # optional, same as --max-memory
+        stats: true                   # optional, same as --stats
+        config:                       # fields of the scenario's config dataclass
+          start_date: 2024-01-01
+        output:
+          path: data/raw/attendance_2024.parquet
+
+With ``customers``, the key index of that job's customers is built once
+before any job starts (under ``<default_output_dir>/keys/``) and every job
+whose config has a ``customer_keys`` field, unless it sets one itself, draws
+its customers from it (see :mod:`data_generators.keys`).
+
+Single-scenario files such as ``attendance_scenario_local.yml`` (a top-level
+``<scenario>: {config}`` block plus ``output``) are accepted as one-job
+manifests.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+import yaml
+
+from .cache import OutputCache, cache_key
+from .checkpoint import DEFAULT_CHUNK_ROWS, write_checkpointed
+from .core.config import config_from_dict
+from .core.corruption import CorruptionConfig
+from .core.instrumentation import Metrics
+from .core.io import infer_format
+from .core.utils import parse_size
+from .dsl import is_scenario_file
+from .keys import build_key_index, key_index_digest
+from .memory import MemoryBudget, peak_rss
+from .registry import SCENARIOS, get_scenario
+from .stats import OutputStats, stats_path
+
+DEFAULT_OUTPUT_DIR = "data/raw"
+
+
+@dataclass
+class Job:
+    """One independent scenario run with a fully resolved config."""
+
+    name: str
+    scenario: str
+    config: Any
+    out: Path
+    format: str
+    memory: int | None = None
+    #: Output columns (``None``: all); see ``BaseScenarioGenerator.project``.
+    columns: tuple[str, ...] | None = None
+    #: Row predicate (``None``: all rows); see ``BaseScenarioGenerator.where``.
+    where: str | None = None
+    #: Data-quality issues to inject; see ``core.corruption``.
+    corrupt: CorruptionConfig | None = None
+    #: RSS limit that sizes the job's output chunks; see ``memory.MemoryBudget``.
+    max_memory: int | None = None
+    #: Write ``<out>.stats.json`` alongside the output; see ``stats``.
+    stats: bool = False
+
+
+@dataclass
+class Budget:
+    cpus: int = field(default_factory=lambda: os.cpu_count() or 1)
+    memory: int | None = None
+
+
+@dataclass
+class Manifest:
+    jobs: list[Job]
+    budget: Budget = field(default_factory=Budget)
+    report: Path | None = None
+    #: Job whose customers form the shared key space, and its key index path.
+    customers: Job | None = None
+    key_index: Path | None = None
+
+
+def load_manifest(path: str | Path) -> Manifest:
+    """Load a manifest YAML file into a flat list of jobs."""
+    path = Path(path)
+    data = _read_yaml(path)
+
+    settings: dict[str, Any] = {}
+    if "settings" in data:
+        settings = _read_yaml(path.parent / data["settings"])
+    for key in ("random_seed", "default_output_dir"):
+        if key in data:
+            settings[key] = data[key]
+    output_dir = Path(settings.get("default_output_dir", DEFAULT_OUTPUT_DIR))
+    seed = settings.get("random_seed")
+
+    if "jobs" in data:
+        raw_jobs = list(data["jobs"] or [])
+    else:
+        raw_jobs = [
+            {"scenario": name, "config": data[name], "output": data.get("output")}
+            for name in data
+            if name in SCENARIOS
+        ]
+    if not raw_jobs:
+        raise ValueError(f"{path}: manifest defines no jobs")
+
+    for raw in raw_jobs:
+        scenario = str(raw.get("scenario", ""))
+        if is_scenario_file(scenario):
+            # Scenario files are relative to the manifest
+            raw["scenario"] = str(path.parent / scenario)
+    jobs = [build_job(raw, output_dir, seed) for raw in raw_jobs]
+
+    outputs = [job.out.resolve() for job in jobs]
+    duplicates = {str(p) for p in outputs if outputs.count(p) > 1}
+    if duplicates:
+        raise ValueError(
+            f"{path}: several jobs write to {', '.join(sorted(duplicates))}"
+        )
+
+    budget_data = data.get("budget") or {}
+    budget = Budget()
+    if budget_data.get("cpus"):
+        budget.cpus = int(budget_data["cpus"])
+    if budget_data.get("memory"):
+        budget.memory = parse_size(budget_data["memory"])
+
+    report = data.get("report")
+    manifest = Manifest(
+        jobs=jobs,
+        budget=budget,
+        report=Path(report) if report else output_dir / "run_report.json",
+    )
+    if data.get("customers"):
+        _link_customers(manifest, data["customers"], output_dir, path)
+    return manifest
+
+
+def _link_customers(
+    manifest: Manifest, name: str, output_dir: Path, path: Path
+) -> None:
+    """Point jobs that take ``customer_keys`` at the key index of job ``name``."""
+    customers = next((job for job in manifest.jobs if job.name == name), None)
+    if customers is None or customers.scenario != "customer_360":
+        raise ValueError(f"{path}: customers: {name!r} is not a customer_360 job")
+    key_index = output_dir / "keys" / key_index_digest(customers.config)
+    for job in manifest.jobs:
+        if getattr(job.config, "customer_keys", False) is None:
+            job.config.customer_keys = str(key_index)
+    manifest.customers = customers
+    manifest.key_index = key_index
+
+
+def load_corruption(path: str | Path) -> CorruptionConfig:
+    """Load a corruption spec (the fields of ``CorruptionConfig``) from YAML."""
+    path = Path(path)
+    try:
+        return config_from_dict(CorruptionConfig, _read_yaml(path))
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from None
+
+
+def _read_yaml(path: Path) -> dict[str, Any]:
+    with path.open(encoding="utf-8") as fh:
+        data = yaml.safe_load(fh) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping at the top level")
+    return data
+
+
+def build_job(raw: Mapping[str, Any], output_dir: Path, seed: int | None) -> Job:
+    """The job of one manifest ``jobs`` entry (also a ``serve`` request)."""
+    spec = get_scenario(raw["scenario"])
+    name = raw.get("name") or Path(spec.name).stem
+
+    overrides = dict(raw.get("config") or {})
+    if seed is not None:
+        overrides.setdefault("seed", seed)
+    config = spec.build_config(rows=raw.get("rows"), **overrides)
+
+    output = raw.get("output") or {}
+    fmt = output.get("format")
+    out = output.get("path")
+    if out is None:
+        out = output_dir / f"{name}.{fmt or 'csv'}"
+    out = Path(out)
+
+    memory = raw.get("memory")
+    max_memory = raw.get("max_memory")
+    columns = raw.get("columns")
+    if isinstance(columns, str):
+        columns = columns.split(",")
+    corrupt = raw.get("corrupt")
+    return Job(
+        name=name,
+        scenario=spec.name,
+        config=config,
+        out=out,
+        format=infer_format(out, fmt),
+        memory=parse_size(memory) if memory is not None else None,
+        columns=tuple(c.strip() for c in columns) if columns else None,
+        where=raw.get("where"),
+        corrupt=config_from_dict(CorruptionConfig, corrupt) if corrupt else None,
+        max_memory=parse_size(max_memory) if max_memory is not None else None,
+        stats=bool(raw.get("stats", False)),
+    )
+
+
+def run_job(
+    job: Job,
+    cache: OutputCache | None = None,
+    *,
+    resume: bool = False,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    metrics: Metrics | None = None,
+) -> dict[str, Any]:
+    """Generate one job's output and return its timings.
+
+    With a ``cache``, an identical earlier output is linked to ``job.out``
+    instead of being regenerated, and fresh outputs are added to the cache.
+    Output is written in checkpointed chunks of ``chunk_rows``; ``resume``
+    continues an interrupted run of the same job (see
+    :mod:`data_generators.checkpoint`); with ``job.max_memory`` chunks are
+    sized to that memory budget instead. ``metrics`` collects per-stage timings.
+    With ``job.stats`` the output's statistics are written next to it; cached
+    outputs keep theirs in the cache metadata.
+    """
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+
+    key = cache_key(
+        job.scenario, job.config, job.format, job.columns, job.where, job.corrupt
+    )
+    meta = cache.fetch(key, job.format, job.out) if cache else None
+    if meta is not None and job.stats and "stats" not in meta:
+        # Cached without statistics: regenerate to collect them
+        meta = None
+    budget = MemoryBudget(job.max_memory) if job.max_memory is not None else None
+    stats = None
+    if meta is not None:
+        rows = meta["rows"]
+        if job.stats:
+            stats = OutputStats.from_dict(meta["stats"])
+            stats.write(stats_path(job.out))
+    else:
+        generator = get_scenario(job.scenario).build_generator(job.config)
+        generator.project(job.columns).where(job.where).corrupt(job.corrupt)
+        if metrics is not None:
+            generator.instrument(metrics)
+        if job.stats:
+            stats = OutputStats(generator.output_columns)
+        rows = write_checkpointed(
+            generator,
+            job.out,
+            key=key,
+            format=job.format,
+            chunk_rows=chunk_rows,
+            resume=resume,
+            budget=budget,
+            stats=stats,
+        )
+        if cache:
+            extra = {"stats": stats.to_dict()} if stats is not None else {}
+            cache.store(
+                key, job.format, job.out, scenario=job.scenario, rows=rows, **extra
+            )
+
+    result = {
+        "rows": rows,
+        "bytes": job.out.stat().st_size,
+        "cached": meta is not None,
+        "wall_seconds": round(time.perf_counter() - started, 4),
+        "cpu_seconds": round(time.process_time() - cpu_started, 4),
+        "peak_rss": peak_rss(),
+    }
+    if budget is not None and meta is None:
+        result["memory"] = budget.report()
+    if stats is not None:
+        result["stats"] = str(stats_path(job.out))
+    return result
+
+
+def _run_job_safely(
+    job: Job, cache: OutputCache | None, resume: bool, chunk_rows: int
+) -> dict[str, Any]:
+    try:
+        return {
+            "status": "ok",
+            **run_job(job, cache, resume=resume, chunk_rows=chunk_rows),
+        }
+    except Exception as exc:  # reported per job, the run carries on
+        return {
+            "status": "failed",
+            "error": f"{type(exc).__name__}: {exc}",
+            "traceback": traceback.format_exc(),
+        }
+
+
+def run_manifest(
+    manifest: Manifest,
+    *,
+    cache: OutputCache | None = None,
+    on_job_done: Callable[[dict[str, Any]], None] | None = None,
+    resume: bool = False,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> dict[str, Any]:
+    """Run all jobs across a process pool within the manifest's budget.
+
+    At most ``budget.cpus`` jobs run at once, and a job is only started while
+    the sum of running jobs' memory reservations fits ``budget.memory``. Jobs
+    without an explicit ``memory`` reserve an equal share of the budget. A job
+    larger than the whole budget still runs, alone. Cache hits skip generation;
+    the cache is pruned once all jobs have finished. With ``resume``, jobs
+    interrupted in an earlier run continue from their last checkpoint. A
+    manifest with ``customers`` builds its key index before any job starts.
+    """
+    budget = manifest.budget
+    cpus = max(1, budget.cpus)
+    if manifest.customers is not None and manifest.key_index is not None:
+        # Built once here; workers memory-map it instead of each loading it
+        build_key_index(manifest.customers.config, manifest.key_index)
+    default_share = budget.memory // cpus if budget.memory else 0
+
+    def reservation(job: Job) -> int:
+        return job.memory if job.memory is not None else default_share
+
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    pending = list(enumerate(manifest.jobs))
+    running: dict[Future, tuple[int, Job, float]] = {}
+    results: list[dict[str, Any]] = [{} for _ in manifest.jobs]
+    reserved = 0
+
+    with ProcessPoolExecutor(max_workers=min(cpus, len(pending)) or 1) as pool:
+        while pending or running:
+            for index, job in list(pending):
+                if len(running) >= cpus:
+                    break
+                need = reservation(job)
+                if running and budget.memory and reserved + need > budget.memory:
+                    continue
+                pending.remove((index, job))
+                reserved += need
+                future = pool.submit(
+                    _run_job_safely, job, cache, resume, chunk_rows
+                )
+                running[future] = (index, job, time.perf_counter())
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, job, submitted = running.pop(future)
+                reserved -= reservation(job)
+                result = {
+                    "name": job.name,
+                    "scenario": job.scenario,
+                    "out": str(job.out),
+                    "format": job.format,
+                    "queued_seconds": round(submitted - started, 4),
+                    **future.result(),
+                }
+                results[index] = result
+                if on_job_done is not None:
+                    on_job_done(result)
+
+    if cache is not None:
+        cache.prune()
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "wall_seconds": round(time.perf_counter() - started, 4),
+        "budget": {"cpus": cpus, "memory": budget.memory},
+        "jobs_ok": sum(1 for r in results if r["status"] == "ok"),
+        "jobs_failed": sum(1 for r in results if r["status"] != "ok"),
+        "jobs_cached": sum(1 for r in results if r.get("cached")),
+        "rows": sum(r.get("rows", 0) for r in results),
+        "jobs": results,
+    }
+
+    if manifest.report is not None:
+        manifest.report.parent.mkdir(parents=True, exist_ok=True)
+        manifest.report.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    return report
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta, time
 from typing import List
 import random
 
-import pandas as pd
-
 from ...core.base_generator import BaseScenarioGenerator
+from ...core.utils import derive_seed
+
+#: Chance that an employee has an attendance record on a weekend day.
+P_WEEKEND_RECORD = 0.05
+
+DEPARTMENTS = ["HR", "Finance", "Engineering", "Sales", "Support"]
 
 
 @dataclass
@@ -16,52 +20,132 @@ class AttendanceConfig:
     end_date: date = date(2024, 12, 31)
     num_employees: int = 200
     seed: int = 42
+    # Seed for employee-level attributes (department); defaults to ``seed``.
+    # Incremental appends pin it so employees keep their department.
+    entity_seed: int | None = None
+    # Cap on records; the last employee's records are cut short at the cap.
+    num_rows: int | None = None
 
 
 class AttendanceGenerator(BaseScenarioGenerator):
     """Generate synthetic employee attendance data with these constraints."""
 
+    COLUMNS = (
+        "employee_id",
+        "department",
+        "date",
+        "status",
+        "check_in",
+        "check_out",
+    )
+    COLUMN_DEPENDENCIES = {"check_in": ("status",), "check_out": ("status",)}
+    WINDOW_FIELDS = ("start_date", "end_date")
+    BLOCK_SIZE = 16  # employees; ~4k rows per block for a one-year window
+
     def __init__(self, config: AttendanceConfig | None = None) -> None:
         self.config = config or AttendanceConfig()
-        random.seed(self.config.seed)
+        self.seed = self.config.seed
 
-    def generate(self) -> pd.DataFrame:
-        records: List[dict] = []
+    def num_entities(self) -> int:
+        return self.config.num_employees
 
+    def row_limit(self) -> int | None:
+        return self.config.num_rows
+
+    def expected_rows(self) -> float:
+        dates = self._generate_dates(self.config.start_date, self.config.end_date)
+        weekend = sum(1 for d in dates if d.weekday() >= 5)
+        per_employee = len(dates) - weekend + weekend * P_WEEKEND_RECORD
+        rows = self.config.num_employees * per_employee
+        if self.config.num_rows is not None:
+            rows = min(rows, self.config.num_rows)
+        return rows
+
+    def _record_dates(self, start: int, stop: int) -> list[list[date]]:
+        """Dates with a record for each employee: every weekday, some weekends."""
         all_dates = self._generate_dates(
             self.config.start_date, self.config.end_date
         )
-
-        for emp_id in range(1, self.config.num_employees + 1):
-            dept = random.choice(
-                ["HR", "Finance", "Engineering", "Sales", "Support"]
-            )
-
-            for d in all_dates:
-                if d.weekday() >= 5:  # weekend
-                    if random.random() < 0.05:
-                        status = random.choices(
-                            ["ABSENT", "WFH"], weights=[0.7, 0.3], k=1
-                        )[0]
-                    else:
-                        continue
-                else:
-                    status = self._sample_status()
-
-                check_in, check_out = self._sample_times_for_status(status)
-
-                records.append(
-                    {
-                        "employee_id": emp_id,
-                        "department": dept,
-                        "date": d,
-                        "status": status,
-                        "check_in": check_in,
-                        "check_out": check_out,
-                    }
+        weekdays = [d.weekday() < 5 for d in all_dates]
+        return [
+            [
+                d
+                for d, weekday in zip(all_dates, weekdays)
+                if weekday or self.rng.random() < P_WEEKEND_RECORD
+            ]
+            for _ in range(start, stop)
+        ]
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        return [len(dates) for dates in self._record_dates(start, stop)]
+
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        # which (employee, date) pairs have a record
+        employee_ids: list[int] = []
+        dates: list[date] = []
+        for emp_id, record_dates in zip(
+            range(start + 1, stop + 1), self._record_dates(start, stop)
+        ):
+            employee_ids.extend([emp_id] * len(record_dates))
+            dates.extend(record_dates)
+        weekend = [d.weekday() >= 5 for d in dates]
+
+        columns: dict[str, list] = {"employee_id": employee_ids, "date": dates}
+        if self.needs("department"):
+            departments = self._sample_departments(start, stop)
+            columns["department"] = [
+                departments[emp_id - start - 1] for emp_id in employee_ids
+            ]
+        if self.needs("status"):
+            rng = self.stream("status")
+            columns["status"] = [
+                (
+                    rng.choices(["ABSENT", "WFH"], weights=[0.7, 0.3], k=1)[0]
+                    if is_weekend
+                    else self._sample_status(rng)
                 )
+                for is_weekend in weekend
+            ]
+        if self.needs("check_in"):
+            rng = self.stream("check_in")
+            columns["check_in"] = [
+                self._sample_check_in(rng, status) for status in columns["status"]
+            ]
+        if self.needs("check_out"):
+            rng = self.stream("check_out")
+            columns["check_out"] = [
+                self._sample_check_out(rng, status) for status in columns["status"]
+            ]
+
+        return columns
+
+    @classmethod
+    def window_config(
+        cls,
+        config: AttendanceConfig,
+        after: date,
+        end: date,
+        *,
+        rows_before: int,
+    ) -> AttendanceConfig:
+        return replace(
+            config,
+            start_date=after + timedelta(days=1),
+            end_date=end,
+            seed=derive_seed(config.seed, "window", after),
+            entity_seed=(
+                config.entity_seed if config.entity_seed is not None else config.seed
+            ),
+            num_rows=None,
+        )
 
-        return pd.DataFrame(records)
+    def _sample_departments(self, start: int, stop: int) -> List[str]:
+        """Departments of employees ``[start, stop)``, independent of the window."""
+        seed = self.config.entity_seed
+        if seed is None:
+            seed = self.config.seed
+        rng = random.Random(derive_seed(seed, "department", start))
+        return [rng.choice(DEPARTMENTS) for _ in range(stop - start)]
 
     @staticmethod
     def _generate_dates(start: date, end: date) -> List[date]:
@@ -69,29 +153,30 @@ class AttendanceGenerator(BaseScenarioGenerator):
         return [start + timedelta(days=i) for i in range(days)]
 
     @staticmethod
-    def _sample_status() -> str:
-        return random.choices(
+    def _sample_status(rng: random.Random) -> str:
+        return rng.choices(
             ["PRESENT", "ABSENT", "LATE", "WFH"],
             weights=[0.85, 0.05, 0.05, 0.05],
             k=1,
         )[0]
 
     @staticmethod
-    def _sample_times_for_status(status: str):
+    def _sample_check_in(rng: random.Random, status: str) -> time | None:
         if status == "ABSENT":
-            return None, None
+            return None
 
         base_in = datetime.combine(date.today(), time(9, 0))
-        base_out = datetime.combine(date.today(), time(17, 30))
-
         if status == "LATE":
-            delta_min = random.randint(16, 60)
+            delta_min = rng.randint(16, 60)
         else:
-            delta_min = random.randint(-30, 30)
-
-        out_delta_min = random.randint(-15, 120)
+            delta_min = rng.randint(-30, 30)
+        return (base_in + timedelta(minutes=delta_min)).time()
 
-        check_in = (base_in + timedelta(minutes=delta_min)).time()
-        check_out = (base_out + timedelta(minutes=out_delta_min)).time()
+    @staticmethod
+    def _sample_check_out(rng: random.Random, status: str) -> time | None:
+        if status == "ABSENT":
+            return None
 
-        return check_in, check_out
+        base_out = datetime.combine(date.today(), time(17, 30))
+        out_delta_min = rng.randint(-15, 120)
+        return (base_out + timedelta(minutes=out_delta_min)).time()
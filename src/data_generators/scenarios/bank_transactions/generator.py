@@ -1,12 +1,21 @@
-import random
-import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
-import pandas as pd
+
+import numpy as np
 from faker import Faker
 
+from ...core.base_generator import BaseScenarioGenerator
+from ...core.distributions import key_sampler
+from ...core.ids import IdFormat
+from ...core.utils import datetimes_at, derive_seed, random_uuid, rows_in_window
+from ...keys import SEGMENT_RISK, open_key_index
+
 fake = Faker()
 
+#: Columns ledger mode adds, and the columns they are computed from.
+LEDGER_COLUMNS = ("opening_balance", "closing_balance", "running_total", "is_overdraft")
+LEDGER_INPUTS = ("customer_id", "amount", "transaction_type")
+
 
 @dataclass
 class BankTransactionsConfig:
@@ -15,13 +24,67 @@ class BankTransactionsConfig:
     fraud_rate: float = 0.02  # 2% fraud
     start_date: str = "2023-01-01"
     end_date: str = "2023-12-31"
+    # Emit rows sorted by timestamp
+    ordered: bool = False
+    # Key index directory (keys.build_key_index) to draw customers from
+    customer_keys: str | None = None
+    # Time-ordered account ledger with running balances (implies ordered)
+    ledger: bool = False
+    # Customers CUST-10000 onwards (fixed width); drawn uniformly unless
+    # ``customer_skew`` is set
+    customer_key_space: int = 90_000
+    # Key skew (core.distributions spec, e.g. "zipf:1.1" or "hot:0.01:0.8")
+    # over the customers, and over each category's merchants
+    customer_skew: str | None = None
+    merchant_skew: str | None = None
 
 
-class BankTransactionsGenerator:
+class BankTransactionsGenerator(BaseScenarioGenerator):
+    COLUMNS = (
+        "transaction_id",
+        "customer_id",
+        "timestamp",
+        "amount",
+        "transaction_type",
+        "merchant",
+        "merchant_category",
+        "location",
+        "channel",
+        "is_fraud",
+    )
+    COLUMN_DEPENDENCIES = {"merchant": ("merchant_category",)}
+    CONDITIONAL_SAMPLING = True
+    ORDERED_BY = "timestamp"
+    EVENT_TIME = "timestamp"
+    WINDOW_FIELDS = ("start_date", "end_date")
+
     def __init__(self, config: BankTransactionsConfig):
         self.cfg = config
-        random.seed(config.seed)
-        Faker.seed(config.seed)
+        self.seed = config.seed
+        if config.customer_keys is not None and config.customer_skew is not None:
+            raise ValueError("customer_skew cannot be combined with customer_keys")
+        self.keys = open_key_index(config.customer_keys)
+        self.customer_sampler = key_sampler(
+            config.customer_skew, config.customer_key_space
+        )
+        self.customer_ids = IdFormat("CUST-", config.customer_key_space, offset=10_000)
+        if self.keys is not None:
+            # Fraud follows the customer's risk segment
+            self.COLUMN_DEPENDENCIES = {
+                **self.COLUMN_DEPENDENCIES,
+                "is_fraud": ("customer_id",),
+            }
+        if config.ledger:
+            self.COLUMNS = (*self.COLUMNS, *LEDGER_COLUMNS)
+            self.COLUMN_DEPENDENCIES = {
+                **self.COLUMN_DEPENDENCIES,
+                **dict.fromkeys(LEDGER_COLUMNS, LEDGER_INPUTS),
+            }
+        # Account balances and net flows in cents, by customer number, after
+        # the first ``_ledger_block`` blocks
+        self._balances: np.ndarray | None = None
+        self._totals: np.ndarray | None = None
+        self._ledger_block = 0
 
         self.merchant_categories = {
             "grocery": ["Walmart", "Carrefour", "Big Basket", "Kroger"],
@@ -30,6 +93,10 @@ class BankTransactionsGenerator:
             "electronics": ["Apple Store", "Best Buy", "Mi Store"],
             "utilities": ["Electric Co", "Water Board", "Gas Authority"],
         }
+        self.merchant_samplers = {
+            category: key_sampler(config.merchant_skew, len(merchants))
+            for category, merchants in self.merchant_categories.items()
+        }
 
         self.channels = ["online", "card_swipe", "atm", "upi", "net_banking"]
 
@@ -37,35 +104,190 @@ class BankTransactionsGenerator:
         start = datetime.fromisoformat(self.cfg.start_date)
         end = datetime.fromisoformat(self.cfg.end_date)
         delta = end - start
-        random_second = random.randint(0, int(delta.total_seconds()))
+        random_second = self.stream("timestamp").randint(
+            0, int(delta.total_seconds())
+        )
         return start + timedelta(seconds=random_second)
 
-    def generate(self) -> pd.DataFrame:
-        rows = []
+    @classmethod
+    def window_config(
+        cls,
+        config: BankTransactionsConfig,
+        after: str,
+        end: str,
+        *,
+        rows_before: int,
+    ) -> BankTransactionsConfig:
+        if config.ledger:
+            raise ValueError("Ledger balances cannot be appended to")
+        after_dt = datetime.fromisoformat(after)
+        num_rows = rows_in_window(
+            config.num_rows,
+            datetime.fromisoformat(config.start_date),
+            datetime.fromisoformat(config.end_date),
+            after_dt,
+            datetime.fromisoformat(end),
+        )
+        return replace(
+            config,
+            num_rows=max(0, num_rows),
+            start_date=(after_dt + timedelta(seconds=1)).isoformat(),
+            end_date=end,
+            seed=derive_seed(config.seed, "window", after),
+        )
 
-        for _ in range(self.cfg.num_rows):
+    def num_entities(self) -> int:
+        return self.cfg.num_rows
 
-            # choose merchant category
-            category = random.choice(list(self.merchant_categories.keys()))
-            merchant = random.choice(self.merchant_categories[category])
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        columns = self._transactions(start, stop)
+        if self.cfg.ledger and any(map(self.needs, LEDGER_COLUMNS)):
+            if self.condition is not None:
+                raise ValueError("Ledger mode cannot be combined with where")
+            block = start // self.BLOCK_SIZE
+            self._replay_ledger(block)
+            columns.update(self._post(columns, block))
+        return columns
 
-            amount = round(random.uniform(1, 2500), 2)
+    def _replay_ledger(self, block: int) -> None:
+        """Post the blocks before ``block`` that have not been posted yet."""
+        if block < self._ledger_block:
+            self._balances = self._totals = None
+            self._ledger_block = 0
+        if block == self._ledger_block:
+            return
+        saved = self._block_seed, self._streams, self.rng, self._needed
+        self._needed = self._closure(LEDGER_INPUTS)
+        try:
+            for earlier in range(self._ledger_block, block):
+                self._start_block(self.block_seed(earlier))
+                start = earlier * self.BLOCK_SIZE
+                self._post(self._transactions(start, start + self.BLOCK_SIZE), earlier)
+        finally:
+            self._block_seed, self._streams, self.rng, self._needed = saved
 
-            is_fraud = 1 if random.random() < self.cfg.fraud_rate else 0
+    def _post(self, columns: dict[str, list], block: int) -> dict[str, list]:
+        """Ledger columns of one block, carrying balances on from earlier blocks.
 
-            rows.append(
-                {
-                    "transaction_id": str(uuid.uuid4()),
-                    "customer_id": f"CUST-{random.randint(10000, 99999)}",
-                    "timestamp": self.random_timestamp(),
-                    "amount": amount,
-                    "transaction_type": "debit" if random.random() > 0.5 else "credit",
-                    "merchant": merchant,
-                    "merchant_category": category,
-                    "location": fake.city(),
-                    "channel": random.choice(self.channels),
-                    "is_fraud": is_fraud,
-                }
+        Rows are stably sorted by account, so each account's transactions form
+        a segment in time order; one cumulative sum over the sorted amounts,
+        offset per segment by the account's carried balance, gives every
+        closing balance.
+        """
+        numbers = np.array([int(c[5:]) for c in columns["customer_id"]], np.int64)
+        cents = np.rint(np.array(columns["amount"]) * 100).astype(np.int64)
+        debit = np.array(columns["transaction_type"]) == "debit"
+        cents[debit] = -cents[debit]
+        if self._balances is None:
+            if self.keys is not None:
+                space = self.keys.num_customers + 1
+            else:
+                space = 10_000 + self.cfg.customer_key_space
+            rng = np.random.default_rng(derive_seed(self.seed, "opening_balance"))
+            self._balances = np.rint(rng.lognormal(8.5, 1.0, space) * 100).astype(
+                np.int64
             )
+            self._totals = np.zeros(space, np.int64)
+        assert self._totals is not None
+
+        n = len(cents)
+        order = np.argsort(numbers, kind="stable")
+        accounts = numbers[order]
+        flows = cents[order]
+        starts = np.flatnonzero(np.r_[True, accounts[1:] != accounts[:-1]])
+        lengths = np.diff(np.r_[starts, n])
+        ends = starts + lengths - 1
+        running = np.cumsum(flows)
+        before = running[starts] - flows[starts]
+        first = accounts[starts]
+        closing = running + np.repeat(self._balances[first] - before, lengths)
+        totals = running + np.repeat(self._totals[first] - before, lengths)
+        self._balances[first] = closing[ends]
+        self._totals[first] = totals[ends]
+        self._ledger_block = block + 1
+
+        # back to time order
+        closing[order] = closing.copy()
+        totals[order] = totals.copy()
+        return {
+            "opening_balance": ((closing - cents) / 100).tolist(),
+            "closing_balance": (closing / 100).tolist(),
+            "running_total": (totals / 100).tolist(),
+            "is_overdraft": (closing < 0).astype(int).tolist(),
+        }
+
+    def _transactions(self, start: int, stop: int) -> dict[str, list]:
+        n = stop - start
+        columns = self.fixed_columns()
+
+        if self.needs("transaction_id"):
+            rng = self.stream("transaction_id")
+            columns["transaction_id"] = [random_uuid(rng) for _ in range(n)]
+        if self.needs("customer_id"):
+            rng = self.stream("customer_id")
+            if self.keys is not None:
+                columns["customer_id"] = [
+                    self.keys.customer_id(number) for number in self.keys.sample(rng, n)
+                ]
+            else:
+                if self.customer_sampler is not None:
+                    ranks = self.customer_sampler.samples(rng, n)
+                else:
+                    space = self.cfg.customer_key_space
+                    ranks = [rng.randint(1, space) for _ in range(n)]
+                columns["customer_id"] = self.customer_ids.format(
+                    np.asarray(ranks, np.int64) - 1
+                )
+        if self.needs("timestamp"):
+            if self.cfg.ordered or self.cfg.ledger:
+                columns["timestamp"] = datetimes_at(
+                    self.order_statistics(start, stop),
+                    datetime.fromisoformat(self.cfg.start_date),
+                    datetime.fromisoformat(self.cfg.end_date),
+                )
+            else:
+                columns["timestamp"] = [self.random_timestamp() for _ in range(n)]
+        if self.needs("amount"):
+            rng = self.stream("amount")
+            columns["amount"] = [round(rng.uniform(1, 2500), 2) for _ in range(n)]
+        if self.needs("transaction_type"):
+            rng = self.stream("transaction_type")
+            columns["transaction_type"] = [
+                "debit" if rng.random() > 0.5 else "credit" for _ in range(n)
+            ]
+        if self.needs("merchant_category"):
+            rng = self.stream("merchant_category")
+            categories = list(self.merchant_categories.keys())
+            columns["merchant_category"] = [rng.choice(categories) for _ in range(n)]
+        if self.needs("merchant"):
+            rng = self.stream("merchant")
+            if self.cfg.merchant_skew is not None:
+                columns["merchant"] = [
+                    self.merchant_categories[category][
+                        self.merchant_samplers[category].sample(rng) - 1
+                    ]
+                    for category in columns["merchant_category"]
+                ]
+            else:
+                columns["merchant"] = [
+                    rng.choice(self.merchant_categories[category])
+                    for category in columns["merchant_category"]
+                ]
+        if self.needs("location"):
+            with self.stage("faker"):
+                fake.seed_instance(self.stream("location").getrandbits(64))
+                columns["location"] = [fake.city() for _ in range(n)]
+        if self.needs("channel"):
+            rng = self.stream("channel")
+            columns["channel"] = [rng.choice(self.channels) for _ in range(n)]
+        if self.needs("is_fraud"):
+            rng = self.stream("is_fraud")
+            rates = [self.cfg.fraud_rate] * n
+            if self.keys is not None:
+                rates = [
+                    self.cfg.fraud_rate * SEGMENT_RISK[self.keys.segment_of(customer)]
+                    for customer in columns["customer_id"]
+                ]
+            columns["is_fraud"] = [1 if rng.random() < rate else 0 for rate in rates]
 
-        return pd.DataFrame(rows)
+        return columns
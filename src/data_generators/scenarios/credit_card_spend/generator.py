@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-import random
-import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 
-import pandas as pd
+import numpy as np
 from faker import Faker
 
+from ...core.base_generator import BaseScenarioGenerator
+from ...core.distributions import key_sampler
+from ...core.ids import IdFormat
+from ...core.utils import datetimes_at, derive_seed, random_uuid, rows_in_window
+from ...keys import SEGMENT_RISK, open_key_index
+
 fake = Faker()
 
+#: Card numbers CARD-100000 onwards; widened when there are more card holders.
+CARD_SPACE = 900_000
+
 
 @dataclass
 class CreditCardSpendConfig:
@@ -20,15 +27,82 @@ class CreditCardSpendConfig:
     fraud_rate: float = 0.015  # 1.5% fraud
     start_date: str = "2023-01-01"
     end_date: str = "2023-12-31"
+    ordered: bool = False  # emit rows sorted by txn_timestamp
+    # Key index directory (keys.build_key_index) to draw card holders from
+    customer_keys: str | None = None
+    # Card holders CUST-10000 onwards (fixed width); drawn uniformly unless
+    # ``customer_skew`` is set
+    customer_key_space: int = 90_000
+    # Key skew (core.distributions spec, e.g. "zipf:1.1" or "hot:0.01:0.8")
+    # over the card holders, and over each category's merchants
+    customer_skew: str | None = None
+    merchant_skew: str | None = None
 
 
-class CreditCardSpendGenerator:
+class CreditCardSpendGenerator(BaseScenarioGenerator):
     """Generate synthetic credit card spend data."""
 
+    COLUMNS = (
+        "transaction_id",
+        "customer_id",
+        "card_id",
+        "card_network",
+        "txn_timestamp",
+        "amount",
+        "currency",
+        "merchant",
+        "merchant_category",
+        "channel",
+        "country",
+        "city",
+        "is_international",
+        "is_online",
+        "is_fraud",
+    )
+    COLUMN_DEPENDENCIES = {
+        "card_id": ("customer_id",),
+        "merchant": ("merchant_category",),
+        "is_international": ("currency",),
+        "is_online": ("channel",),
+        "is_fraud": ("is_international", "is_online", "amount"),
+    }
+    CONDITIONAL_SAMPLING = True
+    ORDERED_BY = "txn_timestamp"
+    EVENT_TIME = "txn_timestamp"
+    WINDOW_FIELDS = ("start_date", "end_date")
+
     def __init__(self, config: CreditCardSpendConfig | None = None) -> None:
         self.cfg = config or CreditCardSpendConfig()
-        random.seed(self.cfg.seed)
-        Faker.seed(self.cfg.seed)
+        self.seed = self.cfg.seed
+        if self.cfg.customer_keys is not None and self.cfg.customer_skew is not None:
+            raise ValueError("customer_skew cannot be combined with customer_keys")
+        self.keys = open_key_index(self.cfg.customer_keys)
+        self.customer_sampler = key_sampler(
+            self.cfg.customer_skew, self.cfg.customer_key_space
+        )
+        self.customer_ids = IdFormat(
+            "CUST-", self.cfg.customer_key_space, offset=10_000
+        )
+        # Each holder has one card: a keyed permutation of the holder number,
+        # so no two holders share a card. The key is fixed, so appended
+        # windows keep every holder's card.
+        holders = (
+            self.keys.num_customers
+            if self.keys is not None
+            else self.cfg.customer_key_space
+        )
+        self.card_ids = IdFormat(
+            "CARD-",
+            max(CARD_SPACE, holders),
+            key=derive_seed(0, "card_id"),
+            offset=100_000,
+        )
+        if self.keys is not None:
+            # Fraud also follows the customer's risk segment
+            self.COLUMN_DEPENDENCIES = {
+                **self.COLUMN_DEPENDENCIES,
+                "is_fraud": (*self.COLUMN_DEPENDENCIES["is_fraud"], "customer_id"),
+            }
 
         # Merchant category -> sample merchants
         self.merchant_categories: dict[str, list[str]] = {
@@ -41,6 +115,10 @@ class CreditCardSpendGenerator:
             "utilities": ["Power Company", "Water Utility", "ISP Service"],
             "entertainment": ["Cinema Hall", "Game Zone", "Streaming Service"],
         }
+        self.merchant_samplers = {
+            category: key_sampler(self.cfg.merchant_skew, len(merchants))
+            for category, merchants in self.merchant_categories.items()
+        }
 
         self.card_networks = ["VISA", "MASTERCARD", "AMEX", "RUPAY"]
         self.currencies = ["NPR", "USD", "EUR", "INR"]
@@ -50,27 +128,14 @@ class CreditCardSpendGenerator:
         start = datetime.fromisoformat(self.cfg.start_date)
         end = datetime.fromisoformat(self.cfg.end_date)
         delta = end - start
-        random_second = random.randint(0, int(delta.total_seconds()))
+        random_second = self.stream("txn_timestamp").randint(
+            0, int(delta.total_seconds())
+        )
         return start + timedelta(seconds=random_second)
 
-    def _sample_transaction(self) -> dict:
-        category = random.choice(list(self.merchant_categories.keys()))
-        merchant = random.choice(self.merchant_categories[category])
-
-        card_network = random.choice(self.card_networks)
-        currency = random.choices(self.currencies, weights=[0.6, 0.2, 0.1, 0.1], k=1)[0]
-        channel = random.choice(self.channels)
-
-        # Amount distribution: normal spending vs a few large outliers
-        base_amount = random.lognormvariate(3.0, 0.6)  # skewed positive
-        amount = round(min(max(base_amount, 10), 5000), 2)
-
-        # International vs domestic
-        is_international = 1 if currency in {"USD", "EUR"} and random.random() < 0.5 else 0
-
-        # Online vs not
-        is_online = 1 if channel in {"ECOM", "UPI"} else 0
-
+    def _fraud_probability(
+        self, is_international: int, is_online: int, amount: float, risk: float = 1.0
+    ) -> float:
         # Simple fraud logic: higher chance for international + online + high amount
         fraud_score = 0.0
         if is_international:
@@ -81,34 +146,154 @@ class CreditCardSpendGenerator:
             fraud_score += 0.3
 
         # Base fraud probability from config
-        base_prob = self.cfg.fraud_rate
-        prob_fraud = min(0.9, base_prob + fraud_score)
-        is_fraud = 1 if random.random() < prob_fraud else 0
-
-        txn_time = self._random_timestamp()
-        country = fake.country()
-        city = fake.city()
-
-        return {
-            "transaction_id": str(uuid.uuid4()),
-            "customer_id": f"CUST-{random.randint(10000, 99999)}",
-            "card_id": f"CARD-{random.randint(100000, 999999)}",
-            "card_network": card_network,
-            "txn_timestamp": txn_time,
-            "amount": amount,
-            "currency": currency,
-            "merchant": merchant,
-            "merchant_category": category,
-            "channel": channel,
-            "country": country,
-            "city": city,
-            "is_international": is_international,
-            "is_online": is_online,
-            "is_fraud": is_fraud,
-        }
+        return min(0.9, self.cfg.fraud_rate * risk + fraud_score)
+
+    @classmethod
+    def window_config(
+        cls,
+        config: CreditCardSpendConfig,
+        after: str,
+        end: str,
+        *,
+        rows_before: int,
+    ) -> CreditCardSpendConfig:
+        after_dt = datetime.fromisoformat(after)
+        num_rows = rows_in_window(
+            config.num_rows,
+            datetime.fromisoformat(config.start_date),
+            datetime.fromisoformat(config.end_date),
+            after_dt,
+            datetime.fromisoformat(end),
+        )
+        return replace(
+            config,
+            num_rows=max(0, num_rows),
+            start_date=(after_dt + timedelta(seconds=1)).isoformat(),
+            end_date=end,
+            seed=derive_seed(config.seed, "window", after),
+        )
+
+    def _holders(self, customer_ids: list[str]) -> np.ndarray:
+        """Holder numbers (0-based) of ``customer_ids``."""
+        first = 1 if self.keys is not None else 10_000
+        return np.array([int(c[5:]) for c in customer_ids], np.int64) - first
+
+    def num_entities(self) -> int:
+        return self.cfg.num_rows
+
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        n = stop - start
+        columns = self.fixed_columns()
+
+        if self.needs("transaction_id"):
+            rng = self.stream("transaction_id")
+            columns["transaction_id"] = [random_uuid(rng) for _ in range(n)]
+        holders = np.zeros(0, np.int64)
+        if self.needs("customer_id"):
+            rng = self.stream("customer_id")
+            if self.keys is not None:
+                numbers = self.keys.sample(rng, n, "cards")
+            elif self.customer_sampler is not None:
+                numbers = self.customer_sampler.samples(rng, n)
+            else:
+                space = self.cfg.customer_key_space
+                numbers = [rng.randint(1, space) for _ in range(n)]
+            holders = np.asarray(numbers, np.int64) - 1
+            if self.keys is not None:
+                columns["customer_id"] = [
+                    self.keys.customer_id(number) for number in numbers
+                ]
+            else:
+                columns["customer_id"] = self.customer_ids.format(holders)
+        elif self.needs("card_id"):
+            # Holders already sampled by a ``where`` predicate
+            holders = self._holders(columns["customer_id"])
+        if self.needs("card_id"):
+            columns["card_id"] = self.card_ids.format(holders)
+        if self.needs("card_network"):
+            rng = self.stream("card_network")
+            columns["card_network"] = [
+                rng.choice(self.card_networks) for _ in range(n)
+            ]
+        if self.needs("txn_timestamp"):
+            if self.cfg.ordered:
+                columns["txn_timestamp"] = datetimes_at(
+                    self.order_statistics(start, stop),
+                    datetime.fromisoformat(self.cfg.start_date),
+                    datetime.fromisoformat(self.cfg.end_date),
+                )
+            else:
+                columns["txn_timestamp"] = [
+                    self._random_timestamp() for _ in range(n)
+                ]
+        if self.needs("amount"):
+            # Amount distribution: normal spending vs a few large outliers
+            rng = self.stream("amount")
+            columns["amount"] = [
+                round(min(max(rng.lognormvariate(3.0, 0.6), 10), 5000), 2)
+                for _ in range(n)
+            ]
+        if self.needs("currency"):
+            rng = self.stream("currency")
+            columns["currency"] = rng.choices(
+                self.currencies, weights=[0.6, 0.2, 0.1, 0.1], k=n
+            )
+        if self.needs("merchant_category"):
+            rng = self.stream("merchant_category")
+            categories = list(self.merchant_categories.keys())
+            columns["merchant_category"] = [rng.choice(categories) for _ in range(n)]
+        if self.needs("merchant"):
+            rng = self.stream("merchant")
+            if self.cfg.merchant_skew is not None:
+                columns["merchant"] = [
+                    self.merchant_categories[category][
+                        self.merchant_samplers[category].sample(rng) - 1
+                    ]
+                    for category in columns["merchant_category"]
+                ]
+            else:
+                columns["merchant"] = [
+                    rng.choice(self.merchant_categories[category])
+                    for category in columns["merchant_category"]
+                ]
+        if self.needs("channel"):
+            rng = self.stream("channel")
+            columns["channel"] = [rng.choice(self.channels) for _ in range(n)]
+        if self.needs("country") or self.needs("city"):
+            with self.stage("faker"):
+                if self.needs("country"):
+                    fake.seed_instance(self.stream("country").getrandbits(64))
+                    columns["country"] = [fake.country() for _ in range(n)]
+                if self.needs("city"):
+                    fake.seed_instance(self.stream("city").getrandbits(64))
+                    columns["city"] = [fake.city() for _ in range(n)]
+        if self.needs("is_international"):
+            # International vs domestic
+            rng = self.stream("is_international")
+            columns["is_international"] = [
+                1 if currency in {"USD", "EUR"} and rng.random() < 0.5 else 0
+                for currency in columns["currency"]
+            ]
+        if self.needs("is_online"):
+            columns["is_online"] = [
+                1 if channel in {"ECOM", "UPI"} else 0 for channel in columns["channel"]
+            ]
+        if self.needs("is_fraud"):
+            rng = self.stream("is_fraud")
+            risks = [1.0] * n
+            if self.keys is not None:
+                risks = [
+                    SEGMENT_RISK[self.keys.segment_of(customer)]
+                    for customer in columns["customer_id"]
+                ]
+            columns["is_fraud"] = [
+                1 if rng.random() < self._fraud_probability(*row) else 0
+                for row in zip(
+                    columns["is_international"],
+                    columns["is_online"],
+                    columns["amount"],
+                    risks,
+                )
+            ]
 
-    def generate(self) -> pd.DataFrame:
-        rows: list[dict] = []
-        for _ in range(self.cfg.num_rows):
-            rows.append(self._sample_transaction())
-        return pd.DataFrame(rows)
+        return columns
@@ -0,0 +1,460 @@
+"""Change data capture for customer 360 profiles.
+
+The customers of a ``customer_360`` config (same ``num_customers`` and
+``seed``) are the snapshot at ``start_date``. Each period a share of them is
+updated (income, products, balance, risk segment, engagement, churn), new
+customers sign up and some leave, and only those changes are emitted:
+
+* :class:`Customer360CDCGenerator` writes ``I`` / ``U`` / ``D`` delta records;
+  updates carry the new values of the tracked columns, other columns are
+  null (unchanged).
+* :class:`Customer360SCD2Generator` writes slowly changing dimension (type 2)
+  rows: an update closes the current version (``valid_to`` set) and opens a
+  new one, a delete only closes it.
+
+The tracked attributes of every customer live in numpy arrays: a period
+gathers its changed customers once, draws each new column in one call and
+scatters the updates back, so it costs ``O(changes)``; building the snapshot
+state is a one-off ``O(num_customers)``. Periods are the generator's
+entities (one per RNG block), so generating period ``p`` on its own replays
+the changes of earlier periods.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+from ...core.base_generator import BaseScenarioGenerator
+from ...core.utils import derive_seed, new_columns
+from .generator import Customer360Config, Customer360Generator, customer_key
+
+SEGMENTS = ("LOW", "MEDIUM", "HIGH")
+
+#: Columns an update changes, in output order.
+TRACKED = (
+    "income_annual",
+    "has_credit_card",
+    "has_loan",
+    "has_savings_account",
+    "num_products",
+    "total_balance",
+    "risk_segment",
+    "engagement_score",
+    "churn_score",
+)
+#: Chance that an update opens or closes each product.
+PRODUCT_FLIP = 0.15
+
+_SEGMENT_NAMES = np.array(SEGMENTS, dtype=object)
+_PRODUCTS = ("has_credit_card", "has_loan", "has_savings_account")
+#: State arrays: the tracked columns but num_products (risk_segment as an
+#: index into SEGMENTS) and the second after start_date the current version
+#: is valid from.
+_STATE_DTYPES = {
+    "income_annual": np.float64,
+    "has_credit_card": np.int8,
+    "has_loan": np.int8,
+    "has_savings_account": np.int8,
+    "total_balance": np.float64,
+    "risk_segment": np.int8,
+    "engagement_score": np.float64,
+    "churn_score": np.float64,
+    "valid_from": np.int64,
+}
+_SNAPSHOT_COLUMNS = tuple(name for name in _STATE_DTYPES if name != "valid_from")
+
+
+@dataclass
+class Customer360CDCConfig:
+    """Configuration for the customer 360 change stream."""
+
+    # Snapshot customers, as generated by customer_360 with the same values
+    num_customers: int = 1000
+    seed: int = 2025
+    start_date: str = "2024-01-01"
+    num_periods: int = 12
+    period_days: int = 30
+    # Per period, as a share of num_customers
+    update_rate: float = 0.05
+    insert_rate: float = 0.01
+    delete_rate: float = 0.005
+    num_rows: int | None = None
+
+
+class _State:
+    """Tracked attributes of every customer so far, one array slot each."""
+
+    def __init__(self) -> None:
+        self.columns = {
+            name: np.empty(0, dtype) for name, dtype in _STATE_DTYPES.items()
+        }
+        self.live = np.empty(0, dtype=bool)
+        self.size = 0
+        self.num_live = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def extend(
+        self, values: Mapping[str, Sequence], since: int | np.ndarray
+    ) -> None:
+        """Add customers from columns of their tracked values."""
+        stop = self.size + len(values["income_annual"])
+        if stop > len(self.live):
+            # Amortized growth: periods keep inserting customers
+            capacity = max(stop, 2 * len(self.live))
+            self.columns = {
+                name: _grown(column, capacity) for name, column in self.columns.items()
+            }
+            self.live = _grown(self.live, capacity)
+        added = slice(self.size, stop)
+        for name, column in self.columns.items():
+            if name == "valid_from":
+                column[added] = since
+            elif name == "risk_segment":
+                column[added] = _segment_codes(values[name])
+            else:
+                column[added] = values[name]
+        self.live[added] = True
+        self.num_live += stop - self.size
+        self.size = stop
+
+    def take(self, idx: np.ndarray) -> dict[str, np.ndarray]:
+        """Tracked values of customers ``idx`` (0-based) plus ``valid_from``."""
+        values = {name: column[idx] for name, column in self.columns.items()}
+        values["num_products"] = sum(values[name] for name in _PRODUCTS)
+        return values
+
+    def put(
+        self, idx: np.ndarray, values: Mapping[str, np.ndarray], since: np.ndarray
+    ) -> None:
+        for name, column in self.columns.items():
+            column[idx] = since if name == "valid_from" else values[name]
+
+    def delete(self, idx: np.ndarray) -> None:
+        self.live[idx] = False
+        self.num_live -= len(idx)
+
+    def sample_live(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        """``k`` distinct live customers (fewer if there are not that many)."""
+        k = min(k, self.num_live)
+        chosen = np.empty(0, dtype=np.int64)
+        while len(chosen) < k:
+            draws = rng.integers(0, self.size, k - len(chosen))
+            pool = np.concatenate([chosen, draws[self.live[draws]]])
+            # Keep the first draw of each customer, in draw order
+            first = np.unique(pool, return_index=True)[1]
+            chosen = pool[np.sort(first)]
+        return chosen
+
+
+def _grown(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.empty(capacity, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+def _segment_codes(segments: Sequence[str] | np.ndarray) -> np.ndarray:
+    segments = np.asarray(segments)
+    return (segments == "MEDIUM") + 2 * (segments == "HIGH")
+
+
+def _objects(values: Any, n: int) -> np.ndarray:
+    """``values`` (None: all null) as an object array of Python values."""
+    column = np.empty(n, dtype=object)
+    if isinstance(values, np.ndarray):
+        column[:] = values.astype(object)
+    elif values is not None:
+        column[:] = values
+    return column
+
+
+@dataclass
+class _Changes:
+    """One period's changes as columns: updates, then deletes, then inserts.
+
+    ``seconds`` and ``numbers`` (customer numbers) cover every change;
+    ``before`` holds tracked values (and ``valid_from``) of updated and
+    deleted customers, ``after`` the new values of updated ones and
+    ``profiles`` the full profiles of inserted ones.
+    """
+
+    updates: int
+    deletes: int
+    inserts: int
+    seconds: np.ndarray
+    numbers: np.ndarray
+    before: dict[str, np.ndarray]
+    after: dict[str, np.ndarray]
+    profiles: dict[str, list]
+
+
+#: A slice of output rows: the changes they come from and their columns.
+_Part = tuple[np.ndarray, Mapping[str, Any]]
+
+
+class Customer360CDCGenerator(BaseScenarioGenerator):
+    """Insert / update / delete records of customer 360 profiles per period."""
+
+    COLUMNS = ("op", "changed_at", *Customer360Generator.COLUMNS)
+    EVENT_TIME = "changed_at"
+    # One period per block: its changes depend on all earlier periods
+    BLOCK_SIZE = 1
+
+    def __init__(self, config: Customer360CDCConfig | None = None) -> None:
+        self.cfg = config or Customer360CDCConfig()
+        self.seed = derive_seed(self.cfg.seed, "cdc")
+        self.start = datetime.fromisoformat(self.cfg.start_date)
+        self.period_seconds = self.cfg.period_days * 86400
+        self._state: _State | None = None
+        # first period not yet applied to the state
+        self._period = 0
+
+    def num_entities(self) -> int:
+        return self.cfg.num_periods
+
+    def row_limit(self) -> int | None:
+        return self.cfg.num_rows
+
+    def period_changes(self) -> tuple[int, int, int]:
+        """Updates, inserts and deletes per period."""
+        n = self.cfg.num_customers
+        return (
+            round(n * self.cfg.update_rate),
+            round(n * self.cfg.insert_rate),
+            round(n * self.cfg.delete_rate),
+        )
+
+    def rows_per_period(self) -> int:
+        return sum(self.period_changes())
+
+    def expected_rows(self) -> float:
+        rows = self.num_entities() * self.rows_per_period()
+        if self.cfg.num_rows is not None:
+            rows = min(rows, self.cfg.num_rows)
+        return float(rows)
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        return [self.rows_per_period()] * (stop - start)
+
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        columns = new_columns(self.COLUMNS)
+        for period in range(start, stop):
+            self._advance(period)
+            changes = self._apply(period)
+            # Rows in time order; a change's rows stay in part order
+            rank = np.empty(len(changes.seconds), dtype=np.int64)
+            rank[np.argsort(changes.seconds, kind="stable")] = np.arange(len(rank))
+            parts = self._parts(changes)
+            changed = np.concatenate([part[0] for part in parts])
+            order = np.lexsort((np.arange(len(changed)), rank[changed]))
+            for name in self.COLUMNS:
+                values = np.concatenate(
+                    [_objects(part.get(name), len(rows)) for rows, part in parts]
+                )
+                columns[name].extend(values[order].tolist())
+        return columns
+
+    def _advance(self, period: int) -> None:
+        """Bring the state to the start of ``period``."""
+        if self._state is None or self._period > period:
+            self._state = self._snapshot()
+            self._period = 0
+        while self._period < period:
+            self._apply(self._period)
+
+    def _snapshot(self) -> _State:
+        state = _State()
+        snapshot = Customer360Generator(
+            Customer360Config(self.cfg.num_customers, self.cfg.seed)
+        ).project(_SNAPSHOT_COLUMNS)
+        for _, columns in snapshot.iter_blocks():
+            state.extend(columns, 0)
+        return state
+
+    def _rng(self, period: int, name: str) -> np.random.Generator:
+        return np.random.default_rng(derive_seed(self.block_seed(period), name))
+
+    def _apply(self, period: int) -> _Changes:
+        """Apply ``period``'s changes to the state and return them."""
+        assert self._state is not None
+        state = self._state
+        updates, inserts, deletes = self.period_changes()
+        chosen = state.sample_live(self._rng(period, "pick"), updates + deletes)
+        updated, deleted = chosen[:updates], chosen[updates:]
+        first = period * self.period_seconds
+        seconds = first + self._rng(period, "changed_at").integers(
+            0, self.period_seconds, len(chosen) + inserts
+        )
+
+        # One gather of the changed customers, one scatter of the updates
+        before = state.take(chosen)
+        after = self._evolve(period, {k: v[:updates] for k, v in before.items()})
+        state.put(updated, after, seconds[:updates])
+        state.delete(deleted)
+        profiles = self._signups(period, inserts)
+        numbers = np.concatenate(
+            [chosen + 1, np.arange(len(state), len(state) + inserts) + 1]
+        )
+        state.extend(profiles, seconds[len(chosen) :])
+        self._period = period + 1
+        return _Changes(
+            updates=len(updated),
+            deletes=len(deleted),
+            inserts=inserts,
+            seconds=seconds,
+            numbers=numbers,
+            before=before,
+            after=after,
+            profiles=profiles,
+        )
+
+    def _evolve(
+        self, period: int, before: Mapping[str, np.ndarray]
+    ) -> dict[str, np.ndarray]:
+        """New tracked values of updated customers, drawn column by column."""
+        n = len(before["income_annual"])
+        rng = self._rng(period, "income_annual")
+        income = np.round(before["income_annual"] * rng.lognormal(0.01, 0.08, n), 2)
+        products = {}
+        for name in _PRODUCTS:
+            flip = self._rng(period, name).random(n) < PRODUCT_FLIP
+            products[name] = before[name] ^ flip.astype(np.int8)
+        card, loan, savings = (products[name] for name in _PRODUCTS)
+        num_products = card + loan + savings
+
+        rng = self._rng(period, "total_balance")
+        old = before["total_balance"]
+        drift = np.round(old + rng.normal(0.0, 0.05 * np.abs(old) + 1000), 2)
+        # Opening or closing a product moves the balance to a new level
+        # As Customer360Generator._balance: savings, card and loan amounts
+        low, high = (20_000, -50_000, 50_000), (300_000, 50_000, 500_000)
+        amounts = rng.uniform(low, high, (n, 3))
+        level = np.round(
+            savings * amounts[:, 0] + card * amounts[:, 1] - loan * amounts[:, 2], 2
+        )
+        kept = np.ones(n, dtype=bool)
+        for name in _PRODUCTS:
+            kept &= products[name] == before[name]
+        balance = np.where(kept, drift, level)
+
+        # As Customer360Generator._risk_segment: debt sets the segment
+        indebted = (loan == 1) | (balance < 0)
+        medium = self._rng(period, "risk_segment").random(n) >= 0.7
+        risk = np.where(indebted, np.where(income < 400_000, 2, 1), medium)
+
+        rng = self._rng(period, "engagement_score")
+        gained = num_products - before["num_products"]
+        step = rng.normal(0.0, 0.05, n) + 0.05 * gained
+        engagement = np.round(np.clip(before["engagement_score"] + step, 0, 1), 3)
+        # As Customer360Generator._churn
+        churn = np.round(np.minimum(1.0, 1.0 - engagement + 0.2 * (risk == 2)), 3)
+        return {
+            "income_annual": income,
+            **products,
+            "num_products": num_products,
+            "total_balance": balance,
+            "risk_segment": risk.astype(np.int8),
+            "engagement_score": engagement,
+            "churn_score": churn,
+        }
+
+    def _signups(self, period: int, n: int) -> dict[str, list]:
+        """Full profiles of ``n`` new customers (IDs are set on insert)."""
+        generator = Customer360Generator(
+            Customer360Config(n, derive_seed(self.block_seed(period), "insert"))
+        )
+        if not n:
+            return new_columns(generator.COLUMNS)
+        return generator.generate_columns()
+
+    def _changed_at(self, seconds: np.ndarray) -> np.ndarray:
+        return np.datetime64(self.start, "us") + seconds.astype("timedelta64[s]")
+
+    def _parts(self, changes: _Changes) -> list[_Part]:
+        """Output rows of ``changes``, one row per change."""
+        u, d = changes.updates, changes.deletes
+        ops = np.repeat(["U", "D", "I"], [u, d, changes.inserts])
+        common = {
+            "op": ops,
+            "changed_at": self._changed_at(changes.seconds),
+            "customer_id": [customer_key(n) for n in changes.numbers.tolist()],
+        }
+        events = np.arange(len(changes.seconds))
+        inserted = slice(u + d, None)
+        return [
+            (events[:u], {**_columns(changes.after), **_at(common, slice(0, u))}),
+            (events[u : u + d], _at(common, slice(u, u + d))),
+            (events[inserted], {**changes.profiles, **_at(common, inserted)}),
+        ]
+
+
+def _columns(values: Mapping[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Tracked ``values`` as output columns (risk segment names)."""
+    columns = {name: values[name] for name in TRACKED}
+    columns["risk_segment"] = _SEGMENT_NAMES[values["risk_segment"]]
+    return columns
+
+
+def _at(columns: Mapping[str, Any], rows: slice) -> dict[str, Any]:
+    return {name: values[rows] for name, values in columns.items()}
+
+
+class Customer360SCD2Generator(Customer360CDCGenerator):
+    """Type 2 slowly changing dimension rows of customer 360 changes.
+
+    Versions from the snapshot are those of ``customer_360`` and valid from
+    ``start_date``; only versions that are closed or opened by a change are
+    written.
+    """
+
+    COLUMNS = ("customer_id", *TRACKED, "valid_from", "valid_to", "is_current")
+    EVENT_TIME = None
+
+    def rows_per_period(self) -> int:
+        updates, inserts, deletes = self.period_changes()
+        return 2 * updates + inserts + deletes
+
+    def _parts(self, changes: _Changes) -> list[_Part]:
+        """The versions each change closes (updates, deletes), then opens."""
+        u, d = changes.updates, changes.deletes
+        changed = self._changed_at(changes.seconds)
+        keys = np.array([customer_key(n) for n in changes.numbers.tolist()], object)
+        closed = slice(0, u + d)
+        opened = np.r_[0:u, u + d : len(keys)]
+        updated = _columns(changes.after)
+        after = {
+            name: np.concatenate(
+                [
+                    _objects(updated[name], u),
+                    _objects(changes.profiles[name], changes.inserts),
+                ]
+            )
+            for name in TRACKED
+        }
+        return [
+            (
+                np.arange(u + d),
+                {
+                    **_columns(changes.before),
+                    "customer_id": keys[closed],
+                    "valid_from": self._changed_at(changes.before["valid_from"]),
+                    "valid_to": changed[closed],
+                    "is_current": np.zeros(u + d, dtype=np.int8),
+                },
+            ),
+            (
+                opened,
+                {
+                    **after,
+                    "customer_id": keys[opened],
+                    "valid_from": changed[opened],
+                    "valid_to": None,
+                    "is_current": np.ones(len(opened), dtype=np.int8),
+                },
+            ),
+        ]
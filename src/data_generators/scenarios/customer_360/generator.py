@@ -3,12 +3,18 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass
 
-import pandas as pd
 from faker import Faker
 
+from ...core.base_generator import BaseScenarioGenerator
+
 fake = Faker()
 
 
+def customer_key(number: int) -> str:
+    """Customer ID of customer ``number`` (1-based), e.g. ``CUST-000042``."""
+    return f"CUST-{number:06d}"
+
+
 @dataclass
 class Customer360Config:
     """Configuration for customer 360 profile generator."""
@@ -17,13 +23,41 @@ class Customer360Config:
     seed: int = 2025
 
 
-class Customer360Generator:
+class Customer360Generator(BaseScenarioGenerator):
     """Generate synthetic Customer 360 profiles."""
 
+    COLUMNS = (
+        "customer_id",
+        "full_name",
+        "age",
+        "gender",
+        "country",
+        "city",
+        "income_annual",
+        "occupation",
+        "risk_segment",
+        "has_credit_card",
+        "has_loan",
+        "has_savings_account",
+        "num_products",
+        "total_balance",
+        "churn_score",
+        "engagement_score",
+    )
+    COLUMN_DEPENDENCIES = {
+        "income_annual": ("age",),
+        "has_savings_account": ("has_credit_card", "has_loan"),
+        "num_products": ("has_credit_card", "has_loan", "has_savings_account"),
+        "total_balance": ("has_credit_card", "has_loan", "has_savings_account"),
+        "risk_segment": ("has_loan", "total_balance", "income_annual"),
+        "engagement_score": ("num_products",),
+        "churn_score": ("engagement_score", "risk_segment"),
+    }
+    CONDITIONAL_SAMPLING = True
+
     def __init__(self, config: Customer360Config | None = None) -> None:
         self.cfg = config or Customer360Config()
-        random.seed(self.cfg.seed)
-        Faker.seed(self.cfg.seed)
+        self.seed = self.cfg.seed
 
         self.occupations = [
             "Student",
@@ -38,95 +72,160 @@ class Customer360Generator:
             "Retired",
         ]
 
-    def _sample_customer(self, idx: int) -> dict:
-        customer_id = f"CUST-{idx:06d}"
-        profile = fake.simple_profile()
-
-        full_name = profile["name"]
-        gender_raw = profile["sex"]  # 'M' or 'F'
-        gender = gender_raw if gender_raw in {"M", "F"} else "O"
-
-        age = random.randint(18, 75)
-        country = fake.country()
-        city = fake.city()
-
+    @staticmethod
+    def _income(rng: random.Random, age: int) -> float:
         # Income distribution: different tiers
         if age < 24:
-            income = random.uniform(100000, 400000)
+            income = rng.uniform(100000, 400000)
         elif age < 35:
-            income = random.uniform(300000, 900000)
+            income = rng.uniform(300000, 900000)
         elif age < 50:
-            income = random.uniform(400000, 1500000)
+            income = rng.uniform(400000, 1500000)
         else:
-            income = random.uniform(200000, 800000)
-        income = round(income, 2)
-
-        occupation = random.choice(self.occupations)
-
-        # Product ownership
-        has_credit_card = 1 if random.random() < 0.65 else 0
-        has_loan = 1 if random.random() < 0.45 else 0
-        has_savings = 1 if random.random() < 0.85 else 0
-
-        num_products = has_credit_card + has_loan + has_savings
-        if num_products == 0 and random.random() < 0.3:
-            # Force at least one product sometimes
-            has_savings = 1
-            num_products = 1
+            income = rng.uniform(200000, 800000)
+        return round(income, 2)
 
+    @staticmethod
+    def _balance(
+        rng: random.Random, has_savings: int, has_credit_card: int, has_loan: int
+    ) -> float:
         # Total balance approximate model
         base_balance = 0.0
         if has_savings:
-            base_balance += random.uniform(20000, 300000)
+            base_balance += rng.uniform(20000, 300000)
         if has_credit_card:
-            base_balance += random.uniform(-50000, 50000)  # could be net positive or debt
+            base_balance += rng.uniform(-50000, 50000)  # could be net positive or debt
         if has_loan:
-            base_balance -= random.uniform(50000, 500000)  # debt impact
-
-        total_balance = round(base_balance, 2)
+            base_balance -= rng.uniform(50000, 500000)  # debt impact
+        return round(base_balance, 2)
 
-        # Risk & engagement modeling
+    @staticmethod
+    def _risk_segment(
+        rng: random.Random, has_loan: int, total_balance: float, income: float
+    ) -> str:
         # Higher debt / lower income -> higher risk
         debt_indicator = 1 if has_loan or total_balance < 0 else 0
         if debt_indicator and income < 400000:
-            risk_segment = "HIGH"
-        elif debt_indicator:
-            risk_segment = "MEDIUM"
-        else:
-            risk_segment = random.choices(["LOW", "MEDIUM"], weights=[0.7, 0.3], k=1)[0]
-
-        # Churn score: inverse of engagement and product count (very rough)
-        engagement_score = random.uniform(0.1, 0.9)
-        engagement_score += 0.05 * (num_products - 1)
-        engagement_score = max(0.0, min(1.0, engagement_score))
-
-        churn_score = 1.0 - engagement_score
+            return "HIGH"
+        if debt_indicator:
+            return "MEDIUM"
+        return rng.choices(["LOW", "MEDIUM"], weights=[0.7, 0.3], k=1)[0]
+
+    @staticmethod
+    def _churn(engagement: float, risk_segment: str) -> float:
+        churn_score = 1.0 - engagement
         if risk_segment == "HIGH":
             churn_score = min(1.0, churn_score + 0.2)
-        churn_score = round(churn_score, 3)
-        engagement_score = round(engagement_score, 3)
-
-        return {
-            "customer_id": customer_id,
-            "full_name": full_name,
-            "age": age,
-            "gender": gender,
-            "country": country,
-            "city": city,
-            "income_annual": income,
-            "occupation": occupation,
-            "risk_segment": risk_segment,
-            "has_credit_card": has_credit_card,
-            "has_loan": has_loan,
-            "has_savings_account": has_savings,
-            "num_products": num_products,
-            "total_balance": total_balance,
-            "churn_score": churn_score,
-            "engagement_score": engagement_score,
-        }
-
-    def generate(self) -> pd.DataFrame:
-        rows: list[dict] = []
-        for i in range(1, self.cfg.num_customers + 1):
-            rows.append(self._sample_customer(i))
-        return pd.DataFrame(rows)
+        return round(churn_score, 3)
+
+    def num_entities(self) -> int:
+        return self.cfg.num_customers
+
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        n = stop - start
+        need = self.needs
+        columns = self.fixed_columns()
+
+        if need("customer_id"):
+            columns["customer_id"] = [
+                customer_key(idx) for idx in range(start + 1, stop + 1)
+            ]
+
+        with self.stage("faker"):
+            if need("full_name") or need("gender"):
+                fake.seed_instance(self.stream("profile").getrandbits(64))
+                profiles = [fake.simple_profile() for _ in range(n)]
+                columns["full_name"] = [profile["name"] for profile in profiles]
+                # 'M' or 'F'
+                columns["gender"] = [
+                    profile["sex"] if profile["sex"] in {"M", "F"} else "O"
+                    for profile in profiles
+                ]
+            if need("country"):
+                fake.seed_instance(self.stream("country").getrandbits(64))
+                columns["country"] = [fake.country() for _ in range(n)]
+            if need("city"):
+                fake.seed_instance(self.stream("city").getrandbits(64))
+                columns["city"] = [fake.city() for _ in range(n)]
+
+        if need("age"):
+            rng = self.stream("age")
+            columns["age"] = [rng.randint(18, 75) for _ in range(n)]
+        if need("income_annual"):
+            rng = self.stream("income_annual")
+            columns["income_annual"] = [
+                self._income(rng, age) for age in columns["age"]
+            ]
+        if need("occupation"):
+            rng = self.stream("occupation")
+            columns["occupation"] = [rng.choice(self.occupations) for _ in range(n)]
+
+        # Product ownership
+        if need("has_credit_card"):
+            rng = self.stream("has_credit_card")
+            columns["has_credit_card"] = [
+                1 if rng.random() < 0.65 else 0 for _ in range(n)
+            ]
+        if need("has_loan"):
+            rng = self.stream("has_loan")
+            columns["has_loan"] = [1 if rng.random() < 0.45 else 0 for _ in range(n)]
+        if need("has_savings_account"):
+            rng = self.stream("has_savings_account")
+            savings = []
+            for card, loan in zip(columns["has_credit_card"], columns["has_loan"]):
+                has_savings = 1 if rng.random() < 0.85 else 0
+                if card + loan + has_savings == 0 and rng.random() < 0.3:
+                    # Force at least one product sometimes
+                    has_savings = 1
+                savings.append(has_savings)
+            columns["has_savings_account"] = savings
+        if need("num_products"):
+            columns["num_products"] = [
+                card + loan + savings
+                for card, loan, savings in zip(
+                    columns["has_credit_card"],
+                    columns["has_loan"],
+                    columns["has_savings_account"],
+                )
+            ]
+        if need("total_balance"):
+            rng = self.stream("total_balance")
+            columns["total_balance"] = [
+                self._balance(rng, savings, card, loan)
+                for savings, card, loan in zip(
+                    columns["has_savings_account"],
+                    columns["has_credit_card"],
+                    columns["has_loan"],
+                )
+            ]
+
+        # Risk & engagement modeling
+        if need("risk_segment"):
+            rng = self.stream("risk_segment")
+            columns["risk_segment"] = [
+                self._risk_segment(rng, *row)
+                for row in zip(
+                    columns["has_loan"],
+                    columns["total_balance"],
+                    columns["income_annual"],
+                )
+            ]
+        if need("engagement_score"):
+            # Churn score: inverse of engagement and product count (very rough)
+            rng = self.stream("engagement_score")
+            columns["engagement_score"] = [
+                round(
+                    max(0.0, min(1.0, rng.uniform(0.1, 0.9) + 0.05 * (products - 1))),
+                    3,
+                )
+                for products in columns["num_products"]
+            ]
+        if need("churn_score"):
+            columns["churn_score"] = [
+                self._churn(score, risk)
+                for score, risk in zip(
+                    columns["engagement_score"], columns["risk_segment"]
+                )
+            ]
+
+        return columns
@@ -1 +1 @@
-"""Billing / ETL-style scenario (stub)."""
+"""Metered usage billing scenario (usage events and invoice lines)."""
@@ -1,24 +1,256 @@
 from __future__ import annotations
 
+import calendar
 from dataclasses import dataclass
-
-import pandas as pd
+from datetime import date, datetime, timedelta
 
 from ...core.base_generator import BaseScenarioGenerator
+from ...core.utils import datetimes_at, new_columns, poisson
+
+#: Plan -> (share of customers, usage multiplier, invoice discount).
+PLANS = {
+    "starter": (0.6, 0.5, 0.0),
+    "business": (0.3, 1.5, 0.05),
+    "enterprise": (0.1, 4.0, 0.15),
+}
+#: Meter type -> (unit, graduated monthly price tiers as (up to, unit price)).
+METERS = {
+    "api_calls": ("calls", ((10_000, 0.0), (1_000_000, 0.0004), (None, 0.0002))),
+    "compute_hours": ("hours", ((50, 0.0), (None, 0.12))),
+    "data_transfer": ("GB", ((10, 0.0), (10_240, 0.09), (None, 0.05))),
+    "messages": ("messages", ((1_000, 0.0), (None, 0.0005))),
+}
 
 
 @dataclass
 class BillingConfig:
     num_customers: int = 100
     seed: int = 202
+    # Billing starts at the first of this date's month
+    start_date: str = "2024-01-01"
+    months: int = 3
+    # Mean metered products per customer (at least one each)
+    meters_per_customer: float = 2.0
+    # Mean usage events per meter and day, before plan and activity scaling
+    events_per_meter_day: float = 24.0
+    num_rows: int | None = None
+
+
+def tiered_charge(
+    quantity: float, tiers: tuple[tuple[float | None, float], ...]
+) -> float:
+    """Charge for ``quantity`` under graduated ``tiers``."""
+    charge = lower = 0.0
+    for upper, price in tiers:
+        if upper is None or quantity <= upper:
+            return charge + (quantity - lower) * price
+        charge += (upper - lower) * price
+        lower = upper
+    return charge
 
 
 class BillingGenerator(BaseScenarioGenerator):
-    """Placeholder billing scenario (extend later)."""
+    """Metered usage events of customers' products, month by month.
+
+    Each customer has a plan and one or more meters; each meter emits a
+    Poisson number of usage events per month, scaled by the plan and the
+    meter's own activity level. :class:`BillingInvoicesGenerator` bills the
+    same events.
+    """
+
+    COLUMNS = (
+        "event_id",
+        "customer_id",
+        "meter_id",
+        "meter_type",
+        "unit",
+        "event_time",
+        "quantity",
+    )
+    COLUMN_DEPENDENCIES: dict[str, tuple[str, ...]] | None = {}
+    EVENT_TIME = "event_time"
+    BLOCK_SIZE = 16  # customers, ~4k events each with the defaults
 
     def __init__(self, config: BillingConfig | None = None) -> None:
         self.config = config or BillingConfig()
+        self.seed = self.config.seed
+
+        first = date.fromisoformat(str(self.config.start_date)).replace(day=1)
+        self.month_starts = []
+        year, month = first.year, first.month
+        for _ in range(self.config.months + 1):
+            self.month_starts.append(datetime(year, month, 1))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        self.month_days = [
+            calendar.monthrange(start.year, start.month)[1]
+            for start in self.month_starts[:-1]
+        ]
+
+    def num_entities(self) -> int:
+        return self.config.num_customers
+
+    def row_limit(self) -> int | None:
+        return self.config.num_rows
+
+    def expected_rows(self) -> float:
+        cfg = self.config
+        usage = sum(share * scale for share, scale, _ in PLANS.values())
+        rows = (
+            cfg.num_customers
+            * max(1.0, cfg.meters_per_customer)
+            * cfg.events_per_meter_day
+            * sum(self.month_days)
+            * usage
+        )
+        if cfg.num_rows is not None:
+            rows = min(rows, cfg.num_rows)
+        return rows
+
+    def _customer_shapes(
+        self, start: int, stop: int
+    ) -> list[tuple[str, list[tuple[str, list[int]]]]]:
+        """Plan and ``(meter type, events per month)`` of each customer's meters."""
+        cfg = self.config
+        rng = self.rng
+        plans = list(PLANS)
+        weights = [share for share, _, _ in PLANS.values()]
+        meter_types = list(METERS)
+        shapes = []
+        for _ in range(start, stop):
+            plan = rng.choices(plans, weights=weights)[0]
+            scale = PLANS[plan][1] * cfg.events_per_meter_day
+            meters = []
+            for _ in range(1 + poisson(rng, cfg.meters_per_customer - 1)):
+                meter_type = rng.choice(meter_types)
+                # Usage level of this meter; the mean is 1
+                activity = rng.lognormvariate(-0.5, 1.0)
+                counts = [
+                    poisson(rng, scale * activity * days) for days in self.month_days
+                ]
+                meters.append((meter_type, counts))
+            shapes.append((plan, meters))
+        return shapes
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        return [
+            sum(sum(counts) for _, counts in meters)
+            for _, meters in self._customer_shapes(start, stop)
+        ]
+
+    def _quantities(self, meter_type: str, n: int) -> list[float]:
+        """Sizes of ``n`` usage events of ``meter_type``."""
+        rng = self.stream("quantity")
+        lognormal = rng.lognormvariate
+        if meter_type == "api_calls":
+            return [1 + int(lognormal(3.0, 1.0)) for _ in range(n)]
+        if meter_type == "messages":
+            return [1 + int(lognormal(2.0, 1.0)) for _ in range(n)]
+        if meter_type == "compute_hours":
+            return [round(lognormal(-1.0, 0.8), 4) for _ in range(n)]
+        return [round(lognormal(-2.5, 1.2), 4) for _ in range(n)]
+
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        need = self.needs
+        columns = new_columns(self.COLUMNS)
+        for number, (_, meters) in enumerate(
+            self._customer_shapes(start, stop), start + 1
+        ):
+            customer_id = f"ACCT-{number:06d}"
+            for meter, (meter_type, counts) in enumerate(meters, 1):
+                meter_id = f"MTR-{number:06d}-{meter}"
+                unit = METERS[meter_type][0]
+                for month, n in enumerate(counts):
+                    if not n:
+                        continue
+                    if need("event_id"):
+                        columns["event_id"].extend(
+                            f"{meter_id}-{month + 1:03d}-{i:06d}"
+                            for i in range(1, n + 1)
+                        )
+                    columns["customer_id"].extend([customer_id] * n)
+                    columns["meter_id"].extend([meter_id] * n)
+                    columns["meter_type"].extend([meter_type] * n)
+                    columns["unit"].extend([unit] * n)
+                    if need("event_time"):
+                        rng = self.stream("event_time")
+                        fractions = sorted(rng.random() for _ in range(n))
+                        end = self.month_starts[month + 1] - timedelta(seconds=1)
+                        columns["event_time"].extend(
+                            datetimes_at(fractions, self.month_starts[month], end)
+                        )
+                    if need("quantity"):
+                        columns["quantity"].extend(self._quantities(meter_type, n))
+        return columns
+
+
+class BillingInvoicesGenerator(BillingGenerator):
+    """Monthly invoice lines of the usage in :class:`BillingGenerator`.
+
+    One line per meter and month. The usage of each customer is regenerated
+    from the same block seeds and aggregated one meter-month at a time, so
+    the lines total the events exactly without holding them.
+    """
+
+    COLUMNS = (
+        "invoice_id",
+        "customer_id",
+        "plan",
+        "billing_month",
+        "meter_id",
+        "meter_type",
+        "unit",
+        "event_count",
+        "quantity",
+        "subtotal",
+        "discount",
+        "amount",
+    )
+    COLUMN_DEPENDENCIES = None
+    EVENT_TIME = None
+
+    def expected_rows(self) -> float:
+        cfg = self.config
+        rows = cfg.num_customers * max(1.0, cfg.meters_per_customer) * cfg.months
+        if cfg.num_rows is not None:
+            rows = min(rows, cfg.num_rows)
+        return rows
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        return [
+            len(meters) * self.config.months
+            for _, meters in self._customer_shapes(start, stop)
+        ]
 
-    def generate(self) -> pd.DataFrame:
-        # TODO: implement realistic billing data
-        return pd.DataFrame()
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        columns = new_columns(self.COLUMNS)
+        for number, (plan, meters) in enumerate(
+            self._customer_shapes(start, stop), start + 1
+        ):
+            customer_id = f"ACCT-{number:06d}"
+            discount_rate = PLANS[plan][2]
+            for meter, (meter_type, counts) in enumerate(meters, 1):
+                meter_id = f"MTR-{number:06d}-{meter}"
+                unit, tiers = METERS[meter_type]
+                for month, n in enumerate(counts):
+                    # Same stream draws as the usage events of this meter-month
+                    quantity = sum(self._quantities(meter_type, n)) if n else 0
+                    if isinstance(quantity, float):
+                        quantity = round(quantity, 4)
+                    subtotal = round(tiered_charge(quantity, tiers), 2)
+                    discount = round(subtotal * discount_rate, 2)
+                    billing_month = self.month_starts[month].date()
+                    columns["invoice_id"].append(
+                        f"INV-{billing_month:%Y%m}-{number:06d}"
+                    )
+                    columns["customer_id"].append(customer_id)
+                    columns["plan"].append(plan)
+                    columns["billing_month"].append(billing_month)
+                    columns["meter_id"].append(meter_id)
+                    columns["meter_type"].append(meter_type)
+                    columns["unit"].append(unit)
+                    columns["event_count"].append(n)
+                    columns["quantity"].append(quantity)
+                    columns["subtotal"].append(subtotal)
+                    columns["discount"].append(discount)
+                    columns["amount"].append(round(subtotal - discount, 2))
+        return columns
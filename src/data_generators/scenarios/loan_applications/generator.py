@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Optional
 import random
 
-import pandas as pd
-
 from ...core.base_generator import BaseScenarioGenerator
+from ...core.ids import id_width
+from ...core.utils import datetimes_at, derive_seed, rows_in_window
+from ...keys import open_key_index
 
 
 STATUSES = ["REJECTED", "PENDING", "APPROVED", "CLOSED"]
@@ -16,6 +17,8 @@ STATUS_WEIGHTS = [0.3, 0.3, 0.2, 0.2]  # approx from your sample
 PRODUCT_TYPES = ["AUTO", "PERSONAL", "HOME"]
 BRANCHES = ["Pokhara", "Biratnagar", "Kathmandu"]
 CREDIT_SCORE_BANDS = ["LOW", "MEDIUM", "HIGH"]
+# Credit score band of applicants by customer risk segment
+BAND_BY_SEGMENT = {"LOW": "HIGH", "MEDIUM": "MEDIUM", "HIGH": "LOW"}
 
 
 @dataclass
@@ -39,6 +42,19 @@ class LoanApplicationsConfig:
     )
     tenure_options: tuple[int, ...] = (12, 24, 36, 48, 60)
     seed: int = 123
+    # Rows generated before this window; loan/customer numbering continues
+    # from here when a dataset is extended incrementally.
+    id_offset: int = 0
+    # Digits of loan / customer numbers (LN0001); default: enough for
+    # ``id_offset + num_rows``, at least 4, or the key index's loan ID width
+    # with ``customer_keys``. Appended windows keep the first window's width;
+    # set it for datasets that will grow past that.
+    id_width: int | None = None
+    # Emit rows sorted by created_at (missing values stay where they fall)
+    ordered: bool = False
+    # Key index directory (keys.build_key_index) applicants come from; their
+    # risk segment then sets the credit score band
+    customer_keys: str | None = None
 
     # Approximate missingness probabilities
     p_missing_created_at: float = 0.18
@@ -54,88 +70,169 @@ class LoanApplicationsConfig:
 class LoanApplicationsGenerator(BaseScenarioGenerator):
     """Generate synthetic loan application data."""
 
+    COLUMNS = (
+        "loan_id",
+        "customer_id",
+        "created_at",
+        "amount",
+        "interest_rate",
+        "tenure_months",
+        "status",
+        "product_type",
+        "branch",
+        "credit_score_band",
+    )
+    COLUMN_DEPENDENCIES: dict[str, tuple[str, ...]] = {}
+    CONDITIONAL_SAMPLING = True
+    ORDERED_BY = "created_at"
+    EVENT_TIME = "created_at"
+    WINDOW_FIELDS = ("start_datetime", "end_datetime")
+
     def __init__(self, config: Optional[LoanApplicationsConfig] = None) -> None:
         self.config = config or LoanApplicationsConfig()
-        random.seed(self.config.seed)
-
-    def generate(self) -> pd.DataFrame:
-        rows: List[dict] = []
+        self.seed = self.config.seed
+        self.keys = open_key_index(self.config.customer_keys)
+        self.id_width = self._id_width(self.config)
+        if self.keys is not None:
+            # Loan N belongs to the same customer in every table
+            self.COLUMN_DEPENDENCIES = {
+                "customer_id": ("loan_id",),
+                "credit_score_band": ("customer_id",),
+            }
 
+    @staticmethod
+    def _id_width(config: LoanApplicationsConfig) -> int:
+        if config.id_width:
+            return config.id_width
+        largest = config.id_offset + config.num_rows
+        keys = open_key_index(config.customer_keys)
+        if keys is not None:
+            return keys.loan_width(largest)
+        return id_width(largest, 4)
+
+    def num_entities(self) -> int:
+        return self.config.num_rows
+
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        cfg = self.config
+        n = stop - start
         dt_range_seconds = int(
-            (self.config.end_datetime - self.config.start_datetime).total_seconds()
+            (cfg.end_datetime - cfg.start_datetime).total_seconds()
         )
 
-        for idx in range(1, self.config.num_rows + 1):
-            loan_id = f"LN{idx:04d}"
-            customer_id = f"CUST{idx:04d}"
-
-            created_at = self._maybe_missing(
-                self.config.p_missing_created_at,
-                self._random_datetime(dt_range_seconds),
-            )
-
-            amount = self._maybe_missing(
-                self.config.p_missing_amount,
-                self._random_amount(),
-            )
-
-            interest_rate = self._maybe_missing(
-                self.config.p_missing_rate,
-                random.choice(self.config.interest_rates),
-            )
-
-            tenure_months = self._maybe_missing(
-                self.config.p_missing_tenure,
-                random.choice(self.config.tenure_options),
+        first = cfg.id_offset + 1
+        ids = range(first + start, first + stop)
+        columns = self.fixed_columns()
+        if self.needs("loan_id"):
+            width = self.id_width
+            columns["loan_id"] = [f"LN{idx:0{width}d}" for idx in ids]
+        if self.needs("customer_id"):
+            if self.keys is not None:
+                columns["customer_id"] = [
+                    self.keys.customer_id(self.keys.pick("loans", int(loan_id[2:])))
+                    for loan_id in columns["loan_id"]
+                ]
+            else:
+                width = self.id_width
+                columns["customer_id"] = [f"CUST{idx:0{width}d}" for idx in ids]
+        bands = None
+        if self.keys is not None and self.needs("credit_score_band"):
+            bands = iter(
+                BAND_BY_SEGMENT[self.keys.segment_of(customer)]
+                for customer in columns["customer_id"]
             )
 
-            status = self._maybe_missing(
-                self.config.p_missing_status,
-                random.choices(STATUSES, weights=STATUS_WEIGHTS, k=1)[0],
+        created = None
+        if cfg.ordered and self.needs("created_at"):
+            created = iter(
+                datetimes_at(
+                    self.order_statistics(start, stop),
+                    cfg.start_datetime,
+                    cfg.end_datetime,
+                )
             )
+        samplers = {
+            "created_at": (
+                cfg.p_missing_created_at,
+                lambda rng: (
+                    next(created)
+                    if created is not None
+                    else self._random_datetime(rng, dt_range_seconds)
+                ),
+            ),
+            "amount": (cfg.p_missing_amount, self._random_amount),
+            "interest_rate": (
+                cfg.p_missing_rate,
+                lambda rng: rng.choice(cfg.interest_rates),
+            ),
+            "tenure_months": (
+                cfg.p_missing_tenure,
+                lambda rng: rng.choice(cfg.tenure_options),
+            ),
+            "status": (
+                cfg.p_missing_status,
+                lambda rng: rng.choices(STATUSES, weights=STATUS_WEIGHTS, k=1)[0],
+            ),
+            "product_type": (
+                cfg.p_missing_product_type,
+                lambda rng: rng.choice(PRODUCT_TYPES),
+            ),
+            "branch": (cfg.p_missing_branch, lambda rng: rng.choice(BRANCHES)),
+            "credit_score_band": (
+                cfg.p_missing_credit_band,
+                lambda rng: (
+                    next(bands)
+                    if bands is not None
+                    else rng.choice(CREDIT_SCORE_BANDS)
+                ),
+            ),
+        }
+        for name, (p_missing, sample) in samplers.items():
+            if self.needs(name):
+                rng = self.stream(name)
+                columns[name] = [
+                    self._maybe_missing(rng, p_missing, sample(rng)) for _ in range(n)
+                ]
+
+        return columns
+
+    @classmethod
+    def window_config(
+        cls,
+        config: LoanApplicationsConfig,
+        after: datetime,
+        end: datetime,
+        *,
+        rows_before: int,
+    ) -> LoanApplicationsConfig:
+        num_rows = rows_in_window(
+            config.num_rows, config.start_datetime, config.end_datetime, after, end
+        )
+        return replace(
+            config,
+            num_rows=max(0, num_rows),
+            start_datetime=after + timedelta(seconds=1),
+            end_datetime=end,
+            seed=derive_seed(config.seed, "window", after),
+            id_offset=config.id_offset + rows_before,
+            # Later windows keep the first one's width (linked windows keep
+            # the key index's, checked per window)
+            id_width=(
+                config.id_width
+                if config.customer_keys is not None
+                else cls._id_width(config)
+            ),
+        )
 
-            product_type = self._maybe_missing(
-                self.config.p_missing_product_type,
-                random.choice(PRODUCT_TYPES),
-            )
-
-            branch = self._maybe_missing(
-                self.config.p_missing_branch,
-                random.choice(BRANCHES),
-            )
-
-            credit_score_band = self._maybe_missing(
-                self.config.p_missing_credit_band,
-                random.choice(CREDIT_SCORE_BANDS),
-            )
-
-            rows.append(
-                {
-                    "loan_id": loan_id,
-                    "customer_id": customer_id,
-                    "created_at": created_at,
-                    "amount": amount,
-                    "interest_rate": interest_rate,
-                    "tenure_months": tenure_months,
-                    "status": status,
-                    "product_type": product_type,
-                    "branch": branch,
-                    "credit_score_band": credit_score_band,
-                }
-            )
-
-        df = pd.DataFrame(rows)
-        return df
-
-    def _random_datetime(self, dt_range_seconds: int) -> datetime:
-        offset = random.randint(0, dt_range_seconds)
+    def _random_datetime(self, rng: random.Random, dt_range_seconds: int) -> datetime:
+        offset = rng.randint(0, dt_range_seconds)
         return self.config.start_datetime + timedelta(seconds=offset)
 
-    def _random_amount(self) -> int:
+    def _random_amount(self, rng: random.Random) -> int:
         steps = (self.config.max_amount - self.config.min_amount) // self.config.amount_step
-        step_idx = random.randint(0, steps)
+        step_idx = rng.randint(0, steps)
         return self.config.min_amount + step_idx * self.config.amount_step
 
     @staticmethod
-    def _maybe_missing(p: float, value):
-        return None if random.random() < p else value
+    def _maybe_missing(rng: random.Random, p: float, value):
+        return None if rng.random() < p else value
@@ -5,7 +5,16 @@ import random
 from dataclasses import dataclass
 from datetime import date, timedelta
 
-import pandas as pd
+from ...core.base_generator import BaseScenarioGenerator
+from ...core.ids import id_width
+from ...keys import SEGMENT_RISK, open_key_index
+
+AMOUNT_COLUMNS = (
+    "emi_amount",
+    "principal_component",
+    "interest_component",
+    "remaining_principal",
+)
 
 
 @dataclass
@@ -21,18 +30,50 @@ class LoanRepaymentsConfig:
     max_annual_rate: float = 18.0
     start_date: date = date(2024, 1, 1)
     seed: int = 999
+    # Cap on schedule rows; the last loan's schedule is cut short at the cap.
+    num_rows: int | None = None
+    # Key index directory (keys.build_key_index): loan N is then loans'
+    # LN000N with the same customer, defaulting more in riskier segments
+    customer_keys: str | None = None
+    # Digits of loan numbers (LN-REP-00001 / LN0001); default: enough for
+    # ``num_loans``, or the key index's loan ID width with ``customer_keys``.
+    # Give linked tables the same id_width if you set one.
+    id_width: int | None = None
 
     # Probabilities for non-ideal behavior
     p_late_installment: float = 0.08
     p_default_loan: float = 0.04
 
 
-class LoanRepaymentsGenerator:
+class LoanRepaymentsGenerator(BaseScenarioGenerator):
     """Generate synthetic EMI-style loan repayment schedules."""
 
+    COLUMNS = (
+        "loan_id",
+        "customer_id",
+        "schedule_date",
+        "installment_number",
+        "emi_amount",
+        "principal_component",
+        "interest_component",
+        "remaining_principal",
+        "status",
+        "is_missed_payment",
+    )
+    COLUMN_DEPENDENCIES = {"is_missed_payment": ("status",)}
+    BLOCK_SIZE = 128  # loans; up to ~8k schedule rows per block
+
     def __init__(self, config: LoanRepaymentsConfig | None = None) -> None:
         self.cfg = config or LoanRepaymentsConfig()
-        random.seed(self.cfg.seed)
+        self.seed = self.cfg.seed
+        self.keys = open_key_index(self.cfg.customer_keys)
+        if self.cfg.id_width:
+            self.id_width = self.cfg.id_width
+        elif self.keys is not None:
+            # Loan N spelled as loan_applications spells it, whatever the counts
+            self.id_width = self.keys.loan_width(self.cfg.num_loans)
+        else:
+            self.id_width = id_width(self.cfg.num_loans, 5)
 
     def _next_month(self, d: date) -> date:
         """Move to the same day next month (rough approximation)."""
@@ -45,18 +86,11 @@ class LoanRepaymentsGenerator:
         day = min(d.day, 28)
         return date(year, month, day)
 
-    def _build_schedule_for_loan(
-        self,
-        loan_id: str,
-        customer_id: str,
-        principal: float,
-        tenure_months: int,
-        annual_rate: float,
-        start_date: date,
-    ) -> list[dict]:
-        """Build EMI schedule rows for a single loan."""
-        rows: list[dict] = []
-
+    @staticmethod
+    def _amortize(
+        principal: float, tenure_months: int, annual_rate: float
+    ) -> dict[str, list[float]]:
+        """EMI, principal, interest and remaining principal per installment."""
         monthly_rate = annual_rate / 12.0 / 100.0
         n = tenure_months
 
@@ -70,13 +104,7 @@ class LoanRepaymentsGenerator:
 
         emi = round(emi, 2)
         remaining_principal = principal
-        schedule_date = start_date
-
-        # Decide if this loan will default at some point
-        will_default = random.random() < self.cfg.p_default_loan
-        default_after_installment = (
-            random.randint(3, n) if will_default else None
-        )
+        schedule: dict[str, list[float]] = {name: [] for name in AMOUNT_COLUMNS}
 
         for k in range(1, n + 1):
             # Interest for this period
@@ -94,62 +122,116 @@ class LoanRepaymentsGenerator:
                 0.0, round(remaining_principal - principal_component, 2)
             )
 
-            # Determine status
-            if will_default and default_after_installment is not None and k > default_after_installment:
-                status = "DEFAULTED"
-                is_missed = 1
-            else:
-                r = random.random()
-                if r < self.cfg.p_late_installment:
-                    status = "LATE"
-                    is_missed = 1
-                else:
-                    status = "PAID"
-                    is_missed = 0
-
-            rows.append(
-                {
-                    "loan_id": loan_id,
-                    "customer_id": customer_id,
-                    "schedule_date": schedule_date,
-                    "installment_number": k,
-                    "emi_amount": round(emi_effective, 2),
-                    "principal_component": round(principal_component, 2),
-                    "interest_component": round(interest_component, 2),
-                    "remaining_principal": round(remaining_principal, 2),
-                    "status": status,
-                    "is_missed_payment": is_missed,
-                }
-            )
+            schedule["emi_amount"].append(round(emi_effective, 2))
+            schedule["principal_component"].append(round(principal_component, 2))
+            schedule["interest_component"].append(round(interest_component, 2))
+            schedule["remaining_principal"].append(round(remaining_principal, 2))
 
-            schedule_date = self._next_month(schedule_date)
+        return schedule
 
-        return rows
+    def _statuses(
+        self, rng: random.Random, tenure_months: int, risk: float = 1.0
+    ) -> list[str]:
+        """Installment statuses: PAID, LATE, or DEFAULTED after a default."""
+        n = tenure_months
 
-    def generate(self) -> pd.DataFrame:
-        cfg = self.cfg
-        all_rows: list[dict] = []
+        # Decide if this loan will default at some point
+        will_default = rng.random() < self.cfg.p_default_loan * risk
+        default_after_installment = rng.randint(3, n) if will_default else None
 
-        for idx in range(1, cfg.num_loans + 1):
-            loan_id = f"LN-REP-{idx:05d}"
-            customer_id = f"CUST-{random.randint(10000, 99999)}"
+        statuses = []
+        for k in range(1, n + 1):
+            if default_after_installment is not None and k > default_after_installment:
+                statuses.append("DEFAULTED")
+            elif rng.random() < self.cfg.p_late_installment:
+                statuses.append("LATE")
+            else:
+                statuses.append("PAID")
+        return statuses
 
-            principal = random.randint(cfg.min_principal, cfg.max_principal)
-            tenure = random.randint(cfg.min_tenure_months, cfg.max_tenure_months)
-            annual_rate = round(
-                random.uniform(cfg.min_annual_rate, cfg.max_annual_rate), 2
-            )
+    def num_entities(self) -> int:
+        return self.cfg.num_loans
 
-            start_date = cfg.start_date + timedelta(days=random.randint(0, 90))
+    def row_limit(self) -> int | None:
+        return self.cfg.num_rows
 
-            schedule_rows = self._build_schedule_for_loan(
-                loan_id=loan_id,
-                customer_id=customer_id,
-                principal=float(principal),
-                tenure_months=tenure,
-                annual_rate=annual_rate,
-                start_date=start_date,
-            )
-            all_rows.extend(schedule_rows)
+    def expected_rows(self) -> float:
+        """One row per installment; tenures are uniform in months."""
+        cfg = self.cfg
+        mean_tenure = (cfg.min_tenure_months + cfg.max_tenure_months) / 2
+        rows = cfg.num_loans * mean_tenure
+        if cfg.num_rows is not None:
+            rows = min(rows, cfg.num_rows)
+        return rows
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        """Tenure of each loan: one schedule row per month."""
+        cfg = self.cfg
+        return [
+            self.rng.randint(cfg.min_tenure_months, cfg.max_tenure_months)
+            for _ in range(start, stop)
+        ]
 
-        return pd.DataFrame(all_rows)
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        cfg = self.cfg
+        need = self.needs
+        columns: dict[str, list] = {
+            name: []
+            for name in self.COLUMNS
+            if need(name) or name in ("loan_id", "installment_number")
+        }
+        amounts = any(need(name) for name in AMOUNT_COLUMNS)
+
+        tenures = self._entity_rows(start, stop)
+        width = self.id_width
+        for idx, tenure in zip(range(start + 1, stop + 1), tenures):
+            customer = self.keys.pick("loans", idx) if self.keys else None
+            if customer is None:
+                loan_id = f"LN-REP-{idx:0{width}d}"
+            else:
+                loan_id = f"LN{idx:0{width}d}"
+            columns["loan_id"].extend([loan_id] * tenure)
+            columns["installment_number"].extend(range(1, tenure + 1))
+
+            if need("customer_id"):
+                rng = self.stream("customer_id")
+                if customer is None:
+                    customer_id = f"CUST-{rng.randint(10000, 99999)}"
+                else:
+                    customer_id = self.keys.customer_id(customer)
+                columns["customer_id"].extend([customer_id] * tenure)
+
+            if need("schedule_date"):
+                rng = self.stream("schedule_date")
+                schedule_date = cfg.start_date + timedelta(days=rng.randint(0, 90))
+                for _ in range(tenure):
+                    columns["schedule_date"].append(schedule_date)
+                    schedule_date = self._next_month(schedule_date)
+
+            if amounts:
+                principal = self.stream("principal").randint(
+                    cfg.min_principal, cfg.max_principal
+                )
+                annual_rate = round(
+                    self.stream("annual_rate").uniform(
+                        cfg.min_annual_rate, cfg.max_annual_rate
+                    ),
+                    2,
+                )
+                schedule = self._amortize(float(principal), tenure, annual_rate)
+                for name in AMOUNT_COLUMNS:
+                    if need(name):
+                        columns[name].extend(schedule[name])
+
+            if need("status"):
+                risk = 1.0
+                if customer is not None:
+                    risk = SEGMENT_RISK[self.keys.segment(customer)]
+                statuses = self._statuses(self.stream("status"), tenure, risk)
+                columns["status"].extend(statuses)
+                if need("is_missed_payment"):
+                    columns["is_missed_payment"].extend(
+                        0 if status == "PAID" else 1 for status in statuses
+                    )
+
+        return columns
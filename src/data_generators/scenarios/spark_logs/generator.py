@@ -2,12 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List
-import random
-
-import pandas as pd
 
 from ...core.base_generator import BaseScenarioGenerator
+from ...core.distributions import key_sampler
 
 
 @dataclass
@@ -18,48 +15,113 @@ class SparkLogsConfig:
     num_rows: int | None = None
     start_time: datetime = datetime(2024, 1, 1, 0, 0, 0)
     seed: int = 101
+    # Skew of jobs over ``num_apps`` applications (core.distributions spec,
+    # e.g. "zipf:1.1"); by default every job is its own application
+    app_skew: str | None = None
+    num_apps: int = 100
 
 
 class SparkLogsGenerator(BaseScenarioGenerator):
     """Synthetic Spark-like logs (jobs, stages, tasks)."""
 
+    COLUMNS = ("ts", "app_id", "job_id", "stage_id", "task_id", "level", "message")
+    COLUMN_DEPENDENCIES = {"message": ("level",)}
+    EVENT_TIME = "ts"
+    BLOCK_SIZE = 128  # jobs
+
     def __init__(self, config: SparkLogsConfig | None = None) -> None:
         self.config = config or SparkLogsConfig()
-        random.seed(self.config.seed)
-
-    def generate(self) -> pd.DataFrame:
-        records: List[dict] = []
-        t = self.config.start_time
-
-        for job_id in range(1, self.config.num_jobs + 1):
-            app_id = f"app-{job_id:04d}"
-            num_stages = random.randint(1, self.config.max_stages_per_job)
-
-            for stage_id in range(num_stages):
-                num_tasks = random.randint(1, self.config.max_tasks_per_stage)
-                for task_id in range(num_tasks):
-                    t += timedelta(seconds=random.randint(1, 10))
-                    level = random.choices(
-                        ["INFO", "WARN", "ERROR"],
-                        weights=[0.9, 0.07, 0.03],
-                        k=1,
-                    )[0]
-                    msg = f"Job {job_id} Stage {stage_id} Task {task_id} {level}"
-                    records.append(
-                        {
-                            "ts": t,
-                            "app_id": app_id,
-                            "job_id": job_id,
-                            "stage_id": stage_id,
-                            "task_id": task_id,
-                            "level": level,
-                            "message": msg,
-                        }
-                    )
-                    if (
-                        self.config.num_rows is not None
-                        and len(records) >= self.config.num_rows
-                    ):
-                        return pd.DataFrame(records)
-
-        return pd.DataFrame(records)
+        self.seed = self.config.seed
+        self.app_sampler = key_sampler(self.config.app_skew, self.config.num_apps)
+
+    def num_entities(self) -> int:
+        return self.config.num_jobs
+
+    def row_limit(self) -> int | None:
+        return self.config.num_rows
+
+    def expected_rows_per_job(self) -> float:
+        """Mean tasks per job: uniform stage and task counts."""
+        stages = (1 + self.config.max_stages_per_job) / 2
+        tasks = (1 + self.config.max_tasks_per_stage) / 2
+        return stages * tasks
+
+    def expected_rows(self) -> float:
+        rows = self.config.num_jobs * self.expected_rows_per_job()
+        if self.config.num_rows is not None:
+            rows = min(rows, self.config.num_rows)
+        return rows
+
+    def _expected_job_seconds(self) -> float:
+        """Mean log span of one job: 5.5s between task events."""
+        return self.expected_rows_per_job() * 5.5
+
+    def _job_shapes(self, start: int, stop: int) -> list[list[int]]:
+        """Number of tasks in each stage of each job."""
+        cfg = self.config
+        return [
+            [
+                self.rng.randint(1, cfg.max_tasks_per_stage)
+                for _ in range(self.rng.randint(1, cfg.max_stages_per_job))
+            ]
+            for _ in range(start, stop)
+        ]
+
+    def _entity_rows(self, start: int, stop: int) -> list[int]:
+        return [sum(shape) for shape in self._job_shapes(start, stop)]
+
+    def _generate_entities(self, start: int, stop: int) -> dict[str, list]:
+        job_ids: list[int] = []
+        stage_ids: list[int] = []
+        task_ids: list[int] = []
+        for job_id, shape in zip(
+            range(start + 1, stop + 1), self._job_shapes(start, stop)
+        ):
+            for stage_id, num_tasks in enumerate(shape):
+                job_ids.extend([job_id] * num_tasks)
+                stage_ids.extend([stage_id] * num_tasks)
+                task_ids.extend(range(num_tasks))
+
+        n = len(job_ids)
+        columns: dict[str, list] = {
+            "job_id": job_ids,
+            "stage_id": stage_ids,
+            "task_id": task_ids,
+        }
+        if self.needs("ts"):
+            # Each block starts where its jobs would be expected to start, so
+            # blocks can be generated independently of the ones before them.
+            t = self.config.start_time + timedelta(
+                seconds=round(start * self._expected_job_seconds())
+            )
+            rng = self.stream("ts")
+            ts = []
+            for _ in range(n):
+                t += timedelta(seconds=rng.randint(1, 10))
+                ts.append(t)
+            columns["ts"] = ts
+        if self.needs("app_id"):
+            if self.app_sampler is not None:
+                # One application per job, repeated over its tasks
+                rng = self.stream("app_id")
+                apps: dict[int, int] = {}
+                for job_id in job_ids:
+                    if job_id not in apps:
+                        apps[job_id] = self.app_sampler.sample(rng)
+                columns["app_id"] = [f"app-{apps[job_id]:04d}" for job_id in job_ids]
+            else:
+                columns["app_id"] = [f"app-{job_id:04d}" for job_id in job_ids]
+        if self.needs("level"):
+            rng = self.stream("level")
+            columns["level"] = rng.choices(
+                ["INFO", "WARN", "ERROR"], weights=[0.9, 0.07, 0.03], k=n
+            )
+        if self.needs("message"):
+            columns["message"] = [
+                f"Job {job_id} Stage {stage_id} Task {task_id} {level}"
+                for job_id, stage_id, task_id, level in zip(
+                    job_ids, stage_ids, task_ids, columns["level"]
+                )
+            ]
+
+        return columns
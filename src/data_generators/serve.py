@@ -0,0 +1,317 @@
+"""Warm generation daemon for ``serve``.
+
+Every ``data_generators`` command pays for interpreter start-up and imports
+(Faker, numpy, every scenario module) before it generates anything, which
+dominates small fixtures. ``serve`` pays that once: it starts a pool of worker
+processes, warms each by generating a few rows of every scenario, and answers
+HTTP requests on localhost or a Unix socket::
+
+    GET  /health      {"status": "ok", "workers": 4, "requests": 12, ...}
+    POST /generate    a manifest job entry (see :mod:`data_generators.runner`)
+
+    {"scenario": "bank_transactions", "rows": 100, "config": {"seed": 7},
+     "columns": ["customer_id", "amount"], "where": "amount > 100",
+     "output": {"format": "parquet"}}
+
+The response body is the generated file; ``X-Rows`` and ``X-Cached`` give the
+row count and whether it came from the output cache. With ``output.path`` (an
+absolute path) the file is written there instead and the body is the job's
+JSON result. Errors are ``{"error": ...}`` with status 400 (bad request) or
+500. Requests run through :func:`~data_generators.runner.run_job`, so outputs
+are byte-identical to ``generate`` with the same arguments.
+
+Scenario generators share module-level Faker instances, so each worker takes
+one request at a time and ``workers`` bounds concurrency.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import http.client
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from .cache import OutputCache
+from .registry import SCENARIOS, get_scenario
+from .runner import build_job, run_job
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+#: Rows generated per scenario when a worker warms up.
+WARM_ROWS = 10
+#: Seconds between output cache prunes.
+PRUNE_INTERVAL = 60.0
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _warm(scenarios: tuple[str, ...]) -> None:
+    """Worker initializer: import and exercise ``scenarios`` once."""
+    with contextlib.suppress(ImportError):
+        import pyarrow.parquet  # optional; warms the Parquet writer
+    for name in scenarios:
+        spec = get_scenario(name)
+        spec.build_generator(spec.build_config(rows=WARM_ROWS)).generate_columns()
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _generate(
+    raw: Mapping[str, Any], cache: OutputCache | None
+) -> tuple[dict[str, Any], bytes | None]:
+    """Run one request in a worker: the job's result and the file's bytes."""
+    if not isinstance(raw, Mapping) or not raw.get("scenario"):
+        raise ValueError("request must be a JSON object with a scenario")
+    output = raw.get("output") or {}
+    if output.get("path"):
+        if not Path(output["path"]).is_absolute():
+            raise ValueError("output.path must be absolute")
+        return run_job(build_job(raw, Path.cwd(), None), cache), None
+    if raw.get("stats"):
+        raise ValueError("stats needs an output.path")
+    fmt = output.get("format") or "csv"
+    with tempfile.TemporaryDirectory(prefix="data_generators-") as tmp:
+        out = Path(tmp) / f"output.{fmt}"
+        raw = {**raw, "output": {"path": out, "format": fmt}}
+        job = build_job(raw, out.parent, None)
+        result = run_job(job, cache)
+        return result, job.out.read_bytes()
+
+
+class GenerationServer:
+    """Warm worker processes behind an HTTP server.
+
+    ``address`` is ``HOST:PORT`` (port 0 picks a free one) or the path of a
+    Unix socket. Call :meth:`warm` to start the workers up front, then
+    :meth:`serve_forever`; :meth:`close` stops the workers.
+    """
+
+    def __init__(
+        self,
+        address: str = f"{DEFAULT_HOST}:{DEFAULT_PORT}",
+        *,
+        workers: int | None = None,
+        cache: OutputCache | None = None,
+        preload: Iterable[str] | None = None,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._pruned = time.monotonic()
+        self._httpd = _bind(address)
+        self._httpd.generation_server = self  # type: ignore[attr-defined]
+        if isinstance(self._httpd, _UnixHTTPServer):
+            self.address = str(address)
+        else:
+            host, port = self._httpd.server_address[:2]
+            self.address = f"{host}:{port}"
+        preload = tuple(SCENARIOS if preload is None else preload)
+        self._pool = ProcessPoolExecutor(
+            self.workers, initializer=_warm, initargs=(preload,)
+        )
+
+    def warm(self) -> None:
+        """Start and warm every worker now rather than on first use."""
+        wait([self._pool.submit(_ready) for _ in range(self.workers)])
+
+    def generate(
+        self, raw: Mapping[str, Any]
+    ) -> tuple[dict[str, Any], bytes | None]:
+        """Serve one request on a worker (see :func:`_generate`)."""
+        result, data = self._pool.submit(_generate, raw, self.cache).result()
+        with self._lock:
+            self.requests += 1
+            prune = (
+                self.cache is not None
+                and not result["cached"]
+                and time.monotonic() - self._pruned > PRUNE_INTERVAL
+            )
+            if prune:
+                self._pruned = time.monotonic()
+        if prune:
+            self.cache.prune()
+        return result, data
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop :meth:`serve_forever` (from another thread)."""
+        self._httpd.shutdown()
+
+    def close(self) -> None:
+        self._httpd.server_close()
+        self._pool.shutdown(cancel_futures=True)
+        if isinstance(self._httpd, _UnixHTTPServer):
+            Path(self.address).unlink(missing_ok=True)
+
+    def __enter__(self) -> GenerationServer:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._json(404, {"error": f"not found: {self.path}"})
+            return
+        server: GenerationServer = self.server.generation_server  # type: ignore
+        self._json(
+            200,
+            {
+                "status": "ok",
+                "pid": os.getpid(),
+                "workers": server.workers,
+                "requests": server.requests,
+                "scenarios": list(SCENARIOS),
+            },
+        )
+
+    def do_POST(self) -> None:
+        if self.path != "/generate":
+            self._json(404, {"error": f"not found: {self.path}"})
+            return
+        server: GenerationServer = self.server.generation_server  # type: ignore
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            raw = json.loads(self.rfile.read(length) or b"{}")
+            result, data = server.generate(raw)
+        except (ValueError, TypeError, KeyError) as exc:
+            self._json(400, {"error": str(exc)})
+            return
+        except Exception as exc:
+            self._json(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        if data is None:
+            self._json(200, result)
+            return
+        fmt = (raw.get("output") or {}).get("format") or "csv"
+        self._send(
+            200,
+            data,
+            CONTENT_TYPES.get(fmt, "application/octet-stream"),
+            {"X-Rows": str(result["rows"]), "X-Cached": str(result["cached"])},
+        )
+
+    def _json(self, status: int, payload: Mapping[str, Any]) -> None:
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self._send(status, body, "application/json")
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        if isinstance(self.client_address, tuple):
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # one line per fixture would drown the console
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _is_unix(address: str) -> bool:
+    return os.sep in address or address.endswith(".sock")
+
+
+def _bind(address: str) -> ThreadingHTTPServer | _UnixHTTPServer:
+    if _is_unix(address):
+        path = Path(address)
+        if path.exists():
+            if _listening(path):
+                raise OSError(f"{address} is already being served")
+            path.unlink()  # left over from a daemon that did not shut down
+        return _UnixHTTPServer(str(path), _Handler)
+    host, _, port = address.rpartition(":")
+    return ThreadingHTTPServer((host or DEFAULT_HOST, int(port)), _Handler)
+
+
+def _listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float | None = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def request(
+    address: str, job: Mapping[str, Any], *, timeout: float | None = None
+) -> tuple[dict[str, Any], bytes | None]:
+    """Ask the daemon at ``address`` to run ``job``.
+
+    Returns the job's result and the file's bytes (``None`` when the job has
+    an ``output.path``). Raises ``ValueError`` for rejected requests and
+    ``RuntimeError`` when generation fails.
+    """
+    if _is_unix(address):
+        conn: http.client.HTTPConnection = _UnixConnection(address, timeout)
+    else:
+        host, _, port = address.rpartition(":")
+        conn = http.client.HTTPConnection(host or DEFAULT_HOST, int(port), timeout)
+    try:
+        conn.request(
+            "POST",
+            "/generate",
+            json.dumps(job, default=str),
+            {"Content-Type": "application/json"},
+        )
+        response = conn.getresponse()
+        body = response.read()
+    finally:
+        conn.close()
+    if response.status != 200:
+        error = json.loads(body)["error"]
+        raise (ValueError if response.status == 400 else RuntimeError)(error)
+    if response.getheader("Content-Type") == "application/json":
+        return json.loads(body), None
+    result = {
+        "rows": int(response.getheader("X-Rows")),
+        "cached": response.getheader("X-Cached") == "True",
+    }
+    return result, body
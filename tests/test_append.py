@@ -0,0 +1,43 @@
+import csv
+from datetime import date
+
+import pytest
+
+from data_generators.append import append
+from data_generators.scenarios.attendance.generator import AttendanceConfig
+from data_generators.scenarios.loan_applications.generator import (
+    LoanApplicationsConfig,
+)
+
+
+def _read(path):
+    with path.open(newline="") as fh:
+        return list(csv.DictReader(fh))
+
+
+def test_attendance_append_keeps_employee_departments(tmp_path):
+    config = AttendanceConfig(
+        start_date=date(2024, 1, 1), end_date=date(2024, 1, 31), num_employees=4
+    )
+    append(tmp_path, "attendance", config)
+    part = append(tmp_path, until="2024-02-02")
+
+    assert part["start"] == "2024-02-01"
+    first = {
+        r["employee_id"]: r["department"] for r in _read(tmp_path / "part-00000.csv")
+    }
+    second = _read(tmp_path / "part-00001.csv")
+    assert {r["date"] for r in second} <= {"2024-02-01", "2024-02-02"}
+    assert all(first[r["employee_id"]] == r["department"] for r in second)
+
+
+def test_loan_append_continues_id_sequence(tmp_path):
+    append(tmp_path, "loans", LoanApplicationsConfig(num_rows=30))
+    part = append(tmp_path, until="2025-02-15T18:00:00")
+
+    rows = _read(tmp_path / "part-00001.csv")
+    assert len(rows) == part["rows"] > 0
+    assert rows[0]["loan_id"] == "LN0031"
+
+    with pytest.raises(ValueError):
+        append(tmp_path, until="2025-02-01")
@@ -0,0 +1,29 @@
+import pytest
+
+from data_generators.scenarios.loan_applications.generator import (
+    LoanApplicationsGenerator,
+    LoanApplicationsConfig,
+)
+
+
+def test_numpy_backend_returns_arrays_per_column():
+    gen = LoanApplicationsGenerator(LoanApplicationsConfig(num_rows=20))
+    arrays = gen.generate(backend="numpy")
+    assert list(arrays) == list(LoanApplicationsGenerator.COLUMNS)
+    assert all(len(values) == 20 for values in arrays.values())
+
+
+@pytest.mark.parametrize(
+    "backend, module",
+    [("pandas", "pandas"), ("arrow", "pyarrow"), ("polars", "polars")],
+)
+def test_dataframe_backends_have_all_rows(backend, module):
+    pytest.importorskip(module)
+    gen = LoanApplicationsGenerator(LoanApplicationsConfig(num_rows=20))
+    table = gen.generate(backend=backend)
+    assert len(table) == 20
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        LoanApplicationsGenerator().generate(backend="excel")
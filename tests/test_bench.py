@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from data_generators.bench import compare, load_report, run_bench
+
+
+def test_bench_measures_each_case():
+    report = run_bench(["loans"], [200], ["csv", "numpy"])
+
+    assert [r["target"] for r in report["results"]] == ["csv", "numpy"]
+    csv_case = report["results"][0]
+    assert csv_case["rows"] == 200
+    assert csv_case["bytes"] > 0
+    assert csv_case["rows_per_second"] > 0
+
+
+def test_compare_flags_drops_beyond_threshold():
+    def report(rate):
+        case = {"scenario": "loans", "scale": 1000, "target": "csv"}
+        return {"results": [{**case, "rows_per_second": rate}]}
+
+    assert compare(report(95.0), report(100.0), threshold=0.10) == []
+    [regression] = compare(report(80.0), report(100.0), threshold=0.10)
+    assert regression["case"] == "loans/1000/csv"
+    assert regression["change"] == -0.2
+
+
+@pytest.mark.perf
+def test_throughput_against_baseline():
+    """Full suite: ``pytest -m perf``.
+
+    ``DATA_GENERATORS_BENCH_SCALES`` sets the scales (default 1e3,1e5) and
+    ``DATA_GENERATORS_BENCH_BASELINE`` points at a saved ``bench`` report.
+    """
+    scales = os.environ.get("DATA_GENERATORS_BENCH_SCALES", "1e3,1e5")
+    report = run_bench(scales=[int(float(s)) for s in scales.split(",")])
+    assert all(r["rows"] > 0 for r in report["results"])
+
+    baseline = os.environ.get("DATA_GENERATORS_BENCH_BASELINE")
+    if baseline:
+        assert compare(report, load_report(baseline)) == []
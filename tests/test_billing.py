@@ -0,0 +1,59 @@
+from collections import defaultdict
+
+import pytest
+
+from data_generators.scenarios.etl_billing.generator import (
+    METERS,
+    BillingConfig,
+    BillingGenerator,
+    BillingInvoicesGenerator,
+    tiered_charge,
+)
+
+CONFIG = BillingConfig(num_customers=40, events_per_meter_day=4.0)
+
+
+def test_invoice_lines_total_the_usage_events():
+    events = BillingGenerator(CONFIG).generate_columns()
+    usage = defaultdict(lambda: [0, 0.0])
+    for meter_id, time, quantity in zip(
+        events["meter_id"], events["event_time"], events["quantity"]
+    ):
+        line = usage[meter_id, time.date().replace(day=1)]
+        line[0] += 1
+        line[1] += quantity
+
+    invoices = BillingInvoicesGenerator(CONFIG).generate_columns()
+    lines = zip(
+        invoices["meter_id"],
+        invoices["billing_month"],
+        invoices["event_count"],
+        invoices["quantity"],
+    )
+    for meter_id, month, count, quantity in lines:
+        expected = usage.pop((meter_id, month), [0, 0.0])
+        assert count == expected[0]
+        assert quantity == pytest.approx(expected[1])
+    assert not usage
+
+
+def test_events_are_in_time_order_per_meter_month():
+    events = BillingGenerator(CONFIG).generate_columns()
+    last = {}
+    for meter_id, time in zip(events["meter_id"], events["event_time"]):
+        assert time >= last.get(meter_id, time)
+        last[meter_id] = time
+    assert len(set(events["event_id"])) == len(events["event_id"])
+
+
+def test_tiers_are_graduated():
+    tiers = METERS["data_transfer"][1]
+    assert tiered_charge(10, tiers) == 0
+    assert tiered_charge(110, tiers) == pytest.approx(9.0)
+    assert tiered_charge(20_240, tiers) == pytest.approx(10_230 * 0.09 + 500)
+
+
+def test_projection_keeps_event_values():
+    full = BillingGenerator(CONFIG).generate_columns()
+    quantities = BillingGenerator(CONFIG).project(["quantity"]).generate_columns()
+    assert quantities["quantity"] == full["quantity"]
@@ -0,0 +1,44 @@
+from data_generators.cache import OutputCache, cache_key
+from data_generators.runner import Job, run_job
+from data_generators.scenarios.spark_logs.generator import SparkLogsConfig
+
+
+def _job(tmp_path, name, num_rows=30):
+    return Job(
+        name=name,
+        scenario="spark_logs",
+        config=SparkLogsConfig(num_rows=num_rows),
+        out=tmp_path / f"{name}.csv",
+        format="csv",
+    )
+
+
+def test_identical_config_is_served_from_cache(tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+
+    first = run_job(_job(tmp_path, "first"), cache)
+    second = run_job(_job(tmp_path, "second"), cache)
+
+    assert not first["cached"]
+    assert second["cached"]
+    assert second["rows"] == 30
+    first_bytes = (tmp_path / "first.csv").read_bytes()
+    assert first_bytes == (tmp_path / "second.csv").read_bytes()
+
+
+def test_cache_key_depends_on_config_and_format():
+    base = cache_key("spark_logs", SparkLogsConfig(num_rows=30), "csv")
+    assert base != cache_key("spark_logs", SparkLogsConfig(num_rows=31), "csv")
+    assert base != cache_key("spark_logs", SparkLogsConfig(num_rows=30), "parquet")
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+    run_job(_job(tmp_path, "old", num_rows=10), cache)
+    run_job(_job(tmp_path, "new", num_rows=20), cache)
+    newest_size = (tmp_path / "new.csv").stat().st_size
+
+    evicted = cache.prune(max_size=newest_size)
+
+    assert len(evicted) == 1
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,61 @@
+from collections import Counter
+
+from data_generators.registry import get_scenario
+from data_generators.scenarios.customer_360.cdc import (
+    TRACKED,
+    Customer360CDCConfig,
+    Customer360CDCGenerator,
+    Customer360SCD2Generator,
+)
+from data_generators.scenarios.customer_360.generator import (
+    Customer360Config,
+    Customer360Generator,
+)
+
+CONFIG = dict(num_customers=2_000, num_periods=4)
+
+
+def _rows(columns):
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def test_cdc_emits_only_changes_in_time_order():
+    columns = Customer360CDCGenerator(Customer360CDCConfig(**CONFIG)).generate_columns()
+    assert Counter(columns["op"]) == {"U": 400, "I": 80, "D": 40}
+    assert columns["changed_at"] == sorted(columns["changed_at"])
+    for row in _rows(columns):
+        if row["op"] == "U":
+            assert row["full_name"] is None and row["income_annual"] is not None
+        elif row["op"] == "D":
+            assert row["income_annual"] is None
+        else:
+            assert row["full_name"] is not None
+            assert int(row["customer_id"][5:]) > CONFIG["num_customers"]
+
+
+def test_updates_start_from_the_customer_360_snapshot():
+    customers = Customer360Generator(Customer360Config(2_000)).generate_columns()
+    snapshot = {row["customer_id"]: row for row in _rows(customers)}
+    scd2 = Customer360SCD2Generator(Customer360CDCConfig(**CONFIG))
+    current = {}
+    for row in _rows(scd2.generate_columns()):
+        key = row["customer_id"]
+        if not row["is_current"]:
+            # a closed version is the snapshot or the version opened before
+            previous = current.pop(key, None) or snapshot[key]
+            assert all(row[name] == previous[name] for name in TRACKED)
+        else:
+            current[key] = row
+
+
+def test_periods_generate_independently():
+    config = Customer360CDCConfig(**CONFIG)
+    full = dict(Customer360SCD2Generator(config).iter_blocks())
+    assert Customer360SCD2Generator(config).generate_block(3) == full[3]
+
+
+def test_rows_plan_whole_periods():
+    spec = get_scenario("customer_360_cdc")
+    config = spec.build_config(rows=1_000, num_customers=5_000)
+    # 325 changes per period
+    assert config.num_periods == 4
@@ -0,0 +1,73 @@
+import pytest
+
+from data_generators.checkpoint import checkpoint_path, write_checkpointed
+from data_generators.scenarios.bank_transactions.generator import (
+    BankTransactionsConfig,
+    BankTransactionsGenerator,
+)
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _generator(fail_at=None):
+    gen = BankTransactionsGenerator(BankTransactionsConfig(num_rows=1000))
+    gen.BLOCK_SIZE = 100
+    if fail_at is not None:
+        generate_block = gen.generate_block
+
+        def failing(block):
+            if block == fail_at:
+                raise Interrupted
+            return generate_block(block)
+
+        gen.generate_block = failing
+    return gen
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_resumed_output_is_byte_identical(tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    expected = tmp_path / f"full.{fmt}"
+    resumed = tmp_path / f"resumed.{fmt}"
+
+    write_checkpointed(_generator(), expected, key="k", chunk_rows=250)
+
+    with pytest.raises(Interrupted):
+        write_checkpointed(_generator(fail_at=7), resumed, key="k", chunk_rows=250)
+    assert not resumed.exists()
+    assert checkpoint_path(resumed).exists()
+
+    rows = write_checkpointed(
+        _generator(), resumed, key="k", chunk_rows=250, resume=True
+    )
+
+    assert rows == 1000
+    assert resumed.read_bytes() == expected.read_bytes()
+    assert not checkpoint_path(resumed).exists()
+
+
+def test_resume_skips_finished_chunks(tmp_path):
+    out = tmp_path / "out.csv"
+    with pytest.raises(Interrupted):
+        write_checkpointed(_generator(fail_at=7), out, key="k", chunk_rows=250)
+
+    # blocks 0-5 are checkpointed; resuming must not regenerate them
+    write_checkpointed(
+        _generator(fail_at=0), out, key="k", chunk_rows=250, resume=True
+    )
+    assert out.exists()
+
+
+def test_stale_checkpoint_is_discarded(tmp_path):
+    out = tmp_path / "out.csv"
+    with pytest.raises(Interrupted):
+        write_checkpointed(_generator(fail_at=7), out, key="k", chunk_rows=250)
+
+    # a different config (key) starts over, so the failing block is hit again
+    with pytest.raises(Interrupted):
+        write_checkpointed(
+            _generator(fail_at=0), out, key="other", chunk_rows=250, resume=True
+        )
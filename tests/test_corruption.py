@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from data_generators.cache import cache_key
+from data_generators.core.corruption import CorruptionConfig, positions
+from data_generators.core.utils import num_rows
+from data_generators.registry import get_scenario
+from data_generators.runner import load_manifest, run_manifest
+
+ROWS = 20_000
+
+
+def _columns(name, corruption, rows=ROWS):
+    spec = get_scenario(name)
+    generator = spec.build_generator(spec.build_config(rows=rows))
+    return generator.corrupt(corruption).generate_columns()
+
+
+def test_positions_hit_at_the_rate():
+    hits = positions(random.Random(1), 1_000_000, 0.01)
+    assert hits == sorted(set(hits))
+    assert 9_500 < len(hits) < 10_500
+    assert positions(random.Random(1), 10, 0.0) == []
+    assert positions(random.Random(1), 10, 1.0) == list(range(10))
+
+
+def test_issues_are_injected_at_their_rates():
+    clean = _columns("bank_transactions", None)
+    dirty = _columns(
+        "bank_transactions",
+        CorruptionConfig(
+            nulls={"merchant": 0.05},
+            late=0.02,
+            outliers={"amount": 0.01},
+            malformed={"location": 0.01},
+            type_drift={"is_fraud": 0.01},
+        ),
+    )
+    assert num_rows(dirty) == ROWS
+    assert 0.04 < dirty["merchant"].count(None) / num_rows(dirty) < 0.06
+    late = sum(a > b for a, b in zip(clean["timestamp"], dirty["timestamp"]))
+    assert 300 < late < 500 and all(
+        a >= b for a, b in zip(clean["timestamp"], dirty["timestamp"])
+    )
+    assert sum(a != b for a, b in zip(clean["amount"], dirty["amount"])) > 100
+    assert sum(a != b for a, b in zip(clean["location"], dirty["location"])) > 100
+    assert all(isinstance(value, str) for value in dirty["is_fraud"])
+    assert {"0", "1"} < set(dirty["is_fraud"])
+
+
+def test_duplicates_are_appended_to_their_block():
+    dirty = _columns("bank_transactions", CorruptionConfig(duplicates=0.01))
+    assert 100 < num_rows(dirty) - ROWS < 300
+    assert len(set(dirty["transaction_id"])) == ROWS
+    # every repeated ID is a full copy of its row
+    rows = set(zip(*dirty.values()))
+    assert len(rows) == ROWS
+
+
+def test_corruption_is_reproducible_and_blockwise():
+    corruption = CorruptionConfig(nulls={"message": 0.1}, duplicates=0.05)
+    first = _columns("spark_logs", corruption)
+    assert _columns("spark_logs", corruption) == first
+    other = _columns("spark_logs", CorruptionConfig(nulls={"message": 0.1}, seed=1))
+    assert other["message"] != first["message"][: num_rows(other)]
+
+
+def test_invalid_specs_are_rejected():
+    with pytest.raises(ValueError, match="nope"):
+        _columns("spark_logs", CorruptionConfig(nulls={"nope": 0.1}))
+    with pytest.raises(ValueError, match=r"\[0, 1\]"):
+        _columns("spark_logs", CorruptionConfig(duplicates=2.0))
+    with pytest.raises(ValueError, match="late_column"):
+        _columns("customer_360", CorruptionConfig(late=0.1))
+    with pytest.raises(ValueError, match="type_drift"):
+        _columns("spark_logs", CorruptionConfig(malformed={"task_id": 0.5}))
+
+
+def test_manifest_corrupt_block(tmp_path):
+    manifest = tmp_path / "manifest.yml"
+    manifest.write_text(
+        f"""
+default_output_dir: {tmp_path}
+budget: {{cpus: 1}}
+jobs:
+  - name: dirty
+    scenario: loans
+    rows: 2000
+    corrupt:
+      nulls: {{branch: 0.5}}
+      duplicates: 0.1
+    output: {{path: {tmp_path}/dirty.csv}}
+""",
+        encoding="utf-8",
+    )
+    loaded = load_manifest(manifest)
+    job = loaded.jobs[0]
+    assert job.corrupt.nulls == {"branch": 0.5}
+    assert cache_key("loans", job.config, "csv") != cache_key(
+        "loans", job.config, "csv", corrupt=job.corrupt
+    )
+    report = run_manifest(loaded)
+    assert report["jobs"][0]["rows"] > 2_000
@@ -0,0 +1,107 @@
+import random
+import time
+from collections import Counter
+
+import pytest
+
+from data_generators.core.distributions import (
+    HotKeySampler,
+    UniformSampler,
+    ZipfSampler,
+    key_sampler,
+)
+from data_generators.scenarios.bank_transactions.generator import (
+    BankTransactionsConfig,
+    BankTransactionsGenerator,
+)
+from data_generators.scenarios.credit_card_spend.generator import (
+    CreditCardSpendConfig,
+    CreditCardSpendGenerator,
+)
+from data_generators.scenarios.spark_logs.generator import (
+    SparkLogsConfig,
+    SparkLogsGenerator,
+)
+
+
+def test_zipf_follows_the_power_law():
+    counts = Counter(ZipfSampler(1000, 1.0).samples(random.Random(1), 200_000))
+    assert min(counts) == 1 and max(counts) <= 1000
+    # P(1) / P(k) == k ** s
+    assert counts[1] / counts[2] == pytest.approx(2.0, rel=0.05)
+    assert counts[1] / counts[10] == pytest.approx(10.0, rel=0.1)
+
+
+def test_hot_keys_take_their_row_share():
+    sampler = HotKeySampler(10_000, 0.01, 0.8)
+    draws = sampler.samples(random.Random(2), 100_000)
+    hot = sum(rank <= 100 for rank in draws) / len(draws)
+    assert hot == pytest.approx(0.8, abs=0.01)
+    assert max(draws) <= 10_000
+
+
+def test_draws_are_constant_time_in_the_key_space():
+    rng = random.Random(3)
+    ZipfSampler(10**9, 1.1).samples(rng, 10)
+    start = time.perf_counter()
+    draws = ZipfSampler(10**9, 1.1).samples(rng, 20_000)
+    assert time.perf_counter() - start < 1.0
+    assert 1 <= min(draws) and max(draws) <= 10**9
+
+
+def test_specs_are_parsed():
+    assert key_sampler(None, 10) is None
+    assert isinstance(key_sampler("uniform", 10), UniformSampler)
+    assert key_sampler("zipf:1.5", 10).s == 1.5
+    assert key_sampler("hot:0.1:0.9", 10).hot == 1
+    for bad in ("zipf", "zipf:0", "zipf:x", "hot:0.1", "hot:2:0.5", "pareto:1"):
+        with pytest.raises(ValueError, match="key distribution"):
+            key_sampler(bad, 10)
+
+
+def test_skewed_scenario_keys():
+    config = BankTransactionsConfig(
+        num_rows=20_000, customer_skew="hot:0.001:0.5", merchant_skew="zipf:2"
+    )
+    columns = BankTransactionsGenerator(config).generate_columns()
+    customers = Counter(columns["customer_id"])
+    hot = sum(n for _, n in customers.most_common(90))
+    assert hot / 20_000 == pytest.approx(0.5, abs=0.02)
+    assert all(10_000 <= int(c[5:]) <= 99_999 for c in customers)
+    walmart = sum(
+        merchant == "Walmart"
+        for merchant, category in zip(
+            columns["merchant"], columns["merchant_category"]
+        )
+        if category == "grocery"
+    )
+    assert walmart / columns["merchant_category"].count("grocery") > 0.6
+
+    cards = CreditCardSpendConfig(num_rows=5000, customer_skew="zipf:1.2")
+    top = Counter(
+        CreditCardSpendGenerator(cards).generate_columns()["customer_id"]
+    ).most_common(1)
+    assert top[0] == ("CUST-10000", top[0][1]) and top[0][1] > 500
+
+    logs = SparkLogsGenerator(
+        SparkLogsConfig(num_jobs=200, app_skew="zipf:1.5", num_apps=50)
+    ).generate_columns()
+    apps = {}
+    for job_id, app_id in zip(logs["job_id"], logs["app_id"]):
+        assert apps.setdefault(job_id, app_id) == app_id
+    assert len(set(apps.values())) < 50
+
+
+def test_skew_is_not_combined_with_key_index():
+    with pytest.raises(ValueError, match="customer_keys"):
+        BankTransactionsGenerator(
+            BankTransactionsConfig(customer_keys="keys", customer_skew="zipf:1")
+        )
+
+
+def test_skewed_ledger_keeps_balances_in_range():
+    config = BankTransactionsConfig(
+        num_rows=5000, ledger=True, customer_skew="zipf:1.1"
+    )
+    columns = BankTransactionsGenerator(config).generate_columns()
+    assert len(columns["closing_balance"]) == 5000
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from data_generators.cache import cache_key
+from data_generators.core.expressions import Expression
+from data_generators.core.utils import num_rows
+from data_generators.dsl import compile_scenario
+from data_generators.registry import get_scenario
+from data_generators.runner import load_manifest, run_manifest
+
+TEMPLATE = (
+    Path(__file__).resolve().parents[1]
+    / "templates"
+    / "scenarios"
+    / "scenario_template.yml"
+)
+
+
+def _orders(rows=5000, **overrides):
+    spec = get_scenario(str(TEMPLATE))
+    return spec.build_generator(spec.build_config(rows=rows, **overrides))
+
+
+def test_template_fans_out_entities_into_rows():
+    columns = _orders().generate_columns()
+    assert num_rows(columns) == 5000
+    orders = {}
+    for row in zip(
+        columns["order_id"],
+        columns["line_no"],
+        columns["customer_id"],
+        columns["ordered_at"],
+        columns["channel"],
+        columns["shipped_at"],
+    ):
+        order_id, line_no, customer_id, ordered_at, channel, shipped_at = row
+        first = orders.setdefault(order_id, (customer_id, ordered_at, channel))
+        assert (customer_id, ordered_at, channel) == first
+        assert line_no == 1 or orders[order_id + "#"] == line_no - 1
+        orders[order_id + "#"] = line_no
+        limit = timedelta(days=3 if channel == "store" else 5)
+        assert ordered_at <= shipped_at <= ordered_at + limit
+    for amount, priority in zip(columns["amount"], columns["priority"]):
+        assert (amount > 500) <= (priority == "high")
+
+
+def test_projection_and_blocks_keep_values():
+    full = _orders(20_000).generate_columns()
+    amounts = _orders(20_000).project(["amount"]).generate_columns()
+    assert amounts["amount"] == full["amount"]
+    generator = _orders(20_000)
+    assert generator.generate_block(1) == _orders(20_000).generate_block(1)
+
+
+def test_params_are_overridable():
+    base = _orders().generate_columns()
+    discounted = _orders(params={"discount_rate": 0.5}).generate_columns()
+    assert discounted["unit_price"] == base["unit_price"]
+    assert sum(discounted["amount"]) < sum(base["amount"]) * 0.6
+    with pytest.raises(ValueError, match="nope"):
+        _orders(params={"nope": 1})
+
+
+def test_fields_are_computed_in_dependency_order():
+    spec = compile_scenario(
+        {
+            "entities": 100,
+            "fields": {
+                "total": {"expr": "price * 2"},
+                "price": {"uniform": [1, 10], "round": 2},
+                "band": {
+                    "cases": [
+                        {"when": "total > 15", "value": "high"},
+                        {"when": "total > 5", "expr": "'mid-' + str(round(total))"},
+                    ]
+                },
+                "flag": {"bernoulli": "1.0 if total > 15 else 0.0"},
+                "currency": "USD",
+            },
+        },
+        "inline",
+    )
+    columns = spec.build_generator(spec.build_config()).generate_columns()
+    assert num_rows(columns) == 100
+    for price, total, band, flag in zip(
+        columns["price"], columns["total"], columns["band"], columns["flag"]
+    ):
+        assert total == pytest.approx(price * 2)
+        if total > 15:
+            assert band == "high" and flag == 1
+        elif total > 5:
+            assert band.startswith("mid-") and flag == 0
+        else:
+            assert band is None
+    assert set(columns["currency"]) == {"USD"}
+
+
+@pytest.mark.parametrize(
+    "fields, message",
+    [
+        ({"a": {"expr": "b"}, "b": {"expr": "a"}}, "circular"),
+        ({"a": {"expr": "missing + 1"}}, "unknown missing"),
+        ({"a": {"uniform": 1}}, "invalid uniform"),
+        ({"a": {"uniform": [0, 1], "poisson": 1}}, "exactly one"),
+        ({"a": {"expr": "a.b"}}, "unsupported"),
+        ({"a": {"poisson": 1}, "b": {"expr": "a", "per": "entity"}}, "row values"),
+    ],
+)
+def test_invalid_scenarios_are_rejected(fields, message):
+    with pytest.raises(ValueError, match=message):
+        compile_scenario(
+            {"rows_per_entity": 2, "fields": fields},
+            "inline",
+        )
+
+
+def test_expressions_are_vectorized():
+    env = {"a": np.array([1.0, 5.0, 20.0]), "s": np.array(["x", "y", "z"])}
+    assert Expression("1 < a <= 5").evaluate(env, 3).tolist() == [False, True, False]
+    assert Expression("s in ('x', 'z')").evaluate(env, 3).tolist() == [
+        True,
+        False,
+        True,
+    ]
+    assert Expression("s + '-' + str(round(a))").evaluate(env, 3).tolist() == [
+        "x-1",
+        "y-5",
+        "z-20",
+    ]
+    assert Expression("3").evaluate(env, 3).tolist() == [3, 3, 3]
+
+
+def test_manifest_jobs_run_scenario_files(tmp_path):
+    scenario = tmp_path / "orders.yml"
+    scenario.write_text(TEMPLATE.read_text(encoding="utf-8"), encoding="utf-8")
+    manifest = tmp_path / "manifest.yml"
+    manifest.write_text(
+        f"""
+default_output_dir: {tmp_path}/out
+budget: {{cpus: 1}}
+jobs:
+  - scenario: orders.yml
+    rows: 1000
+    where: "channel == 'web'"
+""",
+        encoding="utf-8",
+    )
+    loaded = load_manifest(manifest)
+    job = loaded.jobs[0]
+    assert job.name == "orders"
+    key = cache_key(job.scenario, job.config, "csv")
+    scenario.write_text(
+        scenario.read_text(encoding="utf-8").replace("seed: 7", "seed: 8"),
+        encoding="utf-8",
+    )
+    assert cache_key(job.scenario, job.config, "csv") != key
+    report = run_manifest(loaded)
+    assert 0 < report["jobs"][0]["rows"] < 1000
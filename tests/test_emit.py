@@ -0,0 +1,108 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from data_generators.emit import RateProfile, open_sink, stream_events
+from data_generators.registry import get_scenario
+
+
+def _generator(name, rows):
+    spec = get_scenario(name)
+    return spec.build_generator(spec.build_config(rows=rows))
+
+
+def test_rate_profile_ramps_and_bursts():
+    profile = RateProfile(1000, ramp_seconds=2, burst_factor=5, burst_every=10)
+    assert profile.rate_at(0.5) == pytest.approx(250 * 5)
+    assert profile.rate_at(1.5) == pytest.approx(750)
+    assert profile.rate_at(5.0) == 1000
+    assert profile.rate_at(10.5) == 5000
+    with pytest.raises(ValueError):
+        RateProfile(0)
+
+
+async def _serve(handle):
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_emit_paces_events_to_a_tcp_consumer():
+    received = bytearray()
+
+    async def handle(reader, writer):
+        while data := await reader.read(1 << 16):
+            received.extend(data)
+
+    async def run():
+        server, port = await _serve(handle)
+        sink = await open_sink(f"tcp://127.0.0.1:{port}")
+        result = await stream_events(
+            _generator("spark_logs", 6_000), sink, RateProfile(20_000)
+        )
+        await sink.close()
+        await asyncio.sleep(0.05)
+        server.close()
+        return result
+
+    result = asyncio.run(run())
+    lines = received.decode().splitlines()
+    assert result["events"] == len(lines) == 6_000
+    assert json.loads(lines[0])["app_id"] == "app-0001"
+    # Paced: never faster than the target (a busy machine is only slower)
+    assert result["events_per_second"] < 21_000
+
+
+def test_slow_consumer_holds_back_the_stream():
+    async def handle(reader, writer):
+        while await reader.read(4096):
+            await asyncio.sleep(0.01)
+
+    async def run():
+        server, port = await _serve(handle)
+        sink = await open_sink(f"tcp://127.0.0.1:{port}")
+        generator = _generator("spark_logs", 10**6)
+        started = time.perf_counter()
+        result = await stream_events(generator, sink, RateProfile(10**6), duration=1)
+        elapsed = time.perf_counter() - started
+        sink.writer.transport.abort()
+        server.close()
+        return result, elapsed
+
+    result, elapsed = asyncio.run(run())
+    # ~400 KB/s drained: far below the target, and nothing piles up in memory
+    assert result["events"] < 100_000
+    assert result["max_lag_seconds"] > 0.5
+    # A send blocked on the consumer does not hold the stream past duration
+    assert 1.0 <= elapsed < 2.0
+
+
+def test_emit_posts_realtime_events_over_http():
+    bodies = []
+
+    async def handle(reader, writer):
+        while request := await reader.readuntil(b"\r\n\r\n"):
+            length = int(request.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            bodies.append(await reader.readexactly(length))
+            writer.write(b"HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+
+    async def run():
+        server, port = await _serve(handle)
+        sink = await open_sink(f"http://127.0.0.1:{port}/events")
+        result = await stream_events(
+            _generator("bank_transactions", 500), sink, realtime=True
+        )
+        await sink.close()
+        server.close()
+        return result
+
+    started = datetime.now(timezone.utc)
+    result = asyncio.run(run())
+    events = [json.loads(line) for body in bodies for line in body.splitlines()]
+    assert result["events"] == len(events) == 500
+    stamps = [datetime.fromisoformat(event["timestamp"]) for event in events]
+    assert stamps == sorted(stamps)
+    assert started <= stamps[0] and stamps[-1] - started < timedelta(seconds=30)
@@ -0,0 +1,44 @@
+from datetime import date
+
+from data_generators.explain import explain, load_calibration, record_calibration
+from data_generators.registry import get_scenario
+from data_generators.scenarios.attendance.generator import AttendanceConfig
+
+
+def test_expected_rows_track_generated_rows():
+    for name in ("attendance", "spark_logs", "loan_repayments"):
+        spec = get_scenario(name)
+        generator = spec.build_generator(spec.build_config(rows=20_000))
+        generated = len(generator.generate_columns()[spec.generator_cls.COLUMNS[0]])
+        assert abs(generator.expected_rows() - generated) / generated < 0.05
+
+
+def test_attendance_expected_rows_counts_weekdays():
+    # 2024-01-01 is a Monday: one full week
+    config = AttendanceConfig(
+        num_employees=2, start_date=date(2024, 1, 1), end_date=date(2024, 1, 7)
+    )
+    assert explain("attendance", config, "csv")["rows"] == round(2 * (5 + 2 * 0.05))
+
+
+def test_explain_uses_recorded_calibration(tmp_path):
+    path = tmp_path / "calibration.json"
+    report = {
+        "results": [
+            {
+                "scenario": "loans",
+                "target": "csv",
+                "rows": 1000,
+                "bytes": 50_000,
+                "rows_per_second": 10_000.0,
+            }
+        ]
+    }
+    record_calibration(report, path)
+
+    config = get_scenario("loans").build_config(rows=200_000)
+    estimate = explain("loans", config, "csv", load_calibration(path))
+    assert estimate["rows"] == 200_000
+    assert estimate["bytes"] == 10_000_000
+    assert estimate["seconds"] == 20.0
+    assert explain("loans", config, "parquet", load_calibration(path))["bytes"] is None
@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from data_generators.core.ids import FeistelPermutation, IdFormat
+from data_generators.scenarios.credit_card_spend.generator import (
+    CreditCardSpendConfig,
+    CreditCardSpendGenerator,
+)
+from data_generators.scenarios.loan_applications.generator import (
+    LoanApplicationsConfig,
+    LoanApplicationsGenerator,
+)
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1000, 65_539])
+def test_permutation_is_a_bijection(size):
+    permutation = FeistelPermutation(size, key=11)
+    numbers = np.arange(size)
+    images = permutation.permute(numbers)
+    assert sorted(images.tolist()) == numbers.tolist()
+    assert permutation.inverse(images).tolist() == numbers.tolist()
+
+
+def test_permutation_is_keyed_and_blockwise():
+    numbers = np.arange(100_000)
+    images = FeistelPermutation(10**9, key=1).permute(numbers)
+    assert len(np.unique(images)) == len(numbers)
+    assert abs(np.corrcoef(numbers, images)[0, 1]) < 0.01
+    other = FeistelPermutation(10**9, key=2).permute(numbers)
+    assert (images != other).mean() > 0.99
+    # Any slice (block, shard) computes its IDs alone
+    assert FeistelPermutation(10**9, key=1).permute(numbers[500:700]).tolist() == (
+        images[500:700].tolist()
+    )
+    with pytest.raises(ValueError, match="below"):
+        FeistelPermutation(10, key=1).permute([10])
+
+
+def test_ids_are_fixed_width():
+    ids = IdFormat("CARD-", 900_000, key=5, offset=100_000).format(range(1000))
+    assert len(set(ids)) == 1000
+    assert {len(i) for i in ids} == {11}
+    assert IdFormat("LN", 12_000, offset=1).format([0, 11_999]) == [
+        "LN00001",
+        "LN12000",
+    ]
+
+
+def test_cards_belong_to_one_holder():
+    config = CreditCardSpendConfig(num_rows=20_000, customer_key_space=2_000)
+    columns = CreditCardSpendGenerator(config).generate_columns()
+    cards = {}
+    for customer, card in zip(columns["customer_id"], columns["card_id"]):
+        assert cards.setdefault(customer, card) == card
+    assert len(set(cards.values())) == len(cards)
+    projected = (
+        CreditCardSpendGenerator(config).project(["card_id"]).generate_columns()
+    )
+    assert projected["card_id"] == columns["card_id"]
+
+
+def test_cards_follow_holders_fixed_by_where():
+    config = CreditCardSpendConfig(num_rows=50)
+    generator = CreditCardSpendGenerator(config).where(
+        "customer_id == 'CUST-57228'"
+    )
+    columns = generator.generate_columns()
+    assert len(columns["card_id"]) == len(columns["customer_id"]) == 50
+    assert set(columns["card_id"]) == set(generator.card_ids.format([47_228]))
+
+
+def test_wide_customer_spaces_keep_fixed_width():
+    config = CreditCardSpendConfig(num_rows=2000, customer_key_space=5_000_000)
+    columns = CreditCardSpendGenerator(config).generate_columns()
+    assert {len(c) for c in columns["customer_id"]} == {12}
+    assert {len(c) for c in columns["card_id"]} == {12}
+
+
+def test_appended_loan_windows_keep_one_width():
+    base = LoanApplicationsConfig(num_rows=9_990)
+    window = LoanApplicationsGenerator.window_config(
+        base,
+        base.end_datetime,
+        base.end_datetime + timedelta(days=30),
+        rows_before=9_990,
+    )
+    assert window.num_rows > 10
+    first = LoanApplicationsGenerator(base).generate_columns()["loan_id"]
+    later = LoanApplicationsGenerator(window).generate_columns()["loan_id"]
+    assert first[-1] == "LN9990" and later[0] == "LN9991"
+    assert {len(i) for i in first + later[:9]} == {6}
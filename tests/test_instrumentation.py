@@ -0,0 +1,23 @@
+from data_generators.core.instrumentation import Metrics
+from data_generators.scenarios.customer_360.generator import (
+    Customer360Config,
+    Customer360Generator,
+)
+
+
+def test_instrumented_generator_times_stages_and_notifies_observers():
+    events = []
+    gen = Customer360Generator(Customer360Config(num_customers=50))
+    metrics = gen.instrument(Metrics(observers=[events.append]))
+
+    columns = gen.generate_columns()
+
+    summary = metrics.summary()
+    assert set(summary["stages"]) == {"generate", "faker"}
+    assert summary["counters"] == {"blocks": 1, "rows": 50}
+    assert {"event": "block", "block": 0, "rows": 50} in events
+    assert "generate" in metrics.format()
+
+    plain = Customer360Generator(Customer360Config(num_customers=50))
+    assert plain.metrics is None
+    assert plain.generate_columns() == columns
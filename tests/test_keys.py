@@ -0,0 +1,108 @@
+import csv
+
+import pytest
+
+from data_generators.cache import cache_key
+from data_generators.keys import build_key_index
+from data_generators.registry import get_scenario
+from data_generators.runner import load_manifest, run_manifest
+from data_generators.scenarios.customer_360.generator import Customer360Config
+
+
+def _columns(name, rows, keys):
+    spec = get_scenario(name)
+    config = spec.build_config(rows=rows, customer_keys=str(keys))
+    return spec.build_generator(config).generate_columns()
+
+
+def test_key_index_matches_the_customer_dimension(tmp_path):
+    config = Customer360Config(num_customers=3_000)
+    index = build_key_index(config, tmp_path / "keys")
+    customers = get_scenario("customer_360").build_generator(config)
+    segments = customers.generate_columns()["risk_segment"]
+    assert [index.segment(number) for number in range(1, 3_001)] == segments
+    assert build_key_index(config, tmp_path / "keys").digest == index.digest
+
+
+def test_fact_tables_reference_the_shared_customers(tmp_path):
+    index = build_key_index(Customer360Config(num_customers=2_000), tmp_path)
+    customers = {index.customer_id(number) for number in range(1, 2_001)}
+
+    bank = _columns("bank_transactions", 5_000, tmp_path)
+    cards = _columns("credit_card_spend", 5_000, tmp_path)
+    assert set(bank["customer_id"]) <= customers
+    assert set(cards["customer_id"]) <= customers
+
+    loans = _columns("loans", 300, tmp_path)
+    repayments = _columns("loan_repayments", 3_000, tmp_path)
+    owners = dict(zip(loans["loan_id"], loans["customer_id"]))
+    assert all(
+        owners[loan] == customer
+        for loan, customer in zip(repayments["loan_id"], repayments["customer_id"])
+    )
+
+
+def test_linked_loan_ids_keep_one_width(tmp_path):
+    build_key_index(Customer360Config(num_customers=2_000), tmp_path)
+    loans = _columns("loans", 12_000, tmp_path)
+    spec = get_scenario("loan_repayments")
+    for num_loans in (50, 12_000):
+        config = spec.build_config(
+            rows=2_000, customer_keys=str(tmp_path), num_loans=num_loans
+        )
+        repayments = spec.build_generator(config).generate_columns()
+        assert set(repayments["loan_id"]) <= set(loans["loan_id"])
+    assert loans["loan_id"][0] == "LN00001" and loans["loan_id"][-1] == "LN12000"
+    assert {len(i) for i in loans["loan_id"] + repayments["loan_id"]} == {7}
+
+    # Loan 100,000 would need a sixth digit: refuse rather than widen
+    loans_spec = get_scenario("loans")
+    config = loans_spec.build_config(rows=100_000, customer_keys=str(tmp_path))
+    with pytest.raises(ValueError, match="id_width"):
+        loans_spec.build_generator(config)
+
+
+def test_riskier_segments_commit_more_fraud(tmp_path):
+    index = build_key_index(Customer360Config(num_customers=2_000), tmp_path)
+    bank = _columns("bank_transactions", 20_000, tmp_path)
+    fraud = {"LOW": [], "HIGH": []}
+    for customer, is_fraud in zip(bank["customer_id"], bank["is_fraud"]):
+        fraud.setdefault(index.segment_of(customer), []).append(is_fraud)
+    rate = {segment: sum(flags) / len(flags) for segment, flags in fraud.items()}
+    assert rate["HIGH"] > 2 * rate["LOW"]
+
+
+def test_cache_key_follows_the_index_contents(tmp_path):
+    spec = get_scenario("bank_transactions")
+    config = spec.build_config(rows=10, customer_keys=str(tmp_path))
+    build_key_index(Customer360Config(num_customers=10), tmp_path)
+    before = cache_key(spec.name, config, "csv")
+    build_key_index(Customer360Config(num_customers=20), tmp_path)
+    assert cache_key(spec.name, config, "csv") != before
+
+
+def test_manifest_builds_one_key_index_for_all_jobs(tmp_path):
+    manifest_path = tmp_path / "manifest.yml"
+    manifest_path.write_text(
+        f"""
+default_output_dir: {tmp_path}
+customers: customers
+budget:
+  cpus: 2
+jobs:
+  - name: customers
+    scenario: customer_360
+    rows: 200
+  - scenario: credit_card_spend
+    rows: 500
+"""
+    )
+    manifest = load_manifest(manifest_path)
+    assert manifest.jobs[1].config.customer_keys == str(manifest.key_index)
+
+    report = run_manifest(manifest)
+    assert report["jobs_failed"] == 0
+    with open(tmp_path / "customers.csv", newline="") as fh:
+        customers = {row["customer_id"] for row in csv.DictReader(fh)}
+    with open(tmp_path / "credit_card_spend.csv", newline="") as fh:
+        assert {row["customer_id"] for row in csv.DictReader(fh)} <= customers
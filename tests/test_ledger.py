@@ -0,0 +1,78 @@
+import pytest
+
+from data_generators.checkpoint import write_checkpointed
+from data_generators.keys import build_key_index
+from data_generators.scenarios.bank_transactions.generator import (
+    BankTransactionsConfig,
+    BankTransactionsGenerator,
+)
+from data_generators.scenarios.customer_360.generator import Customer360Config
+
+
+def _ledger(**overrides):
+    config = BankTransactionsConfig(num_rows=12_000, ledger=True, **overrides)
+    return BankTransactionsGenerator(config)
+
+
+def test_balances_chain_per_account(tmp_path):
+    # few accounts, so each has a long history across blocks
+    build_key_index(Customer360Config(num_customers=50), tmp_path)
+    columns = _ledger(customer_keys=str(tmp_path)).generate_columns()
+    assert columns["timestamp"] == sorted(columns["timestamp"])
+    last = {}
+    rows = zip(
+        columns["customer_id"],
+        columns["amount"],
+        columns["transaction_type"],
+        columns["opening_balance"],
+        columns["closing_balance"],
+        columns["running_total"],
+        columns["is_overdraft"],
+    )
+    for customer, amount, kind, opening, closing, total, overdraft in rows:
+        if customer in last:
+            assert opening == last[customer][0]
+            start = last[customer][1]
+        else:
+            start = opening
+        signed = amount if kind == "credit" else -amount
+        assert closing == pytest.approx(opening + signed)
+        assert total == pytest.approx(closing - start)
+        assert overdraft == (closing < 0)
+        last[customer] = closing, start
+
+
+def test_blocks_carry_balances_when_generated_out_of_order():
+    full = dict(_ledger().iter_blocks())
+    generator = _ledger()
+    assert generator.generate_block(2) == full[2]
+    assert generator.generate_block(1) == full[1]
+
+
+def test_resumed_ledger_is_identical(tmp_path):
+    whole = tmp_path / "whole.csv"
+    write_checkpointed(_ledger(), whole, key="k", chunk_rows=4096)
+    part = tmp_path / "part.csv"
+
+    class Interrupt(Exception):
+        pass
+
+    generator = _ledger()
+    blocks = generator.iter_blocks
+
+    def failing(start_block=0, rows_before=0):
+        for block, columns in blocks(start_block, rows_before):
+            if block == 2:
+                raise Interrupt
+            yield block, columns
+
+    generator.iter_blocks = failing
+    with pytest.raises(Interrupt):
+        write_checkpointed(generator, part, key="k", chunk_rows=4096)
+    write_checkpointed(_ledger(), part, key="k", chunk_rows=4096, resume=True)
+    assert part.read_bytes() == whole.read_bytes()
+
+
+def test_ledger_rejects_where():
+    with pytest.raises(ValueError, match="where"):
+        _ledger().where("amount > 100").generate_columns()
@@ -0,0 +1,64 @@
+import pytest
+
+from data_generators import memory
+from data_generators.checkpoint import write_checkpointed
+from data_generators.memory import MemoryBudget
+from data_generators.scenarios.bank_transactions.generator import (
+    BankTransactionsConfig,
+    BankTransactionsGenerator,
+)
+
+MB = 1 << 20
+
+
+def _generator():
+    gen = BankTransactionsGenerator(BankTransactionsConfig(num_rows=2000))
+    gen.BLOCK_SIZE = 100
+    return gen.project(["transaction_id", "amount", "is_fraud"])
+
+
+def _fake_rss(monkeypatch, values):
+    readings = iter(values)
+    last = [0]
+
+    def rss():
+        last[0] = next(readings, last[0])
+        return last[0]
+
+    monkeypatch.setattr(memory, "current_rss", rss)
+
+
+def test_chunks_are_sized_from_the_pilot_block(monkeypatch):
+    _fake_rss(monkeypatch, [100 * MB])
+    budget = MemoryBudget(101 * MB)
+    blocks = budget.plan(_generator().iter_blocks(), "csv")
+    assert budget.bytes_per_row > 0
+    assert budget.chunk_rows == int(MB * memory.CHUNK_SHARE / budget.bytes_per_row)
+    # the measured block is still produced
+    assert next(blocks)[0] == 0
+
+
+def test_chunks_shrink_when_rss_drifts_up(monkeypatch):
+    _fake_rss(monkeypatch, [100 * MB, 100 * MB, 150 * MB])
+    budget = MemoryBudget(200 * MB)
+    budget.plan(_generator().iter_blocks(), "csv")
+    planned = budget.chunk_rows
+    assert budget.observe() < planned
+    assert budget.report()["chunk_rows"] == planned
+
+
+def test_budget_below_usage_is_rejected(monkeypatch):
+    _fake_rss(monkeypatch, [300 * MB])
+    with pytest.raises(ValueError, match="below"):
+        MemoryBudget(200 * MB).plan(_generator().iter_blocks(), "csv")
+
+
+def test_budgeted_output_matches_fixed_chunks(tmp_path, monkeypatch):
+    _fake_rss(monkeypatch, [100 * MB])
+    fixed = tmp_path / "fixed.csv"
+    budgeted = tmp_path / "budgeted.csv"
+    write_checkpointed(_generator(), fixed, key="k")
+    budget = MemoryBudget(100 * MB + 20_000)
+    write_checkpointed(_generator(), budgeted, key="k", budget=budget)
+    assert budget.report()["chunk_rows"] < 2000
+    assert fixed.read_bytes() == budgeted.read_bytes()
@@ -0,0 +1,44 @@
+import pytest
+
+from data_generators.registry import get_scenario
+
+ORDERED = [
+    ("bank_transactions", "timestamp"),
+    ("credit_card_spend", "txn_timestamp"),
+    ("loans", "created_at"),
+]
+
+
+def _generator(name, rows=10_000, **overrides):
+    spec = get_scenario(name)
+    return spec.build_generator(spec.build_config(rows=rows, **overrides))
+
+
+@pytest.mark.parametrize("name,column", ORDERED)
+def test_ordered_output_is_sorted(name, column):
+    values = _generator(name, ordered=True).generate_columns()[column]
+    present = [value for value in values if value is not None]
+    assert len(values) == 10_000
+    assert present == sorted(present)
+
+
+def test_ordered_blocks_match_full_run():
+    generator = _generator("bank_transactions", ordered=True)
+    full = generator.generate_columns()["timestamp"]
+    size = generator.BLOCK_SIZE
+    block = _generator("bank_transactions", ordered=True).generate_block(1)
+    assert block["timestamp"] == full[size : 2 * size]
+
+
+def test_ordered_timestamps_follow_the_unordered_distribution():
+    ordered = _generator("credit_card_spend", ordered=True).generate_columns()
+    unordered = _generator("credit_card_spend").generate_columns()
+    median = sorted(unordered["txn_timestamp"])[5_000]
+    assert abs(ordered["txn_timestamp"][5_000] - median).days < 5
+
+
+def test_other_columns_are_unchanged():
+    ordered = _generator("bank_transactions", ordered=True).generate_columns()
+    unordered = _generator("bank_transactions").generate_columns()
+    assert ordered["amount"] == unordered["amount"]
+    assert ordered["timestamp"] != unordered["timestamp"]
@@ -0,0 +1,49 @@
+import pytest
+
+from data_generators.cache import OutputCache
+from data_generators.registry import SCENARIOS, get_scenario
+from data_generators.runner import Job, run_job
+
+
+def _generator(name):
+    spec = get_scenario(name)
+    return spec.build_generator(spec.build_config(rows=3_000))
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_projected_columns_match_full_output(name):
+    full = _generator(name).generate_columns()
+    columns = list(full)[1::2]
+    projected = _generator(name).project(columns).generate_columns()
+    assert list(projected) == columns
+    for column in columns:
+        assert projected[column] == full[column]
+
+
+def test_projection_resolves_dependencies_but_outputs_only_requested():
+    generator = _generator("credit_card_spend").project(["is_fraud"])
+    assert generator.output_columns == ("is_fraud",)
+    assert generator.needs("amount") and generator.needs("currency")
+    assert not generator.needs("city")
+
+
+def test_unknown_column_is_rejected():
+    with pytest.raises(ValueError, match="nope"):
+        _generator("bank_transactions").project(["amount", "nope"])
+
+
+def test_job_columns_are_part_of_the_cache_key(tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+    config = get_scenario("bank_transactions").build_config(rows=100)
+    full = Job("full", "bank_transactions", config, tmp_path / "a.csv", "csv")
+    run_job(full, cache)
+    narrow = Job(
+        "narrow",
+        "bank_transactions",
+        config,
+        tmp_path / "b.csv",
+        "csv",
+        columns=("amount",),
+    )
+    assert not run_job(narrow, cache)["cached"]
+    assert (tmp_path / "b.csv").read_text().splitlines()[0] == "amount"
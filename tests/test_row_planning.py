@@ -0,0 +1,58 @@
+import pytest
+
+from data_generators.core.utils import num_rows
+from data_generators.domains.analytics.ecommerce import (
+    EcommerceConfig,
+    EcommerceEventsGenerator,
+)
+from data_generators.registry import SCENARIOS, get_scenario
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+@pytest.mark.parametrize("rows", [1, 777, 5_001])
+def test_rows_are_exact(name, rows):
+    spec = get_scenario(name)
+    generator = spec.build_generator(spec.build_config(rows=rows))
+    assert num_rows(generator.generate_columns()) == rows
+
+
+def test_only_the_last_loan_is_cut_short():
+    spec = get_scenario("loan_repayments")
+    config = spec.build_config(rows=1_000)
+    columns = spec.build_generator(config).generate_columns()
+    last = f"LN-REP-{config.num_loans:05d}"
+    installments = [
+        number
+        for loan_id, number in zip(columns["loan_id"], columns["installment_number"])
+        if loan_id == last
+    ]
+    assert installments == list(range(1, len(installments) + 1))
+    # every other loan has its full schedule: the final row pays it off
+    finished = {
+        loan_id
+        for loan_id, remaining in zip(
+            columns["loan_id"], columns["remaining_principal"]
+        )
+        if remaining == 0
+    }
+    assert len(finished) >= config.num_loans - 1
+
+
+def test_planning_does_not_change_entities():
+    spec = get_scenario("spark_logs")
+    planned = spec.build_generator(spec.build_config(rows=2_000)).generate_columns()
+    full = spec.build_generator(
+        spec.build_config(num_jobs=max(planned["job_id"]))
+    ).generate_columns()
+    assert planned["message"] == full["message"][:2_000]
+
+
+def test_entities_for_rows_counts_variable_rows():
+    generator = EcommerceEventsGenerator(EcommerceConfig(num_users=1_000))
+    entities = generator.entities_for_rows(10_000)
+    rows = num_rows(
+        EcommerceEventsGenerator(EcommerceConfig(num_users=entities)).generate_columns()
+    )
+    assert rows >= 10_000
+    shorter = EcommerceEventsGenerator(EcommerceConfig(num_users=entities - 1))
+    assert num_rows(shorter.generate_columns()) < 10_000
@@ -0,0 +1,47 @@
+from datetime import date
+
+from data_generators.core.config import config_from_dict
+from data_generators.runner import load_manifest, run_manifest
+from data_generators.scenarios.attendance.generator import AttendanceConfig
+
+
+def test_config_from_dict_coerces_yaml_values():
+    config = config_from_dict(
+        AttendanceConfig, {"start_date": "2024-02-01", "num_employees": 3}
+    )
+    assert config.start_date == date(2024, 2, 1)
+    assert config.num_employees == 3
+
+
+def test_manifest_runs_all_jobs_and_writes_report(tmp_path):
+    manifest_path = tmp_path / "manifest.yml"
+    manifest_path.write_text(
+        f"""
+random_seed: 7
+default_output_dir: {tmp_path}
+budget:
+  cpus: 2
+  memory: 1GB
+jobs:
+  - scenario: spark_logs
+    rows: 40
+  - name: attendance_small
+    scenario: attendance
+    config:
+      num_employees: 2
+      end_date: 2024-01-31
+    output:
+      path: {tmp_path / "attendance.csv"}
+"""
+    )
+
+    manifest = load_manifest(manifest_path)
+    assert [job.config.seed for job in manifest.jobs] == [7, 7]
+
+    report = run_manifest(manifest)
+
+    assert report["jobs_failed"] == 0
+    assert report["jobs"][0]["rows"] == 40
+    assert (tmp_path / "spark_logs.csv").exists()
+    assert (tmp_path / "attendance.csv").exists()
+    assert (tmp_path / "run_report.json").exists()
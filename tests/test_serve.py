@@ -0,0 +1,73 @@
+import json
+import threading
+import urllib.request
+from contextlib import contextmanager
+
+import pytest
+
+from data_generators.cache import OutputCache
+from data_generators.runner import build_job, run_job
+from data_generators.serve import GenerationServer, request
+
+
+@contextmanager
+def _server(address, **kwargs):
+    with GenerationServer(address, workers=2, preload=["spark_logs"], **kwargs) as s:
+        thread = threading.Thread(target=s.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield s
+        finally:
+            s.shutdown()
+            thread.join()
+
+
+def test_responses_match_generate(tmp_path):
+    job = {
+        "scenario": "spark_logs",
+        "rows": 200,
+        "config": {"seed": 3},
+        "columns": ["job_id", "app_id", "level"],
+    }
+    expected = tmp_path / "expected.csv"
+    run_job(build_job({**job, "output": {"path": expected}}, tmp_path, None))
+
+    with _server("127.0.0.1:0", cache=OutputCache(tmp_path / "cache")) as server:
+        threads = [
+            threading.Thread(target=lambda: request(server.address, job))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        result, data = request(server.address, job)
+        assert data == expected.read_bytes()
+        assert result == {"rows": 200, "cached": True}
+
+        out = tmp_path / "written.csv"
+        result, data = request(
+            server.address, {**job, "output": {"path": str(out)}}
+        )
+        assert data is None and result["rows"] == 200
+        assert out.read_bytes() == expected.read_bytes()
+
+        with urllib.request.urlopen(f"http://{server.address}/health") as response:
+            health = json.load(response)
+        assert health["status"] == "ok" and health["requests"] == 6
+
+
+def test_bad_requests_are_rejected(tmp_path):
+    socket_path = tmp_path / "serve.sock"
+    with _server(str(socket_path)) as server:
+        for job, message in [
+            ({"rows": 10}, "scenario"),
+            ({"scenario": "nope"}, "Unknown scenario"),
+            ({"scenario": "spark_logs", "config": {"nope": 1}}, "nope"),
+            ({"scenario": "spark_logs", "output": {"path": "x.csv"}}, "absolute"),
+        ]:
+            with pytest.raises(ValueError, match=message):
+                request(server.address, job)
+        result, data = request(server.address, {"scenario": "spark_logs", "rows": 5})
+        assert result["rows"] == 5 and data.count(b"\n") == 6
+    assert not socket_path.exists()
@@ -0,0 +1,156 @@
+import json
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from data_generators.cache import OutputCache
+from data_generators.checkpoint import write_checkpointed
+from data_generators.runner import Job, run_job
+from data_generators.scenarios.bank_transactions.generator import (
+    BankTransactionsConfig,
+    BankTransactionsGenerator,
+)
+from data_generators.stats import (
+    HyperLogLog,
+    OutputStats,
+    QuantileSketch,
+    load_stats,
+    merge_stats,
+    stats_path,
+)
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _generator(rows=1000, fail_at=None):
+    gen = BankTransactionsGenerator(BankTransactionsConfig(num_rows=rows))
+    gen.BLOCK_SIZE = 100
+    if fail_at is not None:
+        generate_block = gen.generate_block
+
+        def failing(block):
+            if block == fail_at:
+                raise Interrupted
+            return generate_block(block)
+
+        gen.generate_block = failing
+    return gen
+
+
+def test_stats_match_the_output(tmp_path):
+    out = tmp_path / "bank.csv"
+    gen = _generator(3000)
+    columns = _generator(3000).generate_columns()
+    stats = OutputStats(gen.output_columns)
+    write_checkpointed(gen, out, key="k", chunk_rows=700, stats=stats)
+
+    summary = json.loads(stats_path(out).read_text(encoding="utf-8"))
+    assert summary["rows"] == 3000
+    fraud = summary["columns"]["is_fraud"]
+    assert fraud["mean"] == pytest.approx(sum(columns["is_fraud"]) / 3000)
+    assert dict((v, n) for v, n, _ in fraud["top"]) == Counter(columns["is_fraud"])
+    channels = {v: n for v, n, _ in summary["columns"]["channel"]["top"]}
+    assert channels == Counter(columns["channel"])
+    amount = summary["columns"]["amount"]
+    assert amount["min"] == min(columns["amount"])
+    assert amount["std"] == pytest.approx(np.std(columns["amount"]))
+    timestamp = summary["columns"]["timestamp"]
+    assert timestamp["max"] == max(columns["timestamp"]).isoformat()
+    assert "top" not in summary["columns"]["transaction_id"]
+
+
+def test_sketches_are_accurate():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(3, 1, 500_000)
+    sketch = QuantileSketch()
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+    for q, got in zip([0.01, 0.5, 0.99], sketch.quantiles([0.01, 0.5, 0.99])):
+        # rank error within 1%
+        assert abs((values < got).mean() - q) < 0.01
+
+    ids = [f"ID-{i}" for i in range(200_000)]
+    stats = OutputStats(["id"])
+    stats.update({"id": ids + ids[:50_000]})
+    distinct = stats.columns["id"].distinct
+    assert distinct.estimate() == pytest.approx(200_000, rel=0.03)
+    assert HyperLogLog.from_dict(distinct.to_dict()).estimate() == distinct.estimate()
+
+
+def test_merged_shards_equal_one_pass(tmp_path):
+    rng = random.Random(5)
+    values = [rng.choice([None, 1, 2, 3]) for _ in range(10_000)]
+    whole = OutputStats(["v"])
+    whole.update({"v": values})
+    paths = []
+    for shard in range(4):
+        part = OutputStats(["v"])
+        part.update({"v": values[shard * 2500 : (shard + 1) * 2500]})
+        paths.append(part.write(tmp_path / f"part-{shard}.stats.json"))
+
+    merged = merge_stats(paths).to_dict()["columns"]["v"]
+    expected = whole.to_dict()["columns"]["v"]
+    assert merged["nulls"] == expected["nulls"] == values.count(None)
+    assert merged["top"] == expected["top"]
+    assert merged["mean"] == pytest.approx(expected["mean"])
+    assert merged["std"] == pytest.approx(expected["std"])
+    assert merged["distinct"] == 3
+
+
+def _stats():
+    return OutputStats(_generator().output_columns)
+
+
+def test_resumed_run_has_identical_stats(tmp_path):
+    expected = tmp_path / "full.csv"
+    resumed = tmp_path / "resumed.csv"
+    write_checkpointed(
+        _generator(), expected, key="k", chunk_rows=250, stats=_stats()
+    )
+    with pytest.raises(Interrupted):
+        write_checkpointed(
+            _generator(fail_at=7),
+            resumed,
+            key="k",
+            chunk_rows=250,
+            stats=_stats(),
+        )
+    write_checkpointed(
+        _generator(),
+        resumed,
+        key="k",
+        chunk_rows=250,
+        resume=True,
+        stats=_stats(),
+    )
+    assert load_stats(stats_path(resumed)).to_dict() == load_stats(
+        stats_path(expected)
+    ).to_dict()
+
+
+def test_cached_outputs_keep_their_stats(tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+
+    def job(name, stats=True):
+        return Job(
+            name=name,
+            scenario="bank_transactions",
+            config=BankTransactionsConfig(num_rows=200),
+            out=tmp_path / f"{name}.csv",
+            format="csv",
+            stats=stats,
+        )
+
+    plain = run_job(job("plain", stats=False), cache)
+    first = run_job(job("first"), cache)
+    second = run_job(job("second"), cache)
+
+    assert "stats" not in plain and not first["cached"] and second["cached"]
+    assert (
+        stats_path(tmp_path / "first.csv").read_bytes()
+        == stats_path(tmp_path / "second.csv").read_bytes()
+    )
@@ -0,0 +1,73 @@
+import pytest
+
+from data_generators.core import base_generator
+from data_generators.core.predicates import Predicate
+from data_generators.registry import get_scenario
+
+
+def _generator(name, rows=2_000):
+    spec = get_scenario(name)
+    return spec.build_generator(spec.build_config(rows=rows))
+
+
+def test_predicate_mask():
+    columns = {
+        "channel": ["ECOM", "POS", "UPI", "ATM"],
+        "is_fraud": [1, 0, 0, 1],
+        "amount": [10.0, None, 300.0, 50.0],
+    }
+    assert Predicate("channel in ('ECOM', 'UPI')").mask(columns) == [
+        True, False, True, False
+    ]
+    assert Predicate("is_fraud and amount > 20").mask(columns) == [
+        False, False, False, True
+    ]
+    assert Predicate("not is_fraud or channel == 'ECOM'").mask(columns) == [
+        True, True, True, False
+    ]
+
+
+@pytest.mark.parametrize("text", ["amount >", "f(x) == 1", "amount == other"])
+def test_invalid_predicates_are_rejected(text):
+    with pytest.raises(ValueError):
+        Predicate(text)
+
+
+@pytest.mark.parametrize("text", ["timestamp >= '2023-06-01'", "amount > '5'"])
+def test_mistyped_literals_are_rejected(text):
+    generator = _generator("bank_transactions", rows=10).where(text)
+    with pytest.raises(ValueError, match="cannot compare"):
+        generator.generate_columns()
+
+
+def test_conditional_sampling_returns_requested_matching_rows():
+    generator = _generator("credit_card_spend").where("is_fraud == 1")
+    columns = generator.generate_columns()
+    assert len(columns["is_fraud"]) == 2_000
+    assert set(columns["is_fraud"]) == {1}
+    # Fraud is concentrated in online transactions (~60% of all rows)
+    online = sum(columns["is_online"]) / len(columns["is_online"])
+    assert online > 0.75
+
+
+def test_conditional_sampling_is_independent_of_projection():
+    full = _generator("customer_360").where("risk_segment == 'HIGH'")
+    narrow = _generator("customer_360").where("risk_segment == 'HIGH'")
+    full_columns = full.generate_columns()
+    narrow_columns = narrow.project(["age", "churn_score"]).generate_columns()
+    assert narrow_columns["age"] == full_columns["age"]
+    assert narrow_columns["churn_score"] == full_columns["churn_score"]
+
+
+def test_multi_row_scenarios_filter_rows():
+    columns = _generator("attendance", rows=5_000).where(
+        "status == 'ABSENT'"
+    ).generate_columns()
+    assert columns["status"] and set(columns["status"]) == {"ABSENT"}
+
+
+def test_unsatisfiable_predicate_fails(monkeypatch):
+    monkeypatch.setattr(base_generator, "MAX_REJECTED_ROWS", 50_000)
+    generator = _generator("bank_transactions", rows=10).where("channel == 'fax'")
+    with pytest.raises(ValueError, match="No rows satisfy"):
+        generator.generate_columns()